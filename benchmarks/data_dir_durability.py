@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# vi:si:et:sw=4:sts=4:ts=4
+"""Microbenchmark of data directory writes made by Cron Worker on start
+and finish (PID file lock + job spec, stats record), for each value of
+`CRONMAN_DATA_DIR_DURABILITY`.
+
+Usage:
+    python benchmarks/data_dir_durability.py [--data-dir DIR] [--runs N]
+
+Point `--data-dir` to the file system used by `CRONMAN_DATA_DIR`
+(results for tmpfs and disks differ by orders of magnitude).
+"""
+
+from __future__ import print_function, unicode_literals
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "cronman.tests.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from cronman.taxonomies import DataDirDurability  # noqa: E402
+from cronman.worker.worker_file import (  # noqa: E402
+    CronWorkerPIDFile,
+    CronWorkerStatsFile,
+)
+
+
+def simulate_worker_run(data_dir, job_spec):
+    """Data directory writes of single worker run"""
+    pid_file = CronWorkerPIDFile(data_dir, "Benchmark")
+    pid_file.acquire(job_spec=job_spec, can_resume=True)
+    stats_file = CronWorkerStatsFile(data_dir, "Benchmark")
+    stats_file.add({"job_spec": job_spec, "ok": True, "duration": 0.0})
+    pid_file.release()
+
+
+def benchmark(data_dir, durability, runs):
+    """Returns durations (seconds) of simulated worker runs"""
+    os.environ["CRONMAN_DATA_DIR_DURABILITY"] = durability
+    durations = []
+    for i in range(runs):
+        start = time.time()
+        simulate_worker_run(data_dir, "Benchmark:run={}".format(i))
+        durations.append(time.time() - start)
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--data-dir", default=tempfile.gettempdir())
+    parser.add_argument("--runs", type=int, default=200)
+    options = parser.parse_args()
+    data_dir = tempfile.mkdtemp(
+        prefix="cronman-benchmark-", dir=options.data_dir
+    )
+    os.environ["CRONMAN_WORKER_STATUS_TABLE"] = ""  # files only
+    try:
+        print("Data directory: {}".format(data_dir))
+        print("MODE\tMEDIAN (ms)\tP95 (ms)\tMAX (ms)")
+        for durability in DataDirDurability.CHOICES:
+            durations = sorted(benchmark(data_dir, durability, options.runs))
+            print(
+                "{}\t{:.3f}\t{:.3f}\t{:.3f}".format(
+                    durability,
+                    statistics.median(durations) * 1000,
+                    durations[int(len(durations) * 0.95) - 1] * 1000,
+                    durations[-1] * 1000,
+                )
+            )
+    finally:
+        shutil.rmtree(data_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# vi:si:et:sw=4:sts=4:ts=4
+"""Benchmark of worker process startup (`cron_worker run` of a no-op job:
+interpreter start, `django.setup()`, cron job import, PID file lock)
+with full settings module and with reduced settings module for workers
+(`CRONMAN_WORKER_SETTINGS`).
+
+Usage:
+    python benchmarks/worker_settings.py --settings app.settings \
+        --worker-settings app.settings_worker [--job-spec SPEC] [--runs N]
+
+Both settings modules have to be importable from current directory.
+"""
+
+from __future__ import print_function, unicode_literals
+
+import argparse
+import os
+import statistics
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def get_exit_code(status):
+    """Converts status returned by `os.wait4` to exit code"""
+    if hasattr(os, "waitstatus_to_exitcode"):  # Python 3.9+
+        return os.waitstatus_to_exitcode(status)
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def measure_startup(settings_module, job_spec, data_dir):
+    """Returns duration (seconds) and max RSS (KB) of single worker run"""
+    env = dict(
+        os.environ,
+        DJANGO_SETTINGS_MODULE=settings_module,
+        CRONMAN_DATA_DIR=data_dir,
+        PYTHONPATH=os.pathsep.join(
+            [os.getcwd()] + sys.path[1:]  # settings modules importable
+        ),
+    )
+    args = [
+        sys.executable,
+        "-m",
+        "django",
+        "cron_worker",
+        "run",
+        job_spec,
+        "--settings={}".format(settings_module),
+    ]
+    start = time.time()
+    with open(os.devnull, "wb") as devnull:
+        process = subprocess.Popen(
+            args, env=env, stdout=devnull, stderr=subprocess.STDOUT
+        )
+        _, status, rusage = os.wait4(process.pid, 0)
+    duration = time.time() - start
+    process.returncode = get_exit_code(status)  # reaped by `wait4`
+    if process.returncode:
+        raise RuntimeError(
+            "Worker run with {} failed (exit code {}).".format(
+                settings_module, process.returncode
+            )
+        )
+    return duration, rusage.ru_maxrss
+
+
+def benchmark(settings_module, job_spec, runs):
+    """Returns durations (seconds) and max RSS values (KB) of `runs`
+    worker runs
+    """
+    durations = []
+    rss_values = []
+    data_dir = tempfile.mkdtemp(prefix="cronman-benchmark-")
+    try:
+        for _ in range(runs):
+            duration, rss = measure_startup(
+                settings_module, job_spec, data_dir
+            )
+            durations.append(duration)
+            rss_values.append(rss)
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+    return sorted(durations), rss_values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--settings", default="cronman.tests.settings")
+    parser.add_argument("--worker-settings", default="cronman.tests.settings")
+    parser.add_argument("--job-spec", default="Sleep:seconds=0")
+    parser.add_argument("--runs", type=int, default=10)
+    options = parser.parse_args()
+    print("SETTINGS\tMEDIAN (ms)\tMAX (ms)\tMAX RSS (KB)")
+    for settings_module in (options.settings, options.worker_settings):
+        durations, rss_values = benchmark(
+            settings_module, options.job_spec, options.runs
+        )
+        print(
+            "{}\t{:.1f}\t{:.1f}\t{}".format(
+                settings_module,
+                statistics.median(durations) * 1000,
+                durations[-1] * 1000,
+                max(rss_values),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
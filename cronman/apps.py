@@ -3,6 +3,9 @@
 
 from __future__ import unicode_literals
 
+import os
+import time
+
 from django.apps import AppConfig
 
 
@@ -10,9 +13,21 @@ class CronConfig(AppConfig):
     """Default AppConfig for cronman app."""
 
     name = "cronman"
+    ready_started = None
+    ready_finished = None
 
     def ready(self):
         """Run app-specific code when Django starts."""
         from cronman import autodiscover
+        from cronman.job import cron_job_registry
+        from cronman.utils import config
 
-        autodiscover()
+        # Timestamps used to measure worker boot phases:
+        self.ready_started = time.time()
+        manifest_path = config("CRONMAN_JOBS_MANIFEST")
+        if manifest_path and os.path.exists(manifest_path):
+            # Cron job classes will be imported on demand:
+            cron_job_registry.load_manifest(manifest_path)
+        else:
+            autodiscover()
+        self.ready_finished = time.time()
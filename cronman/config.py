@@ -44,6 +44,36 @@ class AppSettings(object):
     CRONMAN_JOBS_MODULE = Setting(
         "CRONMAN_JOBS_MODULE", None
     )  # type: Optional[Text]
+    # Path to JSON manifest of cron job classes (`cron_worker manifest`).
+    # When the file exists, cron job classes are imported lazily:
+    CRONMAN_JOBS_MANIFEST = Setting(
+        "CRONMAN_JOBS_MANIFEST", None
+    )  # type: Optional[Text]
+    # Settings module for worker processes (e.g. reduced INSTALLED_APPS),
+    # passed to `cron_worker run` as `--settings=`:
+    CRONMAN_WORKER_SETTINGS = Setting(
+        "CRONMAN_WORKER_SETTINGS", None
+    )  # type: Optional[Text]
+    # Keep shared-memory table of running workers in data directory
+    # (PID files are scanned otherwise):
+    CRONMAN_WORKER_STATUS_TABLE = Setting(
+        "CRONMAN_WORKER_STATUS_TABLE", True
+    )  # type: bool
+    # Interval (seconds) of worker heartbeat updates in status table
+    # while the job is running:
+    CRONMAN_WORKER_HEARTBEAT_INTERVAL = Setting(
+        "CRONMAN_WORKER_HEARTBEAT_INTERVAL", 30
+    )  # type: int
+    # Durability of data directory writes (PID files, stats etc.):
+    # "fsync", "atomic" (temporary file + rename) or "none":
+    CRONMAN_DATA_DIR_DURABILITY = Setting(
+        "CRONMAN_DATA_DIR_DURABILITY", "fsync"
+    )  # type: Text
+    # Stats files not updated for given number of seconds (e.g. of removed
+    # or rarely called cron jobs) are deleted by `clean`:
+    CRONMAN_STATS_MAX_AGE = Setting(
+        "CRONMAN_STATS_MAX_AGE", 30 * 24 * 3600
+    )  # type: int
     CRONMAN_NICE_CMD = Setting("CRONMAN_NICE_CMD", "nice")  # type: Text
     CRONMAN_IONICE_CMD = Setting(
         "CRONMAN_IONICE_CMD",
@@ -61,6 +91,34 @@ class AppSettings(object):
     CRONMAN_CLEAN_CRON_TASKS_CRONITOR_ID = Setting(
         "CRONMAN_CLEAN_CRON_TASKS_CRONITOR_ID", None
     )  # type: Optional[Text]
+    # Throttling of `resume`: max number of workers started per second
+    # and max number of running workers (the rest is resumed later):
+    CRONMAN_RESUME_RATE_LIMIT = Setting(
+        "CRONMAN_RESUME_RATE_LIMIT", None
+    )  # type: Optional[float]
+    CRONMAN_RESUME_MAX_CONCURRENT = Setting(
+        "CRONMAN_RESUME_MAX_CONCURRENT", None
+    )  # type: Optional[int]
+    # Max number of consecutive resumes of a job (e.g. crashing right
+    # after start), its JobSpec file is deleted then:
+    CRONMAN_RESUME_MAX_ATTEMPTS = Setting(
+        "CRONMAN_RESUME_MAX_ATTEMPTS", 10
+    )  # type: Optional[int]
+    # Time limit (seconds) of dead PID files cleanup done by scheduler
+    # on each call, 0 disables it:
+    CRONMAN_SCHEDULER_GC_TIME_LIMIT = Setting(
+        "CRONMAN_SCHEDULER_GC_TIME_LIMIT", 0.5
+    )  # type: float
+    # Re-adopt (or kill) orphaned worker processes on each scheduler call
+    # (processes are terminated when their lock is held by other worker):
+    CRONMAN_SCHEDULER_ORPHANS = Setting(
+        "CRONMAN_SCHEDULER_ORPHANS", False
+    )  # type: bool
+    # Publish status snapshot of Cron Workers to Redis on each scheduler
+    # call (`cron_remote_manager status`), requires Remote Manager:
+    CRONMAN_SCHEDULER_SNAPSHOT = Setting(
+        "CRONMAN_SCHEDULER_SNAPSHOT", True
+    )  # type: bool
     CRONMAN_ADMIN_SITE = Setting(
         "CRONMAN_ADMIN_SITE", "django.contrib.admin.site"
     )  # type: Optional[Text]
@@ -110,6 +168,19 @@ class AppSettings(object):
         "CRONMAN_REDIS_CONSTRUCTOR",
         "cronman.redis_client.get_strict_redis_default",
     )  # type: Text
+    # Timeouts (seconds) of Redis connections opened by default constructor,
+    # None - no timeout. Socket timeout also applies to idle listeners
+    # (`cron_remote_manager listen`), which reconnect when it expires:
+    CRONMAN_REDIS_SOCKET_TIMEOUT = Setting(
+        "CRONMAN_REDIS_SOCKET_TIMEOUT", None
+    )  # type: Optional[float]
+    CRONMAN_REDIS_CONNECT_TIMEOUT = Setting(
+        "CRONMAN_REDIS_CONNECT_TIMEOUT", 5
+    )  # type: Optional[float]
+    # Number of seconds after which cluster lock expires if not renewed:
+    CRONMAN_CLUSTER_LOCK_TTL = Setting(
+        "CRONMAN_CLUSTER_LOCK_TTL", 60
+    )  # type: int
 
 
 app_settings = AppSettings()
@@ -16,6 +16,7 @@ from cronman.cron_jobs.sleep import (
     PersistentSleep2,
     SlackNotifyDoneSleep,
     Sleep,
+    SlotsLockedSleep,
 )
 from cronman.job import cron_job_registry
 
@@ -31,3 +32,4 @@ cron_job_registry.register(LowestCPUIOSleep)
 cron_job_registry.register(IdleIOSleep)
 cron_job_registry.register(PersistentSleep)
 cron_job_registry.register(PersistentSleep2)
+cron_job_registry.register(SlotsLockedSleep)
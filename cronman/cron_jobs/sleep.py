@@ -120,3 +120,12 @@ class PersistentSleep2(Sleep):
 
     lock_type = LockType.PARAMS
     can_resume = True
+
+
+class SlotsLockedSleep(Sleep):
+    """Test CronJob: sleeps for given number of seconds.
+    Lock by slots - up to 2 concurrent calls of this class are allowed.
+    """
+
+    lock_type = LockType.SLOTS
+    lock_slots = 2
@@ -3,7 +3,7 @@
 
 from __future__ import unicode_literals
 
-from django.core.management import CommandError
+import sys
 
 # General errors:
 
@@ -27,43 +27,65 @@ class CronJobNotRegistered(CronJobRegistryError):
     """CronJob class of given name is not registered"""
 
 
-# CronScheduler errors:
-
-
-class CronSchedulerError(CommandError):
-    """General CronScheduler error"""
-
-
-class CronSchedulerLocked(CronSchedulerError):
-    """CronScheduler is locked"""
-
-
-class CronSchedulerUnlocked(CronSchedulerError):
-    """CronScheduler is unlocked"""
-
-
-class CronSchedulerNoJobs(CronSchedulerError):
-    """CronScheduler no jobs to start"""
-
-
-# CronWorker errors:
-
-
-class CronWorkerError(CommandError):
-    """General CronScheduler error"""
-
-
-class PIDAccessError(CronWorkerError):
-    """CronWorker has no access to process by PID"""
-
-
-class CronTaskInvalidStatus(CronWorkerError):
-    """CronWorker received CronTask with improper status"""
-
-
-class CronWorkerLocked(CronWorkerError):
-    """CronWorker cannot start due to active lock"""
-
-
-class CronWorkerInvalidParams(CronWorkerError):
-    """CronWorker received invalid arguments"""
+# CronScheduler and CronWorker errors are management command errors
+# (`CommandError`), defined lazily - so modules which don't need Django
+# management commands (e.g. used by `cronman-status`) can be imported
+# without `django.core.management`.
+# Name -> (base class name, docstring):
+COMMAND_ERRORS = {
+    # CronScheduler errors:
+    "CronSchedulerError": ("CommandError", "General CronScheduler error"),
+    "CronSchedulerLocked": ("CronSchedulerError", "CronScheduler is locked"),
+    "CronSchedulerUnlocked": (
+        "CronSchedulerError",
+        "CronScheduler is unlocked",
+    ),
+    "CronSchedulerNoJobs": (
+        "CronSchedulerError",
+        "CronScheduler no jobs to start",
+    ),
+    # CronWorker errors:
+    "CronWorkerError": ("CommandError", "General CronScheduler error"),
+    "PIDAccessError": (
+        "CronWorkerError",
+        "CronWorker has no access to process by PID",
+    ),
+    "CronTaskInvalidStatus": (
+        "CronWorkerError",
+        "CronWorker received CronTask with improper status",
+    ),
+    "CronWorkerLocked": (
+        "CronWorkerError",
+        "CronWorker cannot start due to active lock",
+    ),
+    "CronWorkerInvalidParams": (
+        "CronWorkerError",
+        "CronWorker received invalid arguments",
+    ),
+    "CronWorkerClusterLockError": (
+        "CronWorkerError",
+        "CronWorker cannot access cluster lock (Redis error) or lost it",
+    ),
+}
+
+
+def __getattr__(name):
+    if name not in COMMAND_ERRORS:
+        raise AttributeError(
+            "module {!r} has no attribute {!r}".format(__name__, name)
+        )
+    if name in globals():  # base class defined already
+        return globals()[name]
+    base_name, doc = COMMAND_ERRORS[name]
+    if base_name == "CommandError":
+        from django.core.management import CommandError as base
+    else:
+        base = __getattr__(base_name)
+    value = type(str(name), (base,), {"__doc__": doc, "__module__": __name__})
+    globals()[name] = value
+    return value
+
+
+if sys.version_info < (3, 7):  # No module `__getattr__` (PEP 562)
+    for _name in COMMAND_ERRORS:
+        __getattr__(_name)
@@ -3,10 +3,33 @@
 
 from __future__ import unicode_literals
 
+import json
 import logging
+import os
+
+from django.utils.module_loading import import_string
 
 from cronman.exceptions import CronJobAlreadyRegistered, CronJobNotRegistered
-from cronman.taxonomies import LockType
+from cronman.taxonomies import LockScope, LockType
+
+# Cron job class attributes stored in the manifest, so they can be read
+# without importing application code:
+MANIFEST_ATTRIBUTES = (
+    "lock_type",
+    "lock_name",
+    "lock_slots",
+    "lock_group",
+    "lock_scope",
+    "lock_check_attempts",
+    "lock_ignore_errors",
+    "worker_cpu_priority",
+    "worker_io_priority",
+    "can_resume",
+    "worker_settings",
+    "resume_priority",
+    "kill_grace_seconds",
+)
+MANIFEST_VERSION = 1
 
 
 class CronJobRegistry(object):
@@ -14,10 +37,13 @@ class CronJobRegistry(object):
 
     def __init__(self):
         self._registry = {}
+        self._manifest = {}
 
     def register(self, cron_job_class, name=None):
         """Adds a new CronJob class to the registry"""
         name = name or cron_job_class.__name__
+        if self._registry.get(name) is cron_job_class:
+            return  # Already imported lazily (manifest)
         if name in self._registry:
             raise CronJobAlreadyRegistered(name)
         self._registry[name] = cron_job_class
@@ -25,20 +51,102 @@ class CronJobRegistry(object):
     def unregister(self, name=None, cron_job_class=None):
         """Removes a CronJob class from the registry"""
         name = name or cron_job_class.__name__
-        if name not in self._registry:
+        if name not in self._registry and name not in self._manifest:
             raise CronJobNotRegistered(name)
-        del self._registry[name]
+        self._registry.pop(name, None)
+        self._manifest.pop(name, None)
 
     def get(self, name):
-        """Retrieves a CronJob class from the registry"""
+        """Retrieves a CronJob class from the registry.
+        Classes declared in the manifest are imported on first access.
+        """
         if name not in self._registry:
-            raise CronJobNotRegistered(name)
+            if name not in self._manifest:
+                raise CronJobNotRegistered(name)
+            self._import(name)
         return self._registry[name]
 
+    def get_info(self, name):
+        """Retrieves a dictionary of CronJob class attributes
+        (`MANIFEST_ATTRIBUTES`) - from the manifest if possible,
+        otherwise from the class itself.
+        """
+        if name in self._manifest:
+            info = self._manifest[name]
+        else:
+            info = self.get_class_info(self.get(name))
+        return info
+
+    def names(self):
+        """Retrieves names of all registered CronJob classes
+        (without importing them)
+        """
+        return set(self._registry) | set(self._manifest)
+
     def items(self):
         """Retrieves all registered items"""
+        for name in self._manifest:
+            if name not in self._registry:
+                self._import(name)
         return self._registry.items()
 
+    def _import(self, name):
+        """Imports CronJob class declared in the manifest"""
+        cron_job_class = import_string(self._manifest[name]["class"])
+        # Importing the class may register it already (`cron_jobs` module):
+        if name not in self._registry:
+            self._registry[name] = cron_job_class
+
+    # Manifest:
+
+    @staticmethod
+    def get_class_info(cron_job_class):
+        """Retrieves manifest entry for given CronJob class"""
+        info = {
+            "class": "{}.{}".format(
+                cron_job_class.__module__, cron_job_class.__name__
+            )
+        }
+        for attribute in MANIFEST_ATTRIBUTES:
+            info[attribute] = getattr(cron_job_class, attribute, None)
+        return info
+
+    def load_manifest(self, path):
+        """Reads the manifest file (JSON), so CronJob classes can be imported
+        lazily, only when requested.
+        """
+        with open(path, "r") as file_:
+            data = json.load(file_)
+        if data.get("version") != MANIFEST_VERSION:
+            raise ValueError(
+                "Unsupported manifest version: {!r}".format(
+                    data.get("version")
+                )
+            )
+        manifest = data["cron_jobs"]
+        # Attributes missing in older manifest files get default values:
+        for info in manifest.values():
+            for attribute in MANIFEST_ATTRIBUTES:
+                info.setdefault(attribute, getattr(BaseCronJob, attribute))
+        self._manifest = manifest
+
+    def dump_manifest(self, path):
+        """Writes the manifest file (JSON) for all registered CronJob classes.
+        Returns number of entries.
+        """
+        data = {
+            "version": MANIFEST_VERSION,
+            "cron_jobs": {
+                name: self.get_class_info(cron_job_class)
+                for name, cron_job_class in self._registry.items()
+            },
+        }
+        temp_path = "{}.{}.tmp".format(path, os.getpid())
+        with open(temp_path, "w") as file_:
+            json.dump(data, file_, indent=2, sort_keys=True)
+        os.rename(temp_path, path)  # readers never see partial file
+        return len(data["cron_jobs"])
+
 
 cron_job_registry = CronJobRegistry()
 
@@ -48,8 +156,13 @@ class BaseCronJob(object):
 
     lock_type = LockType.CLASS
     lock_name = None  # May be used to override job name for lock
-    lock_check_attempts = 1  # Number of lock check attempts
+    lock_slots = 1  # Number of concurrent calls allowed (LockType.SLOTS)
+    lock_group = None  # Name of slots shared by several classes (SLOTS)
+    lock_scope = LockScope.LOCAL  # Lock on single host or across cluster?
+    lock_check_attempts = 1  # Number of lock check attempts (deprecated)
+    lock_wait_timeout = None  # Seconds to wait for the lock to be released
     lock_ignore_errors = False  # Should we consider lock errors as warnings?
+    coalesce_locked = False  # Should locked calls be re-run by lock owner?
     cronitor_id = None
     cronitor_ping_run = True  # Should we ping Cronitor when job started?
     cronitor_ping_fail = True  # Should we ping Cronitor when job failed?
@@ -57,6 +170,10 @@ class BaseCronJob(object):
     worker_cpu_priority = None  # CPU priority for worker processes
     worker_io_priority = None  # IO priority for worker processes
     can_resume = True  # Can we resume this job after suspension?
+    resume_priority = 0  # Jobs with higher priority are resumed first
+    kill_grace_seconds = None  # Time between SIGTERM and SIGKILL on kill
+    worker_settings = None  # Settings module for worker processes
+    fencing_token = None  # Token of cluster lock held by running job
 
     def __init__(self, logger=None):
         self.logger = logger or logging.getLogger(
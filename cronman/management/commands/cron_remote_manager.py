@@ -3,12 +3,16 @@
 
 from __future__ import unicode_literals
 
+import json
 import time
+from collections import OrderedDict
 
 from django.core.management import BaseCommand, CommandError
 
 from cronman.remote_manager import CronRemoteManager
 from cronman.scheduler import CronScheduler
+from cronman.taxonomies import PIDStatus
+from cronman.utils import TabularFormatter
 
 
 class Command(BaseCommand):
@@ -26,6 +30,8 @@ class Command(BaseCommand):
         "get_status",
         "clear_status",
         "kill",
+        "listen",
+        "status",
     )
 
     def add_arguments(self, parser):
@@ -33,15 +39,32 @@ class Command(BaseCommand):
             "method",
             help=(
                 "Choices: disable, enable, get_status, clear_status, "
-                "kill:<jobspec>."
+                "kill:<jobspec>, listen (applies commands sent to this host "
+                "immediately), status (Cron Workers running on given hosts)."
+            ),
+        )
+        parser.add_argument(
+            "hosts",
+            nargs="*",
+            help=(
+                "Host names, ALL (cluster-wide status) or globs matching "
+                'hosts registered by Cron Schedulers (e.g. "prod-cron*", "*")'
             ),
         )
-        parser.add_argument("hosts", nargs="+")
         parser.add_argument(
             "--wait",
             action="store_true",
             default=False,
-            help="Wait for Cron Schedulers to receive the request",
+            help=(
+                "Wait until Cron Schedulers acknowledge the request "
+                "(disable, enable, kill)"
+            ),
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=CronScheduler.interval * 60 * 2,
+            help="Maximum number of seconds to wait for acknowledgements",
         )
 
     def handle(self, **options):
@@ -59,14 +82,159 @@ class Command(BaseCommand):
             )
         host_names = options["hosts"]
         remote_manager = CronRemoteManager()
-        method = getattr(remote_manager, method_name)
-        results = []
-        for host_name in host_names:
-            result = method(*args, host_name=host_name)
-            results.append(
-                "{} {} -> {}".format(method_string, host_name, result)
+        if method_name == "listen":
+            return self.listen(remote_manager)
+        if not host_names:
+            raise CommandError("At least one host name is required.")
+        command = self.get_command(method_name, args)
+        wait = options["wait"] and command
+        if wait and "ALL" in host_names:  # before anything is sent
+            raise CommandError(
+                "Unable to wait for acknowledgements from ALL hosts, "
+                'please list host names or use a glob (e.g. "*").'
+            )
+        if method_name == "status":
+            # Snapshots are published per host - ALL means registered hosts:
+            host_names = [
+                "*" if host_name == "ALL" else host_name
+                for host_name in host_names
+            ]
+        host_names = remote_manager.expand_hosts(host_names)
+        if not host_names:
+            raise CommandError("No registered hosts match given globs.")
+        if method_name == "status":
+            return self.status(remote_manager, host_names)
+        # All hosts in a single round trip:
+        results = remote_manager.fan_out(
+            method_name, args, host_names, clear_ack=command if wait else None
+        )
+        summary = "\n".join(
+            "{} {} -> {}".format(method_string, host_name, result)
+            for host_name, result in zip(host_names, results)
+        )
+        if wait:
+            summary += "\n" + self.wait(
+                remote_manager, command, host_names, options["timeout"]
             )
-        summary = "\n".join(results)
-        if options["wait"]:
-            time.sleep(CronScheduler.interval * 60)
         return summary
+
+    def get_command(self, method_name, args):
+        """Command acknowledged by Cron Scheduler for given method call
+        or None if the call can't be acknowledged
+        """
+        if method_name == "kill":
+            return "kill:{}".format(args[0])
+        if method_name in ("disable", "enable"):
+            return method_name
+        return None
+
+    def wait(self, remote_manager, command, host_names, timeout):
+        """Waits for acknowledgements of given command from all hosts,
+        returns per-host report. Raises CommandError if any host
+        has not acknowledged the command.
+        """
+        acks = remote_manager.wait_for_acks(command, host_names, timeout)
+        lines = []
+        missing = []
+        for host_name in host_names:
+            ack, seconds = acks[host_name]
+            if ack is None:
+                missing.append(host_name)
+                lines.append(
+                    "{} {} -> NOT ACKNOWLEDGED after {:.1f}s".format(
+                        command, host_name, seconds
+                    )
+                )
+            else:
+                result = (ack["result"] or "").strip().splitlines()
+                lines.append(
+                    "{} {} -> ACKNOWLEDGED after {:.1f}s: {}".format(
+                        command,
+                        host_name,
+                        seconds,
+                        result[0] if result else "",
+                    )
+                )
+        report = "\n".join(lines)
+        if missing:
+            self.stdout.write(report)
+            raise CommandError(
+                "Request not acknowledged by: {}".format(", ".join(missing))
+            )
+        return report
+
+    def status(self, remote_manager, host_names):
+        """Combined status of Cron Workers on given hosts, based on
+        snapshots published by Cron Schedulers (single round trip)
+        """
+        now = time.time()
+        hosts = []
+        workers = []
+        host_totals = OrderedDict([("TOTAL", 0), ("OK", 0), ("MISSING", 0)])
+        worker_totals = OrderedDict(
+            [("TOTAL", 0), (PIDStatus.ALIVE, 0), (PIDStatus.DEAD, 0)]
+        )
+        snapshots = remote_manager.get_snapshots(host_names)
+        for host_name, snapshot in zip(host_names, snapshots):
+            host_totals["TOTAL"] += 1
+            host = OrderedDict()
+            host["host"] = host_name
+            if not snapshot:
+                host_totals["MISSING"] += 1
+                host["status"] = "MISSING"
+                hosts.append(host)
+                continue
+            host_totals["OK"] += 1
+            host["status"] = "OK"
+            host["updated"] = "{:.0f}s ago".format(
+                max(now - float(snapshot["time"]), 0)
+            )
+            host["load"] = "load: {}".format(snapshot.get("load") or "?")
+            host["memory"] = self.format_memory(
+                snapshot.get("memory_total"), snapshot.get("memory_available")
+            )
+            totals = json.loads(snapshot["totals"])
+            host["workers"] = "{} worker(s)".format(totals["TOTAL"])
+            hosts.append(host)
+            for status, count in totals.items():
+                worker_totals[status] = worker_totals.get(status, 0) + count
+            for worker in json.loads(
+                snapshot["workers"], object_pairs_hook=OrderedDict
+            ):
+                item = OrderedDict([("host", host_name)])
+                item.update(worker)
+                workers.append(item)
+        return TabularFormatter.format_listing_output(
+            hosts, totals=host_totals, title="HOSTS:"
+        ) + TabularFormatter.format_listing_output(
+            workers,
+            totals=worker_totals,
+            title="WORKERS:",
+            empty_message="No PID file(s) found.",
+        )
+
+    @staticmethod
+    def format_memory(total, available):
+        """Formats memory info from status snapshot"""
+        if not total or not available:
+            return "memory: ?"
+        return "memory: {:.1f} of {:.1f} MB available".format(
+            int(available) / 1024.0 / 1024.0, int(total) / 1024.0 / 1024.0
+        )
+
+    def listen(self, remote_manager):
+        """Applies commands published for this host (or all hosts) by
+        Remote Manager until interrupted
+        """
+        scheduler = CronScheduler()
+
+        def apply_command(command):
+            output = scheduler.apply_remote_command(command)
+            if output:
+                self.stdout.write(output)
+
+        try:
+            remote_manager.listen(apply_command)
+        except KeyboardInterrupt:
+            pass
+        return ""
@@ -22,9 +22,30 @@ class Command(BaseCommand):
                 "clean",
                 "suspend",
                 "resume",
+                "manifest",
+                "top",
+                "orphans",
             ),
         )
         parser.add_argument("arg", nargs="?")
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2.0,
+            help="top: refresh interval (seconds)",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=0,
+            help="top: number of refreshes (0 - until interrupted)",
+        )
+        parser.add_argument(
+            "--handoff",
+            action="store_true",
+            default=False,
+            help="suspend: let other hosts resume killed workers",
+        )
 
     def handle(self, **options):
         """Main command logic"""
@@ -34,6 +55,21 @@ class Command(BaseCommand):
         worker = CronWorker()
         method = getattr(worker, method_name)
 
+        if method_name == "top":
+            return method(
+                arg,
+                interval=options["interval"],
+                iterations=options["iterations"],
+                stdout=self.stdout,
+            )
+
+        if method_name == "suspend" and options["handoff"]:
+            if arg:
+                raise CommandError(
+                    'Subcommand "suspend" does not accept arguments.'
+                )
+            return method(handoff=True)
+
         if not arg:
             if method_name == "run":
                 raise CommandError("Job specification is required.")
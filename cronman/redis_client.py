@@ -3,20 +3,56 @@
 
 from __future__ import unicode_literals
 
+import os
+import threading
+
 from django.utils.module_loading import import_string
 
 from cronman.config import app_settings
 from cronman.exceptions import MissingDependency
 
+# Redis clients shared by all cronman objects in current process,
+# so they reuse connections from the same pool:
+# (constructor, host, port, db) -> client
+_clients = {}
+_clients_lock = threading.Lock()
+
 
 def get_strict_redis(host=None, port=None, db=None):
     """Retrieves Redis client object (StrictRedis) using constructor function
     defined in settings (`CRONMAN_REDIS_CONSTRUCTOR`).
+    Client (and its connection pool) is created once per process for given
+    constructor, host, port and database.
     """
-    _get_strict_redis = import_string(app_settings.CRONMAN_REDIS_CONSTRUCTOR)
-    return _get_strict_redis(
-        host=host, port=port, db=db, decode_responses=True
+    constructor = app_settings.CRONMAN_REDIS_CONSTRUCTOR
+    key = (
+        constructor,
+        host or app_settings.CRONMAN_REDIS_HOST,
+        port or app_settings.CRONMAN_REDIS_PORT,
+        db if db is not None else app_settings.CRONMAN_REDIS_DB,
     )
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            _get_strict_redis = import_string(constructor)
+            client = _clients[key] = _get_strict_redis(
+                host=host, port=port, db=db, decode_responses=True
+            )
+    return client
+
+
+def reset_redis_clients():
+    """Forgets shared Redis clients, so new connections are opened
+    (e.g. in child process after fork).
+    """
+    global _clients_lock
+    _clients.clear()
+    # Lock may have been held by other thread of parent process:
+    _clients_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):  # Python 3.7+
+    os.register_at_fork(after_in_child=reset_redis_clients)
 
 
 def get_strict_redis_default(host=None, port=None, db=None, **kwargs):
@@ -32,5 +68,11 @@ def get_strict_redis_default(host=None, port=None, db=None, **kwargs):
     host = host or app_settings.CRONMAN_REDIS_HOST
     port = port or app_settings.CRONMAN_REDIS_PORT
     db = db if db is not None else app_settings.CRONMAN_REDIS_DB
+    kwargs.setdefault(
+        "socket_timeout", app_settings.CRONMAN_REDIS_SOCKET_TIMEOUT
+    )
+    kwargs.setdefault(
+        "socket_connect_timeout", app_settings.CRONMAN_REDIS_CONNECT_TIMEOUT
+    )
 
     return StrictRedis(host=host, port=port, db=db, **kwargs)
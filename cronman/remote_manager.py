@@ -3,8 +3,11 @@
 
 from __future__ import unicode_literals
 
+import fnmatch
+import json
 import logging
 import socket
+import time
 
 from django.utils.functional import cached_property
 
@@ -22,8 +25,78 @@ class CronRemoteManager(BaseCronObject):
 
     STATUS_KEY = "cron_scheduler:status:{host_name}"
     KILL_KEY = "cron_scheduler:kill:{host_name}"
-
-    MAX_KILLS = 5
+    HANDOFF_KEY = "cron_scheduler:handoff"
+    ACK_KEY = "cron_scheduler:ack:{host_name}"  # hash: command -> result
+    HOSTS_KEY = "cron_scheduler:hosts"  # sorted set: host -> last seen
+    SNAPSHOT_KEY = "cron_scheduler:snapshot:{host_name}"  # hash
+    CHANNEL = "cron_scheduler:commands:{host_name}"  # "ALL" - cluster
+    # Commands published for listeners on status change:
+    STATUS_COMMANDS = {
+        CronSchedulerStatus.DISABLED: "disable",
+        CronSchedulerStatus.ENABLED: "enable",
+    }
+
+    MAX_HANDOFFS = 5  # per scheduler call, to spread jobs across hosts
+    ACK_TTL = 3600  # seconds
+    HOST_TTL = 86400  # seconds since last scheduler call, then host expires
+    SNAPSHOT_TTL = 600  # seconds
+    reconnect_interval = 5  # seconds between listener reconnect attempts
+    ack_poll_interval = 0.5  # seconds between acknowledgement checks
+
+    # Pops all elements of the list (KEYS[1]):
+    POP_LIST_SCRIPT = """
+local items = redis.call('LRANGE', KEYS[1], 0, -1)
+if #items > 0 then
+    redis.call('LTRIM', KEYS[1], #items, -1)
+end
+return items
+"""
+    # Stores acknowledgement (ARGV[2]) of command (ARGV[1]) in the hash
+    # (KEYS[1]) expiring after ARGV[3] seconds. Pending requests to kill
+    # job spec ARGV[4] (if not empty) are removed from the list (KEYS[2]):
+    ACK_SCRIPT = """
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+if ARGV[4] ~= '' then
+    redis.call('LREM', KEYS[2], 0, ARGV[4])
+end
+"""
+    # Everything Cron Scheduler needs in single call (one round trip):
+    # * global status (KEYS[1]) or per-host status (KEYS[2], removed),
+    # * all cron jobs to be killed (KEYS[3], list drained),
+    # * up to ARGV[2] handed off cron jobs (KEYS[4]) if ARGV[1] is set
+    #   and status is not "disabled" (ARGV[3]).
+    # Host (ARGV[5]) is registered in the set of hosts (KEYS[5]) with
+    # current time (ARGV[4]), hosts not seen for ARGV[6] seconds are removed.
+    SYNC_SCRIPT = """
+redis.call('ZADD', KEYS[5], ARGV[4], ARGV[5])
+redis.call(
+    'ZREMRANGEBYSCORE', KEYS[5], '-inf',
+    '(' .. (tonumber(ARGV[4]) - tonumber(ARGV[6]))
+)
+local status = redis.call('GET', KEYS[1])
+if not status then
+    status = redis.call('GET', KEYS[2])
+    if status then
+        redis.call('DEL', KEYS[2])
+    end
+end
+local kills = redis.call('LRANGE', KEYS[3], 0, -1)
+if #kills > 0 then
+    redis.call('LTRIM', KEYS[3], #kills, -1)
+end
+local handoffs = {}
+if ARGV[1] == '1' and status ~= ARGV[3] then
+    for i = 1, tonumber(ARGV[2]) do
+        local job_spec = redis.call('LPOP', KEYS[4])
+        if not job_spec then
+            break
+        end
+        handoffs[i] = job_spec
+    end
+end
+return {status, kills, handoffs}
+"""
 
     def __init__(self, host_name=None, **kwargs):
         kwargs["logger"] = kwargs.get("logger", logger)
@@ -35,23 +108,28 @@ class CronRemoteManager(BaseCronObject):
 
     @cached_property
     def redis_client(self):
-        """Redis client object (StrictRedis)"""
+        """Redis client object (StrictRedis), shared within the process"""
         return get_strict_redis()
 
     def _redis_call(self, method_name, args, description):
         """Wrapper over Redis client method call"""
+        return self._redis_execute(
+            lambda client: getattr(client, method_name)(*args), description
+        )
+
+    def _redis_execute(self, function, description):
+        """Calls `function(redis_client)`, handles connection errors"""
         if self.enabled:
             try:
-                from redis import ConnectionError
+                from redis import ConnectionError, TimeoutError
             except ImportError:
                 raise MissingDependency(
                     "Unable to import redis. "
                     "CronRemoteManager requires this dependency."
                 )
             try:
-                method = getattr(self.redis_client, method_name)
-                result = method(*args)
-            except ConnectionError as error:
+                result = function(self.redis_client)
+            except (ConnectionError, TimeoutError) as error:
                 self.logger.warning(
                     "Remote Manager: {} FAILED: {}".format(description, error)
                 )
@@ -92,6 +170,33 @@ class CronRemoteManager(BaseCronObject):
         """Pops first element from list on given key in Redis"""
         return self._redis_call("lpop", (key,), "LPOP {}".format(key))
 
+    def redis_eval(self, script, keys, args, description):
+        """Runs Lua script in Redis"""
+        return self._redis_call(
+            "eval",
+            (script, len(keys)) + tuple(keys) + tuple(args),
+            description,
+        )
+
+    def redis_hget(self, key, field):
+        """Retrieves value of hash field on given key in Redis"""
+        return self._redis_call(
+            "hget", (key, field), "HGET {} {}".format(key, field)
+        )
+
+    def redis_pipeline(self, commands, description):
+        """Sends Redis commands (list of pairs: method name, args)
+        in a single pipeline (one round trip), returns list of results
+        """
+
+        def execute(client):
+            pipeline = client.pipeline(transaction=False)
+            for method_name, args in commands:
+                getattr(pipeline, method_name)(*args)
+            return pipeline.execute()
+
+        return self._redis_execute(execute, description)
+
     # Redis keys:
 
     def get_status_key(self, host_name=None):
@@ -102,19 +207,31 @@ class CronRemoteManager(BaseCronObject):
         """Creates Cron Scheduler kill command key from host name"""
         return self.KILL_KEY.format(host_name=host_name or self.host_name)
 
+    def get_ack_key(self, host_name=None):
+        """Creates Cron Scheduler acknowledgements key from host name"""
+        return self.ACK_KEY.format(host_name=host_name or self.host_name)
+
+    def get_snapshot_key(self, host_name=None):
+        """Creates Cron Workers status snapshot key from host name"""
+        return self.SNAPSHOT_KEY.format(host_name=host_name or self.host_name)
+
+    def get_channel(self, host_name=None):
+        """Creates Cron Scheduler commands channel name from host name"""
+        return self.CHANNEL.format(host_name=host_name or self.host_name)
+
     # Cron Scheduler status operations:
 
     def set_status(self, status, host_name=None):
-        """Sets Cron Scheduler status"""
-        return self.redis_set(self.get_status_key(host_name=host_name), status)
+        """Sets Cron Scheduler status (and notifies listeners)"""
+        return self.execute("set_status", (status,), host_name)
 
     def get_status(self, host_name=None):
         """Retrieves Cron Scheduler status"""
-        return self.redis_get(self.get_status_key(host_name=host_name))
+        return self.execute("get_status", (), host_name)
 
     def clear_status(self, host_name=None):
         """Removes Cron Scheduler status"""
-        return self.redis_delete(self.get_status_key(host_name=host_name))
+        return self.execute("clear_status", (), host_name)
 
     def pop_status(self, host_name=None):
         """Retrieves and removes Cron Scheduler status"""
@@ -128,20 +245,315 @@ class CronRemoteManager(BaseCronObject):
     def pop_killed(self, host_name=None):
         """Pops all cron jobs to be killed"""
         key = self.get_kill_key(host_name=host_name)
-        job_specs = set()
-        for i in range(self.MAX_KILLS):
-            job_spec = self.redis_lpop(key)
-            if job_spec:
-                job_specs.add(job_spec)
-            else:
-                break
-        return job_specs
+        job_specs = self.redis_eval(
+            self.POP_LIST_SCRIPT, [key], [], "POP ALL {}".format(key)
+        )
+        return self.unique(job_specs or [])
 
     def kill(self, job_spec, host_name=None):
         """Ask the scheduler to kill a cron job of given job_spec"""
-        return self.redis_rpush(
-            self.get_kill_key(host_name=host_name), job_spec
+        return self.execute("kill", (job_spec,), host_name)
+
+    # Push-based commands (pub/sub):
+
+    def notify(self, command, host_name=None):
+        """Publishes command for listeners (`cron_remote_manager listen`)
+        of given host (or all hosts). Redis keys remain the durable way
+        of passing commands, as there may be no listener running.
+        """
+        return self.execute("notify", (command,), host_name)
+
+    def listen(self, callback, max_messages=None):
+        """Subscribes to commands channels of this host and the cluster,
+        calls `callback(command)` for each received command.
+        Reconnects when connection is lost, runs until interrupted
+        (or `max_messages` commands are received).
+        """
+        if not self.enabled:
+            self.logger.warning(
+                "Remote Manager: LISTEN CANCELLED: disabled in configuration"
+            )
+            return
+        try:
+            from redis import ConnectionError, TimeoutError
+        except ImportError:
+            raise MissingDependency(
+                "Unable to import redis. "
+                "CronRemoteManager requires this dependency."
+            )
+        channels = [self.get_channel(), self.get_channel("ALL")]
+        num_messages = 0
+        while True:
+            try:
+                pubsub = self.redis_client.pubsub(
+                    ignore_subscribe_messages=True
+                )
+                pubsub.subscribe(*channels)
+                self.logger.info(
+                    "Remote Manager: LISTEN {} OK".format(" ".join(channels))
+                )
+                for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    self.logger.info(
+                        "Remote Manager: RECEIVED {} {}".format(
+                            message["channel"], message["data"]
+                        )
+                    )
+                    callback(message["data"])
+                    num_messages += 1
+                    if max_messages and num_messages >= max_messages:
+                        break
+                pubsub.close()
+                return
+            except (ConnectionError, TimeoutError) as error:
+                self.logger.warning(
+                    "Remote Manager: LISTEN FAILED: {}. Reconnecting in {} "
+                    "second(s)...".format(error, self.reconnect_interval)
+                )
+                time.sleep(self.reconnect_interval)
+
+    # Acknowledgements:
+
+    def ack(self, command, result, host_name=None, received=False):
+        """Acknowledges that Cron Scheduler has processed given command
+        (`disable`, `enable` or `kill:<job spec>`), stores its result.
+        Kill command `received` through pub/sub (listener) is removed from
+        the list of pending requests, so it's not processed again
+        by the next scheduler call.
+        """
+        key = self.get_ack_key(host_name=host_name)
+        value = json.dumps({"result": result, "time": time.time()})
+        if received and command.startswith("kill:"):
+            handled_job_spec = command.split(":", 1)[1]
+        else:
+            handled_job_spec = ""
+        return self.redis_eval(
+            self.ACK_SCRIPT,
+            [key, self.get_kill_key(host_name=host_name)],
+            [command, value, self.ACK_TTL, handled_job_spec],
+            "ACK {} {}".format(key, command),
+        )
+
+    def get_ack(self, command, host_name=None):
+        """Retrieves acknowledgement of given command (dict with `result`
+        and `time` keys) or None if the command was not processed yet
+        """
+        value = self.redis_hget(self.get_ack_key(host_name=host_name), command)
+        if value is None:
+            return None
+        return json.loads(value)
+
+    def wait_for_acks(self, command, host_names, timeout):
+        """Waits until Cron Schedulers on all given hosts acknowledge
+        given command or `timeout` (seconds) expires.
+        Returns dict: host name -> (acknowledgement or None, seconds waited).
+        """
+        start = time.time()
+        acks = {}
+        pending = list(host_names)
+        while True:
+            # All pending hosts checked in one round trip:
+            values = self.redis_pipeline(
+                [
+                    ("hget", (self.get_ack_key(host_name), command))
+                    for host_name in pending
+                ],
+                "PIPELINE HGET {} x {} host(s)".format(command, len(pending)),
+            ) or [None] * len(pending)
+            for host_name, value in zip(list(pending), values):
+                if value is not None:
+                    acks[host_name] = (json.loads(value), time.time() - start)
+                    pending.remove(host_name)
+            elapsed = time.time() - start
+            if not pending or elapsed >= timeout:
+                break
+            time.sleep(min(self.ack_poll_interval, timeout - elapsed))
+        for host_name in pending:
+            acks[host_name] = (None, elapsed)
+        return acks
+
+    # Multiple hosts:
+
+    def get_hosts(self):
+        """Names of hosts (sorted) on which Cron Scheduler was running
+        in last `HOST_TTL` seconds
+        """
+        host_names = self._redis_call(
+            "zrangebyscore",
+            (self.HOSTS_KEY, time.time() - self.HOST_TTL, "+inf"),
+            "ZRANGEBYSCORE {}".format(self.HOSTS_KEY),
+        )
+        return sorted(host_names or [])
+
+    def expand_hosts(self, patterns):
+        """Expands host name globs (e.g. `prod-cron*`) using hosts
+        registered by Cron Schedulers. Other names are kept as they are.
+        """
+        host_names = []
+        registered = None
+        for pattern in patterns:
+            if any(char in pattern for char in "*?["):
+                if registered is None:
+                    registered = self.get_hosts()
+                host_names.extend(fnmatch.filter(registered, pattern))
+            else:
+                host_names.append(pattern)
+        return self.unique(host_names)
+
+    def get_commands(self, method_name, args, host_name):
+        """Redis commands (list of pairs: method name, args) sent by given
+        Remote Manager method for given host. Result of the first command
+        is the result of the method.
+        """
+        if method_name in ("disable", "enable"):
+            status = {
+                "disable": CronSchedulerStatus.DISABLED,
+                "enable": CronSchedulerStatus.ENABLED,
+            }[method_name]
+            return self.get_commands("set_status", (status,), host_name)
+        if method_name == "set_status":
+            commands = [("set", (self.get_status_key(host_name), args[0]))]
+            if args[0] in self.STATUS_COMMANDS:
+                commands += self.get_commands(
+                    "notify", (self.STATUS_COMMANDS[args[0]],), host_name
+                )
+            return commands
+        if method_name == "kill":
+            return [
+                ("rpush", (self.get_kill_key(host_name), args[0]))
+            ] + self.get_commands(
+                "notify", ("kill:{}".format(args[0]),), host_name
+            )
+        if method_name == "notify":
+            return [("publish", (self.get_channel(host_name), args[0]))]
+        if method_name == "get_status":
+            return [("get", (self.get_status_key(host_name),))]
+        if method_name == "clear_status":
+            return [("delete", (self.get_status_key(host_name),))]
+        raise ValueError('Unsupported method "{}"'.format(method_name))
+
+    def execute(self, method_name, args, host_name=None):
+        """Calls Remote Manager method for single host: single Redis
+        command is sent directly, more of them in a pipeline.
+        Returns result of the first command.
+        """
+        commands = self.get_commands(method_name, args, host_name)
+        description = " + ".join(
+            "{} {}".format(
+                command_name.upper(), " ".join(map(str, command_args))
+            )
+            for command_name, command_args in commands
+        )
+        if len(commands) == 1:
+            ((command_name, command_args),) = commands
+            return self._redis_call(command_name, command_args, description)
+        results = self.redis_pipeline(commands, description)
+        return results[0] if results else None
+
+    def fan_out(self, method_name, args, host_names, clear_ack=None):
+        """Calls Remote Manager method for all given hosts in a single
+        pipeline (one round trip). If `clear_ack` command is given, its
+        acknowledgements are removed first.
+        Returns list of results (one per host).
+        """
+        commands = []
+        offsets = []
+        for host_name in host_names:
+            if clear_ack:
+                commands.append(
+                    ("hdel", (self.get_ack_key(host_name), clear_ack))
+                )
+            offsets.append(len(commands))
+            commands.extend(self.get_commands(method_name, args, host_name))
+        results = self.redis_pipeline(
+            commands,
+            "PIPELINE {} x {} host(s)".format(method_name, len(host_names)),
+        )
+        if results is None:
+            return [None] * len(host_names)
+        return [results[offset] for offset in offsets]
+
+    # Status snapshots:
+
+    def publish_snapshot(self, snapshot, host_name=None):
+        """Stores snapshot of Cron Workers status (dict of strings
+        and numbers) in a hash expiring after `SNAPSHOT_TTL` seconds
+        """
+        key = self.get_snapshot_key(host_name=host_name)
+        return self.redis_pipeline(
+            [
+                ("hmset", (key, snapshot)),
+                ("expire", (key, self.SNAPSHOT_TTL)),
+            ],
+            "SNAPSHOT {}".format(key),
+        )
+
+    def get_snapshots(self, host_names):
+        """Retrieves status snapshots of given hosts in a single pipeline.
+        Returns list of dicts (one per host, empty if there is no snapshot).
+        """
+        results = self.redis_pipeline(
+            [
+                ("hgetall", (self.get_snapshot_key(host_name),))
+                for host_name in host_names
+            ],
+            "PIPELINE HGETALL snapshot x {} host(s)".format(len(host_names)),
+        )
+        return results or [{} for host_name in host_names]
+
+    # Cron Scheduler synchronization:
+
+    def sync(self, host_name=None, accept_handoff=False):
+        """Retrieves everything Cron Scheduler needs in single round trip:
+        * status - global one or per-host one (which gets removed),
+        * cron jobs to be killed (all of them are popped),
+        * cron jobs handed off by other hosts (if `accept_handoff` is set,
+          up to `MAX_HANDOFFS`, unless status is "disabled").
+        Returns triple (status, job specs to be killed, handed off job specs).
+        """
+        host_name = host_name or self.host_name
+        result = self.redis_eval(
+            self.SYNC_SCRIPT,
+            [
+                self.get_status_key("ALL"),
+                self.get_status_key(host_name),
+                self.get_kill_key(host_name),
+                self.HANDOFF_KEY,
+                self.HOSTS_KEY,
+            ],
+            [
+                "1" if accept_handoff else "0",
+                self.MAX_HANDOFFS,
+                CronSchedulerStatus.DISABLED,
+                time.time(),
+                host_name,
+                self.HOST_TTL,
+            ],
+            "SYNC {}".format(host_name),
         )
+        if not result:
+            return None, [], []
+        status, job_specs, handed_off = result
+        return status, self.unique(job_specs), handed_off
+
+    @staticmethod
+    def unique(values):
+        """Removes duplicates from a list (order is kept)"""
+        seen = set()
+        return [
+            value
+            for value in values
+            if value and not (value in seen or seen.add(value))
+        ]
+
+    # Cross-host resume (handoff) operations:
+
+    def handoff(self, job_spec):
+        """Publishes job spec of suspended cron job, so it can be resumed
+        by Cron Scheduler on any host
+        """
+        return self.redis_rpush(self.HANDOFF_KEY, job_spec)
 
     # Shortcuts:
 
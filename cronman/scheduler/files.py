@@ -4,6 +4,7 @@
 from __future__ import unicode_literals
 
 import os
+import time
 
 
 class BaseCronSchedulerFile(object):
@@ -37,3 +38,29 @@ class CronSchedulerResumeFile(BaseCronSchedulerFile):
     """Resume file for Cron Scheduler"""
 
     name = "scheduler.resume"
+
+    def age(self):
+        """Number of seconds since the file was created (or None)"""
+        try:
+            return max(0.0, time.time() - os.path.getmtime(self.path))
+        except OSError:  # No resume file
+            return None
+
+
+class CronSchedulerGCFile(BaseCronSchedulerFile):
+    """Progress of incremental cleanup - name of the last checked PID file"""
+
+    name = "scheduler.gc"
+
+    def read(self):
+        """Retrieves name of the last checked PID file (or None)"""
+        try:
+            with open(self.path) as file_:
+                return file_.read() or None
+        except IOError:  # No cleanup done yet
+            return None
+
+    def write(self, last_checked):
+        """Stores name of the last checked PID file"""
+        with open(self.path, "w") as file_:
+            file_.write(last_checked or "")
@@ -4,7 +4,9 @@
 from __future__ import unicode_literals
 
 import datetime
+import json
 import logging
+import time
 
 from django.utils.functional import cached_property
 
@@ -16,17 +18,27 @@ from cronman.exceptions import (
     CronSchedulerLocked,
     CronSchedulerNoJobs,
     CronSchedulerUnlocked,
+    CronWorkerInvalidParams,
 )
 from cronman.monitor import send_errors_to_sentry
 from cronman.remote_manager import CronRemoteManager
 from cronman.scheduler.files import (
+    CronSchedulerGCFile,
     CronSchedulerLockFile,
     CronSchedulerResumeFile,
 )
 from cronman.spawner import CronSpawner
-from cronman.taxonomies import CronSchedulerStatus
-from cronman.utils import cron_jobs_module_config, format_exception
-from cronman.worker import CronWorker
+from cronman.taxonomies import CronSchedulerStatus, JobSpecStatus
+from cronman.utils import (
+    bool_param,
+    config,
+    cron_jobs_module_config,
+    format_exception,
+)
+from cronman.worker import CronWorker, CronWorkerPIDList
+from cronman.worker.process_manager import get_load_average, get_memory_info
+from cronman.worker.worker_list import CronWorkerJobSpecList
+from cronman.worker.worker_orphans import CronWorkerOrphanList
 
 logger = logging.getLogger("cronman.command.cron_scheduler")
 
@@ -50,6 +62,7 @@ class CronScheduler(BaseCronObject):
         self.now = now or datetime.datetime.now()
         self.lock_file = CronSchedulerLockFile(self.data_dir)
         self.resume_file = CronSchedulerResumeFile(self.data_dir)
+        self.gc_file = CronSchedulerGCFile(self.data_dir)
         self.remote_manager = CronRemoteManager()
 
     @cached_property
@@ -85,7 +98,9 @@ class CronScheduler(BaseCronObject):
                 )
             )
 
-        killed_jobs = self.remote_manager.pop_killed()
+        remote_status, killed_jobs, handed_off = self.remote_manager.sync(
+            accept_handoff=not self.lock_file.exists()
+        )
         for job_spec_or_pid in killed_jobs:
             self.logger.info(
                 'Scheduler: processing KILL "{}" request from '
@@ -93,14 +108,9 @@ class CronScheduler(BaseCronObject):
             )
             kill_output = self.cron_worker.kill(job_spec_or_pid)
             self.logger.info(kill_output)
-
-        remote_status = (
-            # Retrieve global (per-cluster) status:
-            self.remote_manager.get_status("ALL")
-            or
-            # Retrieve per-host status and remove it from the queue:
-            self.remote_manager.pop_status()
-        )
+            self.remote_manager.ack(
+                "kill:{}".format(job_spec_or_pid), kill_output
+            )
 
         if self.lock_file.exists():
             if remote_status == CronSchedulerStatus.ENABLED:
@@ -109,15 +119,17 @@ class CronScheduler(BaseCronObject):
                     "Remote Manager..."
                 )
                 # Enable the scheduler, create resume file:
-                self.enable(workers=True)
+                self.ack_status(remote_status, self.enable(workers=True))
             else:
-                return self.warning(
+                output = self.warning(
                     CronSchedulerLocked(
                         "Scheduler is disabled (lock file exists). "
                         "To enable it again, please run "
                         '"cron_scheduler enable". Quitting now.'
                     )
                 )
+                self.publish_snapshot()
+                return self.ack_status(remote_status, output)
         else:
             if remote_status == CronSchedulerStatus.DISABLED:
                 self.logger.info(
@@ -125,13 +137,23 @@ class CronScheduler(BaseCronObject):
                     "Remote Manager..."
                 )
                 # Disable scheduler, kill running workers, quit:
-                return self.disable(workers=True)
+                output = self.ack_status(
+                    remote_status, self.disable(workers=True)
+                )
+                self.publish_snapshot()
+                return output
+            if remote_status == CronSchedulerStatus.ENABLED:
+                self.ack_status(remote_status, "Scheduler is enabled.\n")
+
+        output = self.accept_handoff(handed_off)
 
         if self.resume_file.exists():
+            period = self.resume_file.age()
             self.resume_file.delete()
-            output = self.resume_workers()
-        else:
-            output = ""
+            output += self.resume_workers(period)
+
+        output += self.collect_garbage()
+        output += self.reconcile_orphans()
 
         run_start = datetime.datetime.now()
         jobs = self.get_jobs()
@@ -161,6 +183,7 @@ class CronScheduler(BaseCronObject):
             raise error
         else:
             self.on_success()
+        self.publish_snapshot()
         return output
 
     @send_errors_to_sentry
@@ -212,6 +235,61 @@ class CronScheduler(BaseCronObject):
 
         return "Scheduler enabled ({}).\n".format(", ".join(summary))
 
+    @send_errors_to_sentry
+    def apply_remote_command(self, command):
+        """Applies command received from Remote Manager listener
+        (`disable`, `enable` or `kill:<job spec or PID>`) immediately,
+        same way as requests polled from Redis in `run`
+        """
+        if command == "disable":
+            if self.lock_file.exists():
+                output = ""  # Already disabled
+            else:
+                self.logger.info(
+                    "Scheduler: processing DISABLE command from "
+                    "Remote Manager..."
+                )
+                output = self.disable(workers=True)
+        elif command == "enable":
+            if not self.lock_file.exists():
+                output = ""  # Already enabled
+            else:
+                self.logger.info(
+                    "Scheduler: processing ENABLE command from "
+                    "Remote Manager..."
+                )
+                output = self.enable(workers=True)
+                self.resume_file.delete()
+                output += self.resume_workers()
+        elif command.startswith("kill:"):
+            job_spec_or_pid = command.split(":", 1)[1]
+            self.logger.info(
+                'Scheduler: processing KILL "{}" command from '
+                "Remote Manager...".format(job_spec_or_pid)
+            )
+            output = self.cron_worker.kill(job_spec_or_pid)
+        else:
+            self.logger.warning(
+                'Scheduler: unknown command "{}" from Remote Manager.'.format(
+                    command
+                )
+            )
+            return ""
+        self.remote_manager.ack(
+            command, output or "No changes.\n", received=True
+        )
+        return output
+
+    def ack_status(self, status, output):
+        """Acknowledges status request from Remote Manager, so
+        `cron_remote_manager --wait` can report the outcome.
+        Returns given output.
+        """
+        command = self.remote_manager.STATUS_COMMANDS.get(status)
+        if command:
+            self.remote_manager.ack(command, output)
+        return output
+
     # Helpers:
 
     def get_datetime_range(self):
@@ -238,13 +316,152 @@ class CronScheduler(BaseCronObject):
             for _job_start, time_spec, job_spec in sorted(to_be_started)
         ]
 
+    def collect_garbage(self):
+        """Removes dead PID files (except ones holding job specs of
+        resumable jobs) within time limit, continuing from the file checked
+        last in previous call. Returns summary (empty if nothing was done).
+        """
+        time_limit = float(config("CRONMAN_SCHEDULER_GC_TIME_LIMIT") or 0)
+        if not time_limit:
+            return ""
+        worker_pid_list = CronWorkerPIDList(self.data_dir, scan_files=True)
+        items, totals = worker_pid_list.clean(
+            keep_resumable=True,
+            time_limit=time_limit,
+            start_after=self.gc_file.read(),
+        )
+        clean_stats = worker_pid_list.clean_stats
+        self.gc_file.write(clean_stats["last_checked"])
+        if not totals["TOTAL"] and not clean_stats["unchecked"]:
+            return ""
+        summary = (
+            "Cleanup: {} dead PID file(s) deleted, {} kept for resume, "
+            "{} not checked.\n".format(
+                totals["TOTAL"],
+                clean_stats["kept"],
+                clean_stats["unchecked"],
+            )
+        )
+        self.logger.info(summary.strip())
+        return summary
+
+    def accept_handoff(self, job_specs):
+        """Creates JobSpec files for cron jobs suspended on other hosts
+        (`cron_worker suspend --handoff`), so they are resumed in this call.
+        Job specs which cannot be resumed here are pushed back to the list.
+        Returns summary (empty if nothing was received).
+        """
+        if not job_specs:
+            return ""
+        cron_worker = CronWorker(
+            data_dir=self.data_dir, debug=self.debug, logger=self.logger
+        )
+        num_received = 0
+        for job_spec in job_specs:
+            try:
+                name, args, kwargs, cron_job_class = (
+                    cron_worker.parse_job_spec_with_class(job_spec)
+                )
+            except CronWorkerInvalidParams as error:
+                # Not lost - may be resumed by other host (e.g. with
+                # the cron job registered):
+                self.remote_manager.handoff(job_spec)
+                self.logger.warning(
+                    'Handoff: unable to resume "{}", handed off again: '
+                    "{}".format(job_spec, format_exception(error))
+                )
+                continue
+            pid_file = cron_worker.get_pid_file(
+                cron_job_class, name, args, kwargs
+            )
+            pid_file.get_free_job_spec_file().create(job_spec)
+            num_received += 1
+        if not num_received:
+            return ""
+        self.resume_file.create()
+        summary = "Handoff: {} job(s) received.\n".format(num_received)
+        self.logger.info(summary.strip())
+        return summary
+
+    def reconcile_orphans(self):
+        """Adopts worker processes running without PID files, or terminates
+        them if their lock is held by other worker.
+        Returns summary (empty if no orphans were found).
+        """
+        if not bool_param(config("CRONMAN_SCHEDULER_ORPHANS")):
+            return ""
+        items, totals = CronWorkerOrphanList(
+            CronWorker(
+                data_dir=self.data_dir, debug=self.debug, logger=self.logger
+            )
+        ).adopt()
+        if not totals["TOTAL"]:
+            return ""
+        summary = "Orphans: {}.\n".format(
+            ", ".join(
+                "{} {}".format(count, status.lower())
+                for status, count in totals.items()
+                if status != "TOTAL"
+            )
+        )
+        self.logger.warning(summary.strip())
+        return summary
+
+    def publish_snapshot(self):
+        """Publishes status of Cron Workers on this host (with system load
+        and memory) to Redis, so `cron_remote_manager status` can show
+        the whole cluster
+        """
+        if not (
+            self.remote_manager.enabled
+            and bool_param(config("CRONMAN_SCHEDULER_SNAPSHOT"))
+        ):
+            return
+        items, totals = CronWorkerPIDList(self.data_dir).status()
+        load = get_load_average()
+        memory = get_memory_info()
+        snapshot = {
+            "time": time.time(),
+            "load": (
+                " ".join("{:.2f}".format(value) for value in load)
+                if load
+                else ""
+            ),
+            "memory_total": memory[0] if memory else "",
+            "memory_available": memory[1] if memory else "",
+            "workers": json.dumps(
+                [
+                    {
+                        key: value
+                        for key, value in item.items()
+                        if not key.startswith("_")
+                    }
+                    for item in items
+                ]
+            ),
+            "totals": json.dumps(totals),
+        }
+        self.remote_manager.publish_snapshot(snapshot)
+
     def start_worker(self, job_spec):
         """Starts a worker process for given job spec"""
         return self.cron_spawner.start_worker(job_spec)
 
-    def resume_workers(self):
-        """Resumes killed workers"""
-        return self.cron_worker.resume()
+    def resume_workers(self, period=None):
+        """Resumes killed workers, as many as `CRONMAN_RESUME_RATE_LIMIT`
+        allows for `period` (seconds) since previous call. When some of them
+        are left for later (`CRONMAN_RESUME_RATE_LIMIT`,
+        `CRONMAN_RESUME_MAX_CONCURRENT`), resume file is created again,
+        so next call continues.
+        """
+        output = self.cron_worker.resume(period=period)
+        if config("CRONMAN_RESUME_RATE_LIMIT") or config(
+            "CRONMAN_RESUME_MAX_CONCURRENT"
+        ) not in (None, ""):
+            items = CronWorkerJobSpecList(self.data_dir).status()[0]
+            if any(item["status"] == JobSpecStatus.STALLED for item in items):
+                self.resume_file.create()
+        return output
 
     # Cron monitoring implementation
 
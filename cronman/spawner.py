@@ -36,7 +36,16 @@ class CronSpawner(BaseCronObject):
 
         environ = os.environ.copy()
         environ["CRONMAN_JOBS_MODULE"] = str(config("CRONMAN_JOBS_MODULE"))
+        environ["CRONMAN_JOBS_MANIFEST"] = str(
+            config("CRONMAN_JOBS_MANIFEST") or ""
+        )
+        environ["CRONMAN_WORKER_SETTINGS"] = str(
+            config("CRONMAN_WORKER_SETTINGS") or ""
+        )
         environ["CRONMAN_DATA_DIR"] = str(self.data_dir)
+        environ["CRONMAN_DATA_DIR_DURABILITY"] = str(
+            config("CRONMAN_DATA_DIR_DURABILITY")
+        )
         environ["CRONMAN_DEBUG"] = str(
             int(bool_param(config("CRONMAN_DEBUG"), default=False))
         )
@@ -59,23 +68,20 @@ class CronSpawner(BaseCronObject):
         """Constructs a list of arguments to be prepended to process args
         in order to assign CPU/IO priority.
         """
-        cron_job_class = cron_job_registry.get(parse_job_spec(job_spec)[0])
-        if (
-            app_settings.CRONMAN_NICE_CMD
-            and cron_job_class.worker_cpu_priority is not None
-        ):
+        # Class attributes are read from the manifest when available:
+        cron_job_info = cron_job_registry.get_info(parse_job_spec(job_spec)[0])
+        worker_cpu_priority = cron_job_info["worker_cpu_priority"]
+        worker_io_priority = cron_job_info["worker_io_priority"]
+        if app_settings.CRONMAN_NICE_CMD and worker_cpu_priority is not None:
             cpu_priority_args = [
                 app_settings.CRONMAN_NICE_CMD,
                 "-n",
-                str(cron_job_class.worker_cpu_priority),
+                str(worker_cpu_priority),
             ]
         else:
             cpu_priority_args = []
-        if (
-            app_settings.CRONMAN_IONICE_CMD
-            and cron_job_class.worker_io_priority is not None
-        ):
-            io_class, io_class_data = cron_job_class.worker_io_priority
+        if app_settings.CRONMAN_IONICE_CMD and worker_io_priority is not None:
+            io_class, io_class_data = worker_io_priority
             io_priority_args = [
                 app_settings.CRONMAN_IONICE_CMD,
                 "-c",
@@ -87,12 +93,26 @@ class CronSpawner(BaseCronObject):
             io_priority_args = []
         return cpu_priority_args + io_priority_args
 
+    def get_settings_options(self, job_spec):
+        """Constructs a list of `--settings=` options for worker process:
+        settings module declared by cron job class, `CRONMAN_WORKER_SETTINGS`
+        or settings module passed to current process.
+        """
+        worker_settings = cron_job_registry.get_info(
+            parse_job_spec(job_spec)[0]
+        )["worker_settings"] or config("CRONMAN_WORKER_SETTINGS")
+        if worker_settings:
+            options = ["--settings={}".format(worker_settings)]
+        else:
+            options = [a for a in sys.argv if a.startswith("--settings=")]
+        return options
+
     def start_worker(self, job_spec):
         """Starts a worker process for given job spec"""
         # Building process parameters:
         kwargs = {"env": self.get_worker_env()}
         args = [sys.executable, sys.argv[0], "cron_worker", "run", job_spec]
-        options = [a for a in sys.argv if a.startswith("--settings=")]
+        options = self.get_settings_options(job_spec)
         if self.sentry.raven_cmd:
             # All worker processes should be executed by raven-cmd:
             args[-1] = args[-1].replace('"', "'")
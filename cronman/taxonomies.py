@@ -9,6 +9,24 @@ class LockType(object):
 
     CLASS = "class"  # one lock per CronJob class
     PARAMS = "params"  # one lock per CronJob class + hash of params
+    SLOTS = "slots"  # N locks per CronJob class or group (`lock_slots`)
+
+
+class LockScope(object):
+    """Scope of lock acquired by Worker"""
+
+    LOCAL = "local"  # PID file in data directory (single host)
+    CLUSTER = "cluster"  # PID file + lease in Redis (all hosts)
+
+
+class DataDirDurability(object):
+    """Durability of writes to data directory files"""
+
+    FSYNC = "fsync"  # written in place and flushed to disk
+    ATOMIC = "atomic"  # written to temporary file and renamed, no flush
+    NONE = "none"  # written in place, no flush (e.g. data dir on tmpfs)
+
+    CHOICES = (FSYNC, ATOMIC, NONE)
 
 
 class PIDStatus(object):
@@ -28,6 +46,24 @@ class JobSpecStatus(object):
     ACTIVE = "ACTIVE"  # JobSpec file exists and process is alive
     DELETED = "DELETED"  # JobSpec file has been deleted
     RESUMED = "RESUMED"  # Process has been started (resumed)
+    PENDING = "PENDING"  # Resume postponed (throttling)
+    ABANDONED = "ABANDONED"  # Resumed too many times, JobSpec file deleted
+    HANDED_OFF = "HANDED_OFF"  # Published to be resumed on other host
+
+
+class StatsFileStatus(object):
+    """Status of Stats file"""
+
+    DELETED = "DELETED"  # Stats file (not updated recently) has been deleted
+
+
+class OrphanStatus(object):
+    """Status of running Cron Worker process without PID file"""
+
+    ORPHAN = "ORPHAN"  # Process found, nothing done yet
+    ADOPTED = "ADOPTED"  # PID file has been created for the process
+    TERMED = "TERMED"  # Killed by SIGTERM (lock held by other process)
+    IGNORED = "IGNORED"  # Unknown cron job, left untouched
 
 
 class CronTaskStatus(object):
@@ -8,6 +8,7 @@ import hashlib
 import os
 import shutil
 import signal
+import time
 from unittest import mock
 
 from django.contrib.auth import get_user_model
@@ -41,8 +42,10 @@ def override_cron_settings(**kwargs):
     return override_settings(**defaults)
 
 
-def create_pid_file(job_spec, pid=None):
-    """Utility function to create PID file for given job spec"""
+def create_pid_file(job_spec, pid=None, can_resume=False):
+    """Utility function to create PID file for given job spec
+    (job spec is stored in the file if `can_resume` is set)
+    """
     pid = os.getpid() if pid is None else pid
     worker = CronWorker()
     name, args, kwargs, cron_job_class = worker.parse_job_spec_with_class(
@@ -50,7 +53,22 @@ def create_pid_file(job_spec, pid=None):
     )
     pid_file = worker.get_pid_file(cron_job_class, name, args, kwargs)
     with mock.patch("cronman.worker.worker_file.os.getpid", lambda: pid):
-        pid_file.create()
+        pid_file.create(
+            job_spec, can_resume, cron_job_class.kill_grace_seconds
+        )
+    return pid_file
+
+
+def lock_pid_file(job_spec):
+    """Utility function to acquire the lock on PID file for given job spec,
+    as it would be done by running worker process.
+    """
+    worker = CronWorker()
+    name, args, kwargs, cron_job_class = worker.parse_job_spec_with_class(
+        job_spec
+    )
+    pid_file = worker.get_pid_file(cron_job_class, name, args, kwargs)
+    pid_file.acquire()
     return pid_file
 
 
@@ -74,21 +92,20 @@ def get_params_hash(args, kwargs):
 
 
 def patch_ps(active_pids=(), zombie_pids=()):
-    """Patches `ps` calls made by ProcessManager"""
-
-    def mock_check_output(*args, **kwargs):
-        pid = int(args[0][2])
-        if pid in active_pids:
-            status = "R"
-        elif pid in zombie_pids:
-            status = "Z"
-        else:
-            status = ""
-        return "{}\n".format(status)
+    """Patches process state checks (`/proc` or `ps`) made by ProcessManager"""
+
+    def mock_get_process_states(pids):
+        states = {}
+        for pid in pids:
+            if pid in active_pids:
+                states[pid] = "R"
+            elif pid in zombie_pids:
+                states[pid] = "Z"
+        return states
 
     return mock.patch(
-        "cronman.worker.process_manager.subprocess.check_output",
-        mock_check_output,
+        "cronman.worker.process_manager.get_process_states",
+        mock_get_process_states,
     )
 
 
@@ -108,6 +125,34 @@ def patch_kill(active_pids=(), die_on_sigterm_pids=(), die_on_sigkill_pids=()):
     return mock.patch("cronman.worker.process_manager.os.kill", mock_kill)
 
 
+def patch_proc(processes, data_dir=TEST_CRONMAN_DATA_DIR, age=3600):
+    """Patches `/proc` scan made by CronWorkerOrphanList:
+    `processes` is a dict {pid: command line (list)}
+    """
+
+    def patch(name, function):
+        return mock.patch(
+            "cronman.worker.worker_orphans.{}".format(name), function
+        )
+
+    patchers = [
+        patch("get_all_pids", lambda: sorted(processes)),
+        patch("get_process_cmdline", processes.get),
+        patch(
+            "get_process_environ",
+            lambda pid: {"CRONMAN_DATA_DIR": data_dir},
+        ),
+        patch("get_process_start_time", lambda pid: time.time() - age),
+    ]
+
+    def decorator(function):
+        for patcher in reversed(patchers):
+            function = patcher(function)
+        return function
+
+    return decorator
+
+
 def mock_environ():
     """Mock for `os.environ.copy`"""
     return {"SOME_ENV_VAR": "42"}
@@ -121,7 +166,10 @@ def expected_worker_env():
         "CRONMAN_CRONITOR_ENABLED": "0",
         "CRONMAN_CRONITOR_URL": cronitor_url,
         "CRONMAN_JOBS_MODULE": "cronman.tests.cron_jobs",
+        "CRONMAN_JOBS_MANIFEST": "",
+        "CRONMAN_WORKER_SETTINGS": "",
         "CRONMAN_DATA_DIR": TEST_CRONMAN_DATA_DIR,
+        "CRONMAN_DATA_DIR_DURABILITY": "fsync",
         "CRONMAN_DEBUG": "1",
         "CRONMAN_SLACK_ENABLED": "0",
         "CRONMAN_NICE_CMD": "nice",
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+# vi:si:et:sw=4:sts=4:ts=4
+
+from __future__ import unicode_literals
+
+import json
+import os
+import socket
+
+from django.test import SimpleTestCase
+
+from unittest import mock
+import redis
+
+from cronman.exceptions import CronWorkerClusterLockError
+from cronman.worker.cluster_lock import (
+    RELEASE_SCRIPT,
+    RENEW_SCRIPT,
+    CronWorkerClusterLock,
+)
+
+
+@mock.patch(
+    "cronman.worker.cluster_lock.CronWorkerClusterLock.redis_client",
+    new_callable=mock.PropertyMock,
+)
+class CronWorkerClusterLockTestCase(SimpleTestCase):
+    """Tests for CronWorkerClusterLock class"""
+
+    def test_acquire_release(self, mock_redis):
+        """Test for acquire and release methods - lock is free"""
+        mock_redis.return_value.incr.return_value = 42
+        mock_redis.return_value.set.return_value = True
+        lock = CronWorkerClusterLock("Sleep", ttl=30)
+        self.assertTrue(lock.acquire())
+        value = json.dumps(
+            {"token": 42, "host": socket.gethostname(), "pid": os.getpid()}
+        )
+        self.assertEqual(lock.token, 42)
+        mock_redis.return_value.incr.assert_called_once_with(
+            "cron_lock:Sleep:token"
+        )
+        mock_redis.return_value.set.assert_called_once_with(
+            "cron_lock:Sleep", value, nx=True, px=30000
+        )
+        self.assertTrue(lock._renewal_thread.is_alive())
+        lock.release()
+        self.assertIsNone(lock._renewal_thread)
+        self.assertIsNone(lock.token)
+        mock_redis.return_value.eval.assert_called_once_with(
+            RELEASE_SCRIPT, 1, "cron_lock:Sleep", value
+        )
+
+    def test_acquire_taken(self, mock_redis):
+        """Test for acquire method - lock is held by other process"""
+        mock_redis.return_value.incr.return_value = 43
+        mock_redis.return_value.set.return_value = None
+        lock = CronWorkerClusterLock("Sleep", ttl=30)
+        self.assertFalse(lock.acquire())
+        self.assertIsNone(lock.token)
+        self.assertIsNone(lock._renewal_thread)
+
+    def test_acquire_no_redis(self, mock_redis):
+        """Test for acquire method - Redis is not available"""
+        mock_redis.return_value.incr.side_effect = redis.ConnectionError
+        lock = CronWorkerClusterLock("Sleep", ttl=30)
+        with self.assertRaises(CronWorkerClusterLockError):
+            lock.acquire()
+        self.assertIsNone(lock.token)
+        self.assertIsNone(lock._renewal_thread)
+
+    def test_renew(self, mock_redis):
+        """Test for renew method"""
+        mock_redis.return_value.eval.return_value = 1
+        lock = CronWorkerClusterLock("Sleep", ttl=30)
+        lock.value = "VALUE"
+        self.assertTrue(lock.renew())
+        mock_redis.return_value.eval.assert_called_once_with(
+            RENEW_SCRIPT, 1, "cron_lock:Sleep", "VALUE", 30000
+        )
+        mock_redis.return_value.eval.return_value = 0
+        self.assertFalse(lock.renew())
+
+    def test_renew_periodically_lost(self, mock_redis):
+        """Test for background renewal - lease lost"""
+        mock_redis.return_value.eval.return_value = 0
+        lock = CronWorkerClusterLock("Sleep", ttl=0.03)
+        lock._renew_periodically()  # exits when lease is lost
+        self.assertTrue(lock.lost)
+
+    def test_renew_periodically_no_redis(self, mock_redis):
+        """Test for background renewal - lease not renewed within TTL
+        (Redis errors) is lost
+        """
+        mock_redis.return_value.eval.side_effect = redis.ConnectionError
+        lock = CronWorkerClusterLock("Sleep", ttl=0.03)
+        lock._renew_periodically()  # exits when lease expires
+        self.assertTrue(lock.lost)
+        self.assertGreater(mock_redis.return_value.eval.call_count, 1)
+
+    def test_holder(self, mock_redis):
+        """Test for holder method"""
+        mock_redis.return_value.get.return_value = json.dumps(
+            {"token": 7, "host": "node-2", "pid": 1001}
+        )
+        lock = CronWorkerClusterLock("Sleep", ttl=30)
+        self.assertEqual(
+            lock.holder(), {"token": 7, "host": "node-2", "pid": 1001}
+        )
+        mock_redis.return_value.get.assert_called_once_with("cron_lock:Sleep")
+        mock_redis.return_value.get.return_value = None
+        self.assertIsNone(lock.holder())
@@ -3,8 +3,12 @@
 
 from __future__ import unicode_literals
 
+import fcntl
+import io
+import json
 import os
 import socket
+import time
 
 from django.conf import settings
 from django.core.management import CommandError, call_command
@@ -29,6 +33,7 @@ from cronman.tests.base import (
 from cronman.tests.cron_jobs import CRON_JOBS
 from cronman.tests.tools import call_worker
 from cronman.worker import CronWorkerPIDFile, ProcessManager
+from cronman.worker.worker_file import CronWorkerStatsFile
 
 
 class SchedulerCommandTestCase(BaseCronTestCase):
@@ -119,16 +124,12 @@ class SchedulerCommandTestCase(BaseCronTestCase):
         through Remote Manager.
         """
 
-        def redis_get(key, *args, **kwargs):
-            """Return CronSchedulerStatus.ENABLED for current host only."""
-            if key == "cron_scheduler:status:{}".format(socket.gethostname()):
-                value = CronSchedulerStatus.ENABLED
-            else:
-                value = None
-            return value
-
-        mock_redis.return_value.get.side_effect = redis_get
-        mock_redis.return_value.lpop.return_value = None  # No remote KILL
+        # Status of current host, no KILL requests:
+        mock_redis.return_value.eval.return_value = [
+            CronSchedulerStatus.ENABLED,
+            [],
+            [],
+        ]
         mock_cron_worker.return_value.resume.return_value = "<resume output>"
 
         scheduler = CronScheduler()
@@ -144,7 +145,41 @@ class SchedulerCommandTestCase(BaseCronTestCase):
             ]
         )
         mock_cron_worker.return_value.resume.assert_called_once()
-        mock_redis.return_value.delete.assert_called_once()
+        # Single round trip to Redis to get requests:
+        sync_call, ack_call = mock_redis.return_value.eval.call_args_list
+        self.assertEqual(
+            sync_call,
+            mock.call(
+                CronRemoteManager.SYNC_SCRIPT,
+                5,
+                "cron_scheduler:status:ALL",
+                "cron_scheduler:status:{}".format(socket.gethostname()),
+                "cron_scheduler:kill:{}".format(socket.gethostname()),
+                "cron_scheduler:handoff",
+                "cron_scheduler:hosts",
+                "1",  # no lock file - handed off jobs accepted
+                CronRemoteManager.MAX_HANDOFFS,
+                CronSchedulerStatus.DISABLED,
+                mock.ANY,  # current time - host registered
+                socket.gethostname(),
+                CronRemoteManager.HOST_TTL,  # older hosts removed
+            ),
+        )
+        # Request acknowledged:
+        self.assertEqual(
+            ack_call[0][:5],
+            (
+                CronRemoteManager.ACK_SCRIPT,
+                2,
+                "cron_scheduler:ack:{}".format(socket.gethostname()),
+                "cron_scheduler:kill:{}".format(socket.gethostname()),
+                "enable",
+            ),
+        )
+        self.assertEqual(
+            json.loads(ack_call[0][5])["result"],
+            "Scheduler is enabled.\n",
+        )
 
     @override_cron_settings(CRONMAN_REMOTE_MANAGER_ENABLED=True)
     @mock.patch("cronman.scheduler.scheduler.CronSpawner.start_worker")
@@ -162,15 +197,12 @@ class SchedulerCommandTestCase(BaseCronTestCase):
         """Test for running scheduler when kill request has been sent
         through Remote Manager.
         """
-        return_values = ["ParseInvoiceData"]
-
-        def mock_lpop(key):
-            try:
-                return return_values.pop()
-            except IndexError:
-                return None
-
-        mock_redis.return_value.lpop.side_effect = mock_lpop
+        mock_redis.return_value.eval.return_value = [
+            None,
+            ["ParseInvoiceData", "ParseInvoiceData"],
+            [],
+        ]
+        mock_cron_worker.return_value.kill.return_value = "<kill output>"
         output = call_command("cron_scheduler", "run") or ""
         self.assertIn("Started {} job(s)".format(len(CRON_JOBS)), output)
         mock_start.assert_has_calls(
@@ -182,6 +214,73 @@ class SchedulerCommandTestCase(BaseCronTestCase):
         mock_cron_worker.return_value.kill.assert_called_once_with(
             "ParseInvoiceData"
         )
+        ack_call = mock_redis.return_value.eval.call_args_list[1]
+        self.assertEqual(ack_call[0][4], "kill:ParseInvoiceData")
+        self.assertEqual(json.loads(ack_call[0][5])["result"], "<kill output>")
+        self.assertEqual(ack_call[0][7], "")  # popped already
+
+    @override_cron_settings(CRONMAN_REMOTE_MANAGER_ENABLED=True)
+    @mock.patch("cronman.scheduler.scheduler.CronSpawner.start_worker")
+    @mock.patch(
+        "cronman.remote_manager.CronRemoteManager.redis_client",
+        new_callable=mock.PropertyMock,
+    )
+    @patch_ps()
+    @patch_kill()
+    def test_run_handoff_received(self, mock_redis, mock_start):
+        """Test for running scheduler when jobs have been handed off
+        by other host - they are resumed in this call, unknown ones are
+        handed off again
+        """
+        mock_redis.return_value.eval.return_value = [
+            None,
+            [],
+            ["PersistentSleep:seconds=30", "UnknownJob"],
+        ]
+        mock_start.return_value = 1001
+        output = call_command("cron_scheduler", "run") or ""
+        self.assertIn("Handoff: 1 job(s) received.\n", output)
+        self.assertIn(
+            "RESUME:\n"
+            "PersistentSleep\tRESUMED\tPersistentSleep:seconds=30\n",
+            output,
+        )
+        mock_start.assert_any_call("PersistentSleep:seconds=30")
+        mock_redis.return_value.rpush.assert_called_once_with(
+            "cron_scheduler:handoff", "UnknownJob"
+        )
+
+    @override_cron_settings(CRONMAN_REMOTE_MANAGER_ENABLED=True)
+    @mock.patch("cronman.scheduler.scheduler.CronSpawner.start_worker")
+    @mock.patch(
+        "cronman.remote_manager.CronRemoteManager.redis_client",
+        new_callable=mock.PropertyMock,
+    )
+    @patch_ps()
+    @patch_kill()
+    def test_run_handoff_received_slots(self, mock_redis, mock_start):
+        """Test for running scheduler when jobs locked by slots have been
+        handed off by other host - each one gets its own JobSpec file
+        """
+        mock_redis.return_value.eval.return_value = [
+            None,
+            [],
+            [
+                "SlotsLockedSleep:seconds=1",
+                "SlotsLockedSleep:seconds=2",
+                "SlotsLockedSleep:seconds=3",
+            ],
+        ]
+        mock_start.return_value = 1001
+        output = call_command("cron_scheduler", "run") or ""
+        self.assertIn("Handoff: 3 job(s) received.\n", output)
+        self.assertIn(
+            "RESUME:\n"
+            "SlotsLockedSleep_slot1\tRESUMED\tSlotsLockedSleep:seconds=1\n"
+            "SlotsLockedSleep_slot2\tRESUMED\tSlotsLockedSleep:seconds=2\n"
+            "SlotsLockedSleep_slot3\tRESUMED\tSlotsLockedSleep:seconds=3\n",
+            output,
+        )
 
     @override_cron_settings()
     @mock.patch(
@@ -436,6 +535,45 @@ class WorkerCommandTestCase(BaseCronTestCase):
             ),
         )
 
+    @override_cron_settings()
+    @mock.patch(
+        "cronman.worker.process_manager.ProcessManager.descendants",
+        lambda self, process_table=None: (
+            [2001, 2002] if self.pid == 1002 else []
+        ),
+    )
+    @mock.patch(
+        "cronman.worker.process_manager.ProcessManager.memory_usage",
+        lambda self, descendants=None: (
+            3 * 1024 * 1024 if self.pid == 1002 else None
+        ),
+    )
+    @mock.patch(
+        "cronman.worker.worker_list.get_process_table",
+        return_value=({}, {}),
+    )
+    def test_status_process_tree(self, mock_get_process_table):
+        """Test for listing active workers - descendant processes and total
+        RSS shown when available, `/proc` is scanned once
+        """
+        pid_1, pid_2 = 1001, 1002
+        hash_1 = get_params_hash([], {"seconds": "10"})
+        create_pid_file("ParamsLockedSleep:seconds=10", pid_1)
+        create_pid_file("ClassLockedSleep:seconds=10", pid_2)
+        with patch_ps(active_pids=[pid_1, pid_2]):
+            with patch_kill(active_pids=[pid_1, pid_2]):
+                output = call_command("cron_worker", "status")
+        self.assertEqual(
+            output,
+            "STATUS:\n"
+            "ClassLockedSleep\tALIVE\t{pid_2}\t2 descendant(s)\t3.0 MB RSS\n"
+            "ParamsLockedSleep_{hash_1}\tALIVE\t{pid_1}\n"
+            "TOTAL: 2\tALIVE: 2\tDEAD: 0\n".format(
+                hash_1=hash_1, pid_1=pid_1, pid_2=pid_2
+            ),
+        )
+        mock_get_process_table.assert_called_once_with()
+
     @override_cron_settings()
     def test_status_by_name(self):
         """Test for listing active workers by cron job name"""
@@ -454,6 +592,59 @@ class WorkerCommandTestCase(BaseCronTestCase):
             "TOTAL: 1\tALIVE: 1\tDEAD: 0\n".format(pid_2=pid_2),
         )
 
+    def _create_slot_pid_files(self):
+        """Creates PID files of 2 slot workers (`SlotsLockedSleep`)
+        with different params, files are named after slots
+        """
+        for slot, pid in ((1, 1001), (2, 1002)):
+            pid_file = CronWorkerPIDFile(
+                app_settings.CRONMAN_DATA_DIR,
+                "SlotsLockedSleep_slot{}".format(slot),
+            )
+            with mock.patch(
+                "cronman.worker.worker_file.os.getpid", lambda: pid
+            ):
+                pid_file.create("SlotsLockedSleep:seconds={}".format(pid))
+
+    @override_cron_settings()
+    @patch_ps(active_pids=[1001, 1002])
+    @patch_kill(active_pids=[1001, 1002])
+    def test_status_by_name_slots(self):
+        """Test for listing active workers by cron job name and params -
+        slot files matched by job stored in PID file (status table)
+        """
+        os.makedirs(app_settings.CRONMAN_DATA_DIR)
+        self._create_slot_pid_files()
+        output = call_command(
+            "cron_worker", "status", "SlotsLockedSleep:seconds=1002"
+        )
+        self.assertEqual(
+            output,
+            "STATUS:\n"
+            "SlotsLockedSleep_slot2\tALIVE\t1002\n"
+            "TOTAL: 1\tALIVE: 1\tDEAD: 0\n",
+        )
+
+    @override_cron_settings(CRONMAN_WORKER_STATUS_TABLE=False)
+    @patch_ps(active_pids=[1001, 1002])
+    @patch_kill(active_pids=[1001, 1002], die_on_sigterm_pids=[1001])
+    def test_kill_by_name_slots(self):
+        """Test for killing workers by cron job name and params -
+        slot files matched by job stored in PID file (directory scan)
+        """
+        os.makedirs(app_settings.CRONMAN_DATA_DIR)
+        self._create_slot_pid_files()
+        output = call_command(
+            "cron_worker", "kill", "SlotsLockedSleep:seconds=1001"
+        )
+        self.assertEqual(
+            output,
+            "KILL:\n"
+            "SlotsLockedSleep_slot1\tTERMED\t1001\n"
+            "TOTAL: 1\tDEAD: 0\tTERMED: 1\tKILLED: 0\n",
+        )
+        self.assertTrue(ProcessManager(1002).alive())
+
     @override_cron_settings()
     def test_status_by_pid(self):
         """Test for listing active workers by PID"""
@@ -585,6 +776,49 @@ class WorkerCommandTestCase(BaseCronTestCase):
                 self.assertFalse(ProcessManager(pid_1).alive())
                 self.assertTrue(ProcessManager(pid_2).alive())
 
+    @override_cron_settings()
+    @mock.patch(
+        "cronman.cron_jobs.sleep.ClassLockedSleep.kill_grace_seconds", 0
+    )
+    @mock.patch(
+        "cronman.cron_jobs.sleep.ParamsLockedSleep.kill_grace_seconds", 2
+    )
+    def test_kill_grace_period(self):
+        """Test for killing active workers - SIGKILL sent to process which
+        outlived grace period of its cron job class
+        """
+        pid_1, pid_2 = 1001, 1002
+        hash_1 = get_params_hash([], {"seconds": "10"})
+        create_pid_file("ParamsLockedSleep:seconds=10", pid_1)
+        create_pid_file("ClassLockedSleep:seconds=10", pid_2)
+        with patch_ps(active_pids=[pid_1, pid_2]):
+            with patch_kill(
+                active_pids=[pid_1, pid_2], die_on_sigkill_pids=[pid_2]
+            ):
+                with mock.patch(
+                    "cronman.worker.worker_list.wait_for_exit",
+                    # Both alive after 0s, `pid_1` exits during 2nd wait:
+                    side_effect=lambda processes, timeout: (
+                        [] if timeout else processes
+                    ),
+                ) as mock_wait_for_exit:
+                    output = call_command("cron_worker", "kill")
+                self.assertEqual(
+                    output,
+                    "KILL:\n"
+                    "ClassLockedSleep\tKILLED\t{pid_2}\n"
+                    "ParamsLockedSleep_{hash_1}\tTERMED\t{pid_1}\n"
+                    "TOTAL: 2\tDEAD: 0\tTERMED: 1\tKILLED: 1\n".format(
+                        hash_1=hash_1, pid_1=pid_1, pid_2=pid_2
+                    ),
+                )
+                self.assertFalse(ProcessManager(pid_2).alive())
+        # First wait bounded by the shortest grace period (0s),
+        # second one by the remaining one (up to 2s):
+        self.assertEqual(mock_wait_for_exit.call_count, 2)
+        self.assertEqual(mock_wait_for_exit.call_args_list[0][0][1], 0)
+        self.assertLessEqual(mock_wait_for_exit.call_args_list[1][0][1], 2)
+
     # CLEAN
 
     @override_cron_settings()
@@ -598,7 +832,9 @@ class WorkerCommandTestCase(BaseCronTestCase):
             "CLEAN PID FILES:\n"
             "No PID file(s) found.\n"
             "CLEAN JOBSPEC FILES:\n"
-            "No JobSpec file(s) found.\n",
+            "No JobSpec file(s) found.\n"
+            "CLEAN STATS FILES:\n"
+            "No Stats file(s) found.\n",
         )
 
     @override_cron_settings()
@@ -620,7 +856,9 @@ class WorkerCommandTestCase(BaseCronTestCase):
                     "CLEAN PID FILES:\n"
                     "No PID file(s) found.\n"
                     "CLEAN JOBSPEC FILES:\n"
-                    "No JobSpec file(s) found.\n",
+                    "No JobSpec file(s) found.\n"
+                    "CLEAN STATS FILES:\n"
+                    "No Stats file(s) found.\n",
                 )
                 # No process killed on during cleaning:
                 self.assertTrue(ProcessManager(pid_1).alive())
@@ -633,12 +871,11 @@ class WorkerCommandTestCase(BaseCronTestCase):
         self.assertTrue(os.path.exists(job_spec_file_3.path))
 
     @override_cron_settings()
-    def test_clean_3_dead_pids_1_stalled_jobspec(self):
-        """Test for cleaning dead/stalled files - 3 dead PIDfiles,
-        1 stalled JobSpec file
+    def test_clean_2_dead_pids_1_stalled_jobspec(self):
+        """Test for cleaning dead/stalled files - 2 dead PIDfiles,
+        1 stalled JobSpec file, file without PID (just created) kept
         """
         pid_2, pid_3 = 1002, 1003
-        hash_1 = get_params_hash([], {"seconds": "10"})
         pid_file_1 = create_pid_file("ParamsLockedSleep:seconds=10", "")
         pid_file_2 = create_pid_file("ClassLockedSleep:seconds=10", pid_2)
         pid_file_3 = create_pid_file("PersistentSleep:seconds=30", pid_3)
@@ -650,21 +887,67 @@ class WorkerCommandTestCase(BaseCronTestCase):
                     output,
                     "CLEAN PID FILES:\n"
                     "ClassLockedSleep\tDELETED\t{pid_2}\n"
-                    "ParamsLockedSleep_{hash_1}\tDELETED\t{pid_1}\n"
                     "PersistentSleep\tDELETED\t{pid_3}\n"
-                    "TOTAL: 3\n"
+                    "TOTAL: 2\n"
                     "CLEAN JOBSPEC FILES:\n"
                     "PersistentSleep\tDELETED\tPersistentSleep:seconds=30\n"
-                    "TOTAL: 1\n".format(
-                        hash_1=hash_1, pid_1=None, pid_2=pid_2, pid_3=pid_3
+                    "TOTAL: 1\n"
+                    "CLEAN STATS FILES:\n"
+                    "No Stats file(s) found.\n".format(
+                        pid_2=pid_2, pid_3=pid_3
                     ),
                 )
         # Files associated with already dead processes are deleted:
-        self.assertFalse(os.path.exists(pid_file_1.path))
+        self.assertTrue(os.path.exists(pid_file_1.path))
         self.assertFalse(os.path.exists(pid_file_2.path))
         self.assertFalse(os.path.exists(pid_file_3.path))
         self.assertFalse(os.path.exists(job_spec_file_3.path))
 
+    @override_cron_settings()
+    def test_clean_dead_pid_locked(self):
+        """Test for cleaning dead/stalled files - PID file of dead process
+        locked by new worker in the meantime is kept
+        """
+        pid_file = create_pid_file("ClassLockedSleep:seconds=10", 1002)
+        fd = os.open(pid_file.path, os.O_RDONLY)
+        self.addCleanup(os.close, fd)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        with patch_ps():
+            with patch_kill():
+                output = call_command("cron_worker", "clean")
+        self.assertIn("CLEAN PID FILES:\nNo PID file(s) found.\n", output)
+        self.assertTrue(os.path.exists(pid_file.path))
+
+    @override_cron_settings(CRONMAN_STATS_MAX_AGE=3600)
+    @patch_ps()
+    @patch_kill()
+    def test_clean_stats_files(self):
+        """Test for cleaning dead/stalled files - Stats file not updated
+        for `CRONMAN_STATS_MAX_AGE` seconds deleted with its lock file
+        """
+        os.makedirs(app_settings.CRONMAN_DATA_DIR)
+        old_stats_file = CronWorkerStatsFile(
+            app_settings.CRONMAN_DATA_DIR, "ClassLockedSleep"
+        )
+        old_stats_file.add({"run": 1.0})
+        two_days_ago = time.time() - 2 * 24 * 3600
+        os.utime(old_stats_file.path, (two_days_ago, two_days_ago))
+        new_stats_file = CronWorkerStatsFile(
+            app_settings.CRONMAN_DATA_DIR, "Sleep"
+        )
+        new_stats_file.add({"run": 1.0})
+        output = call_command("cron_worker", "clean")
+        self.assertIn(
+            "CLEAN STATS FILES:\n"
+            "ClassLockedSleep\tDELETED\t2 day(s) old\n"
+            "TOTAL: 1\n",
+            output,
+        )
+        self.assertFalse(os.path.exists(old_stats_file.path))
+        self.assertFalse(os.path.exists(old_stats_file.lock_path))
+        self.assertTrue(os.path.exists(new_stats_file.path))
+        self.assertTrue(os.path.exists(new_stats_file.lock_path))
+
     # SUSPEND
 
     @override_cron_settings()
@@ -679,6 +962,8 @@ class WorkerCommandTestCase(BaseCronTestCase):
             "No PID file(s) found.\n"
             "CLEAN JOBSPEC FILES:\n"
             "No JobSpec file(s) found.\n"
+            "CLEAN STATS FILES:\n"
+            "No Stats file(s) found.\n"
             "KILL:\n"
             "No PID file(s) found.\n",
         )
@@ -706,6 +991,8 @@ class WorkerCommandTestCase(BaseCronTestCase):
                     "No PID file(s) found.\n"
                     "CLEAN JOBSPEC FILES:\n"
                     "No JobSpec file(s) found.\n"
+                    "CLEAN STATS FILES:\n"
+                    "No Stats file(s) found.\n"
                     "KILL:\n"
                     "ClassLockedSleep\tTERMED\t{pid_2}\n"
                     "ParamsLockedSleep_{hash_1}\tTERMED\t{pid_1}\n"
@@ -728,9 +1015,9 @@ class WorkerCommandTestCase(BaseCronTestCase):
         """Test for suspending all active workers - clearing dead PIDfiles
         before killing.
         """
-        pid_2, pid_3 = 1002, 1003
+        pid_1, pid_2, pid_3 = 1001, 1002, 1003
         hash_1 = get_params_hash([], {"seconds": "10"})
-        pid_file_1 = create_pid_file("ParamsLockedSleep:seconds=10", "")
+        pid_file_1 = create_pid_file("ParamsLockedSleep:seconds=10", pid_1)
         pid_file_2 = create_pid_file("ClassLockedSleep:seconds=10", pid_2)
         pid_file_3 = create_pid_file("PersistentSleep:seconds=30", pid_3)
         job_spec_file_3 = create_job_spec_file("PersistentSleep:seconds=30")
@@ -747,9 +1034,11 @@ class WorkerCommandTestCase(BaseCronTestCase):
                     "CLEAN JOBSPEC FILES:\n"
                     "PersistentSleep\tDELETED\tPersistentSleep:seconds=30\n"
                     "TOTAL: 1\n"
+                    "CLEAN STATS FILES:\n"
+                    "No Stats file(s) found.\n"
                     "KILL:\n"
                     "No PID file(s) found.\n".format(
-                        hash_1=hash_1, pid_1=None, pid_2=pid_2, pid_3=pid_3
+                        hash_1=hash_1, pid_1=pid_1, pid_2=pid_2, pid_3=pid_3
                     ),
                 )
         # Files associated with already dead processes are deleted (clean):
@@ -758,12 +1047,67 @@ class WorkerCommandTestCase(BaseCronTestCase):
         self.assertFalse(os.path.exists(pid_file_3.path))
         self.assertFalse(os.path.exists(job_spec_file_3.path))
 
+    @override_cron_settings(CRONMAN_REMOTE_MANAGER_ENABLED=True)
+    @mock.patch(
+        "cronman.remote_manager.CronRemoteManager.redis_client",
+        new_callable=mock.PropertyMock,
+    )
+    def test_suspend_handoff(self, mock_redis):
+        """Test for suspending all active workers - job specs of killed
+        resumable workers published for other hosts
+        """
+        mock_redis.return_value.rpush.return_value = 1
+        pid_1, pid_2 = 1001, 1002
+        create_pid_file("ClassLockedSleep:seconds=10", pid_1)
+        pid_file_2 = create_pid_file(
+            "PersistentSleep:seconds=30", pid_2, can_resume=True
+        )
+        with patch_ps(active_pids=[pid_1, pid_2]):
+            with patch_kill(
+                active_pids=[pid_1, pid_2],
+                die_on_sigterm_pids=[pid_1, pid_2],
+            ):
+                output = call_command("cron_worker", "suspend", handoff=True)
+        self.assertTrue(
+            output.endswith(
+                "HANDOFF:\n"
+                "PersistentSleep\tHANDED_OFF\tPersistentSleep:seconds=30\n"
+                "TOTAL: 1\n"
+            )
+        )
+        mock_redis.return_value.rpush.assert_called_once_with(
+            "cron_scheduler:handoff", "PersistentSleep:seconds=30"
+        )
+        # Handed off job will not be resumed locally:
+        self.assertFalse(os.path.exists(pid_file_2.path))
+
+    @override_cron_settings(CRONMAN_REMOTE_MANAGER_ENABLED=True)
+    @mock.patch(
+        "cronman.remote_manager.CronRemoteManager.redis_client",
+        new_callable=mock.PropertyMock,
+    )
+    def test_suspend_handoff_no_redis(self, mock_redis):
+        """Test for suspending all active workers - Redis is unreachable,
+        killed workers are left for local resume
+        """
+        mock_redis.side_effect = redis.ConnectionError
+        pid_file = create_pid_file(
+            "PersistentSleep:seconds=30", 1002, can_resume=True
+        )
+        with patch_ps(active_pids=[1002]):
+            with patch_kill(active_pids=[1002], die_on_sigterm_pids=[1002]):
+                output = call_command("cron_worker", "suspend", handoff=True)
+        self.assertTrue(
+            output.endswith("HANDOFF:\nNo JobSpec file(s) found.\n")
+        )
+        self.assertTrue(os.path.exists(pid_file.path))
+
     # RESUME
 
     @override_cron_settings()
     @patch_ps()
     @patch_kill()
-    @mock.patch("cronman.worker.worker_file.CronSpawner.start_worker")
+    @mock.patch("cronman.spawner.CronSpawner.start_worker")
     def test_resume_no_files(self, mock_start):
         """Test for resuming workers - no JobSpec files"""
         output = call_command("cron_worker", "resume")
@@ -771,7 +1115,7 @@ class WorkerCommandTestCase(BaseCronTestCase):
         mock_start.assert_not_called()
 
     @override_cron_settings()
-    @mock.patch("cronman.worker.worker_file.CronSpawner.start_worker")
+    @mock.patch("cronman.spawner.CronSpawner.start_worker")
     def test_resume_all_files_active(self, mock_start):
         """Test for resuming workers - all workers active, no resuming."""
         pid_1, pid_2, pid_3 = 1001, 1002, 1003
@@ -792,7 +1136,7 @@ class WorkerCommandTestCase(BaseCronTestCase):
         mock_start.assert_not_called()
 
     @override_cron_settings()
-    @mock.patch("cronman.worker.worker_file.CronSpawner.start_worker")
+    @mock.patch("cronman.spawner.CronSpawner.start_worker")
     def test_resume_2_workers(self, mock_start):
         """Test for resuming workers - 2 workers resumed"""
         pid_1, pid_2, pid_3 = 1001, 1002, 1003
@@ -824,8 +1168,110 @@ class WorkerCommandTestCase(BaseCronTestCase):
             ]
         )
 
+    @override_cron_settings(CRONMAN_RESUME_MAX_CONCURRENT=2)
+    @mock.patch("cronman.cron_jobs.sleep.PersistentSleep2.resume_priority", 10)
+    @mock.patch("cronman.spawner.CronSpawner.start_worker")
+    def test_resume_max_concurrent(self, mock_start):
+        """Test for resuming workers - higher priority job resumed first,
+        the other one left for later (max number of running workers)
+        """
+        pid_1, pid_2, pid_3 = 1001, 1002, 1003
+        create_pid_file("ClassLockedSleep:seconds=10", pid_1)
+        pid_file_2 = create_pid_file(
+            "PersistentSleep:seconds=20", pid_2, can_resume=True
+        )
+        create_pid_file("PersistentSleep2:seconds=30", pid_3, can_resume=True)
+        hash_3 = get_params_hash([], {"seconds": "30"})
+        with patch_ps(active_pids=[pid_1]):
+            with patch_kill(active_pids=[pid_1]):
+                output = call_command("cron_worker", "resume")
+        self.assertEqual(
+            output,
+            "RESUME:\n"
+            "PersistentSleep2_{hash_3}\tRESUMED\t"
+            "PersistentSleep2:seconds=30\n"
+            "PersistentSleep\tPENDING\tPersistentSleep:seconds=20\n"
+            "TOTAL: 1\tPENDING: 1\n".format(hash_3=hash_3),
+        )
+        mock_start.assert_called_once_with("PersistentSleep2:seconds=30")
+        self.assertTrue(os.path.exists(pid_file_2.path))  # left for later
+
+    @override_cron_settings(CRONMAN_RESUME_RATE_LIMIT=1)
+    @mock.patch("cronman.spawner.CronSpawner.start_worker")
+    def test_resume_rate_limit(self, mock_start):
+        """Test for resuming workers - workers started at limited rate,
+        the rest left for later (no waiting)
+        """
+        create_pid_file("PersistentSleep:seconds=20", 1002, can_resume=True)
+        create_pid_file("PersistentSleep2:seconds=30", 1003, can_resume=True)
+        with patch_ps():
+            with patch_kill():
+                output = call_command("cron_worker", "resume")
+        self.assertIn("PersistentSleep\tRESUMED", output)
+        self.assertIn("TOTAL: 1\tPENDING: 1\n", output)
+        mock_start.assert_called_once_with("PersistentSleep:seconds=20")
+
+    @override_cron_settings(CRONMAN_RESUME_MAX_ATTEMPTS=3)
+    @mock.patch("cronman.spawner.CronSpawner.start_worker", autospec=True)
+    def test_resume_max_attempts(self, mock_start):
+        """Test for resuming workers - job resumed too many times in a row
+        is abandoned, attempt number passed to resumed worker
+        """
+        with mock.patch.dict(os.environ, {"CRON_PROCESS_RESUME_ATTEMPT": "3"}):
+            pid_file_1 = create_pid_file(
+                "PersistentSleep:seconds=20", 1002, can_resume=True
+            )
+        with mock.patch.dict(os.environ, {"CRON_PROCESS_RESUME_ATTEMPT": "2"}):
+            create_pid_file(
+                "PersistentSleep2:seconds=30", 1003, can_resume=True
+            )
+        with patch_ps():
+            with patch_kill():
+                output = call_command("cron_worker", "resume")
+        self.assertIn(
+            "PersistentSleep\tABANDONED\tPersistentSleep:seconds=20\n", output
+        )
+        self.assertIn("TOTAL: 1\tABANDONED: 1\n", output)
+        self.assertFalse(os.path.exists(pid_file_1.path))
+        mock_start.assert_called_once_with(
+            mock.ANY, "PersistentSleep2:seconds=30"
+        )
+        spawner = mock_start.call_args[0][0]
+        self.assertEqual(spawner.extra_env["CRON_PROCESS_RESUME_ATTEMPT"], "3")
+
+    @override_cron_settings()
+    @mock.patch("cronman.spawner.CronSpawner.start_worker")
+    def test_resume_pid_files_v2(self, mock_start):
+        """Test for resuming workers - job specs stored in PID files"""
+        pid_1, pid_2, pid_3 = 1001, 1002, 1003
+        create_pid_file("ParamsLockedSleep:seconds=10", pid_1)
+        pid_file_2 = create_pid_file(
+            "PersistentSleep:seconds=20", pid_2, can_resume=True
+        )
+        pid_file_3 = create_pid_file(
+            "PersistentSleep2:seconds=30", pid_3, can_resume=True
+        )
+        with patch_ps(active_pids=[pid_3]):
+            with patch_kill(active_pids=[pid_3]):
+                output = call_command("cron_worker", "resume")
+                self.assertEqual(
+                    output,
+                    "RESUME:\n"
+                    "PersistentSleep\tRESUMED\tPersistentSleep:seconds=20\n"
+                    "TOTAL: 1\n",
+                )
+                output = call_command("cron_worker", "resume", str(pid_3))
+                self.assertEqual(
+                    output, "RESUME:\nNo JobSpec file(s) found.\n"
+                )
+        # Dead worker's PID file has been deleted before spawning
+        # new process, active one is left untouched:
+        self.assertFalse(os.path.exists(pid_file_2.path))
+        self.assertTrue(os.path.exists(pid_file_3.path))
+        mock_start.assert_called_once_with("PersistentSleep:seconds=20")
+
     @override_cron_settings()
-    @mock.patch("cronman.worker.worker_file.CronSpawner.start_worker")
+    @mock.patch("cronman.spawner.CronSpawner.start_worker")
     def test_resume_truncated_jobspec_file(self, mock_start):
         """Test for resuming workers - truncated JobSpec file case
         (no resuming)."""
@@ -840,7 +1286,7 @@ class WorkerCommandTestCase(BaseCronTestCase):
         mock_start.assert_not_called()
 
     @override_cron_settings()
-    @mock.patch("cronman.worker.worker_file.CronSpawner.start_worker")
+    @mock.patch("cronman.spawner.CronSpawner.start_worker")
     def test_resume_no_pid_file(self, mock_start):
         """Test for resuming workers - no PID file case (resuming OK)."""
         job_spec_file_1 = create_job_spec_file("PersistentSleep:seconds=20")
@@ -886,6 +1332,29 @@ class WorkerCommandTestCase(BaseCronTestCase):
             "No lock - concurrent calls allowed.\n\n",
         )
 
+    # MANIFEST
+
+    @override_cron_settings()
+    def test_manifest(self):
+        """Test for writing cron job manifest file"""
+        path = os.path.join(app_settings.CRONMAN_DATA_DIR, "cron_jobs.json")
+        output = call_command("cron_worker", "manifest", path)
+        self.assertIn("cron job(s) written to {}".format(path), output)
+        with open(path) as file_:
+            data = json.load(file_)
+        self.assertEqual(
+            data["cron_jobs"]["Sleep"]["class"],
+            "cronman.cron_jobs.sleep.Sleep",
+        )
+
+    @override_cron_settings(CRONMAN_JOBS_MANIFEST=None)
+    def test_manifest_no_path(self):
+        """Test for writing cron job manifest file - path not configured"""
+        with self.assertRaisesMessage(
+            CommandError, "Manifest path is required."
+        ):
+            call_command("cron_worker", "manifest")
+
 
 class RemoteManagerCommandTestCase(BaseCronTestCase):
     """Tests for `cron_remote_manager` command"""
@@ -899,8 +1368,9 @@ class RemoteManagerCommandTestCase(BaseCronTestCase):
     )
     def test_enable(self, mock_redis):
         """Tests call to cron_remote_manager enable"""
-        mock_set = mock_redis.return_value.set
-        mock_set.return_value = True
+        mock_pipeline = mock_redis.return_value.pipeline.return_value
+        mock_set = mock_pipeline.set
+        mock_pipeline.execute.return_value = [True, 1, True, 1]
         output = call_command(
             "cron_remote_manager", "enable", "prod-cron01", "prod-cron02"
         )
@@ -923,7 +1393,8 @@ class RemoteManagerCommandTestCase(BaseCronTestCase):
         """Tests call to cron_remote_manager enable when Redis is
         unreachable.
         """
-        mock_set = mock_redis.return_value.set
+        mock_pipeline = mock_redis.return_value.pipeline.return_value
+        mock_set = mock_pipeline.set
         mock_redis.side_effect = redis.ConnectionError
         output = call_command(
             "cron_remote_manager", "enable", "prod-cron01", "prod-cron02"
@@ -933,6 +1404,22 @@ class RemoteManagerCommandTestCase(BaseCronTestCase):
         )
         mock_set.assert_not_called()
 
+    @override_cron_settings(CRONMAN_REMOTE_MANAGER_ENABLED=True)
+    @mock.patch(
+        "cronman.remote_manager.CronRemoteManager.redis_client",
+        new_callable=mock.PropertyMock,
+    )
+    def test_enable_redis_timeout(self, mock_redis):
+        """Tests call to cron_remote_manager enable when Redis times out."""
+        mock_pipeline = mock_redis.return_value.pipeline.return_value
+        mock_pipeline.execute.side_effect = redis.TimeoutError("Timeout")
+        output = call_command(
+            "cron_remote_manager", "enable", "prod-cron01", "prod-cron02"
+        )
+        self.assertIn(
+            "enable prod-cron01 -> None\n" "enable prod-cron02 -> None", output
+        )
+
     @override_cron_settings(CRONMAN_REMOTE_MANAGER_ENABLED=False)
     @mock.patch(
         "cronman.remote_manager.CronRemoteManager.redis_client",
@@ -942,7 +1429,8 @@ class RemoteManagerCommandTestCase(BaseCronTestCase):
         """Tests call to cron_remote_manager enable when
         CronRemoteManager is disabled in settings.
         """
-        mock_set = mock_redis.return_value.set
+        mock_pipeline = mock_redis.return_value.pipeline.return_value
+        mock_set = mock_pipeline.set
         output = call_command(
             "cron_remote_manager", "enable", "prod-cron01", "prod-cron02"
         )
@@ -960,8 +1448,9 @@ class RemoteManagerCommandTestCase(BaseCronTestCase):
     )
     def test_disable(self, mock_redis):
         """Tests call to cron_remote_manager disable"""
-        mock_set = mock_redis.return_value.set
-        mock_set.return_value = True
+        mock_pipeline = mock_redis.return_value.pipeline.return_value
+        mock_set = mock_pipeline.set
+        mock_pipeline.execute.return_value = [True, 1, True, 1]
         output = call_command(
             "cron_remote_manager", "disable", "prod-cron01", "prod-cron02"
         )
@@ -981,11 +1470,20 @@ class RemoteManagerCommandTestCase(BaseCronTestCase):
         "cronman.remote_manager.CronRemoteManager.redis_client",
         new_callable=mock.PropertyMock,
     )
-    @mock.patch("cronman.management.commands.cron_remote_manager.time.sleep")
+    @mock.patch("cronman.remote_manager.time.sleep")
     def test_disable_wait(self, mock_sleep, mock_redis):
-        """Tests call to cron_remote_manager disable with wait option"""
-        mock_set = mock_redis.return_value.set
-        mock_set.return_value = True
+        """Tests call to cron_remote_manager disable with wait option -
+        acknowledged by all hosts
+        """
+        mock_pipeline = mock_redis.return_value.pipeline.return_value
+        mock_set = mock_pipeline.set
+        # `prod-cron02` acknowledges on 2nd check:
+        ack = json.dumps({"result": "Scheduler disabled.\n", "time": 0})
+        mock_pipeline.execute.side_effect = [
+            [0, True, 1, 1, True, 1],  # HDEL, SET, PUBLISH per host
+            [ack, None],
+            [ack],
+        ]
         output = call_command(
             "cron_remote_manager",
             "disable",
@@ -997,13 +1495,75 @@ class RemoteManagerCommandTestCase(BaseCronTestCase):
             "disable prod-cron01 -> True\n" "disable prod-cron02 -> True",
             output,
         )
+        self.assertRegex(
+            output,
+            r"disable prod-cron01 -> ACKNOWLEDGED after [\d.]+s: "
+            r"Scheduler disabled\.\n"
+            r"disable prod-cron02 -> ACKNOWLEDGED after [\d.]+s: "
+            r"Scheduler disabled\.",
+        )
         mock_set.assert_has_calls(
             [
                 mock.call("cron_scheduler:status:prod-cron01", "disabled"),
                 mock.call("cron_scheduler:status:prod-cron02", "disabled"),
             ]
         )
-        mock_sleep.assert_called_once_with(120)
+        # Old acknowledgements removed before sending the request:
+        mock_pipeline.hdel.assert_has_calls(
+            [
+                mock.call("cron_scheduler:ack:prod-cron01", "disable"),
+                mock.call("cron_scheduler:ack:prod-cron02", "disable"),
+            ]
+        )
+        self.assertEqual(mock_pipeline.hget.call_count, 3)
+        self.assertEqual(mock_pipeline.execute.call_count, 3)
+        mock_sleep.assert_called_once()
+
+    @override_cron_settings(CRONMAN_REMOTE_MANAGER_ENABLED=True)
+    @mock.patch(
+        "cronman.remote_manager.CronRemoteManager.redis_client",
+        new_callable=mock.PropertyMock,
+    )
+    def test_kill_wait_timeout(self, mock_redis):
+        """Tests call to cron_remote_manager kill with wait option -
+        request not acknowledged before timeout
+        """
+        mock_pipeline = mock_redis.return_value.pipeline.return_value
+        mock_pipeline.execute.side_effect = [[0, 1, 1], [None]]
+        stdout = io.StringIO()
+        with self.assertRaisesMessage(
+            CommandError, "Request not acknowledged by: prod-cron01"
+        ):
+            call_command(
+                "cron_remote_manager",
+                "kill:ParseInvoiceData",
+                "prod-cron01",
+                wait=True,
+                timeout=0,
+                stdout=stdout,
+            )
+        self.assertIn(
+            "kill:ParseInvoiceData prod-cron01 -> NOT ACKNOWLEDGED after",
+            stdout.getvalue(),
+        )
+
+    @override_cron_settings(CRONMAN_REMOTE_MANAGER_ENABLED=True)
+    @mock.patch(
+        "cronman.remote_manager.CronRemoteManager.redis_client",
+        new_callable=mock.PropertyMock,
+    )
+    def test_disable_wait_all(self, mock_redis):
+        """Tests call to cron_remote_manager disable with wait option
+        for ALL hosts - rejected before the request is sent
+        """
+        with self.assertRaisesMessage(
+            CommandError,
+            "Unable to wait for acknowledgements from ALL hosts",
+        ):
+            call_command("cron_remote_manager", "disable", "ALL", wait=True)
+        mock_redis.return_value.pipeline.assert_not_called()
+        mock_redis.return_value.set.assert_not_called()
+        mock_redis.return_value.eval.assert_not_called()
 
     @override_cron_settings(CRONMAN_REMOTE_MANAGER_ENABLED=True)
     @mock.patch(
@@ -1014,7 +1574,8 @@ class RemoteManagerCommandTestCase(BaseCronTestCase):
         """Tests call to cron_remote_manager disable when Redis is
         unreachable.
         """
-        mock_set = mock_redis.return_value.set
+        mock_pipeline = mock_redis.return_value.pipeline.return_value
+        mock_set = mock_pipeline.set
         mock_redis.side_effect = redis.ConnectionError
         output = call_command(
             "cron_remote_manager", "disable", "prod-cron01", "prod-cron02"
@@ -1034,7 +1595,8 @@ class RemoteManagerCommandTestCase(BaseCronTestCase):
         """Tests call to cron_remote_manager disable when
         CronRemoteManager is disabled in settings.
         """
-        mock_set = mock_redis.return_value.set
+        mock_pipeline = mock_redis.return_value.pipeline.return_value
+        mock_set = mock_pipeline.set
         output = call_command(
             "cron_remote_manager", "disable", "prod-cron01", "prod-cron02"
         )
@@ -1053,8 +1615,9 @@ class RemoteManagerCommandTestCase(BaseCronTestCase):
     )
     def test_clear_status(self, mock_redis):
         """Tests call to cron_remote_manager clear_status"""
-        mock_delete = mock_redis.return_value.delete
-        mock_delete.return_value = 1
+        mock_pipeline = mock_redis.return_value.pipeline.return_value
+        mock_delete = mock_pipeline.delete
+        mock_pipeline.execute.return_value = [1, 1]
         output = call_command(
             "cron_remote_manager", "clear_status", "prod-cron01", "prod-cron02"
         )
@@ -1078,7 +1641,8 @@ class RemoteManagerCommandTestCase(BaseCronTestCase):
         """Tests call to cron_remote_manager clear_status when Redis is
         unreachable.
         """
-        mock_delete = mock_redis.return_value.delete
+        mock_pipeline = mock_redis.return_value.pipeline.return_value
+        mock_delete = mock_pipeline.delete
         mock_redis.side_effect = redis.ConnectionError
         output = call_command(
             "cron_remote_manager", "clear_status", "prod-cron01", "prod-cron02"
@@ -1099,7 +1663,8 @@ class RemoteManagerCommandTestCase(BaseCronTestCase):
         """Tests call to cron_remote_manager clear_status when
         CronRemoteManager is disabled in settings.
         """
-        mock_delete = mock_redis.return_value.delete
+        mock_pipeline = mock_redis.return_value.pipeline.return_value
+        mock_delete = mock_pipeline.delete
         output = call_command(
             "cron_remote_manager", "clear_status", "prod-cron01", "prod-cron02"
         )
@@ -1119,8 +1684,9 @@ class RemoteManagerCommandTestCase(BaseCronTestCase):
     )
     def test_get_status(self, mock_redis):
         """Tests call to cron_remote_manager get_status"""
-        mock_get = mock_redis.return_value.get
-        mock_get.return_value = "disabled"
+        mock_pipeline = mock_redis.return_value.pipeline.return_value
+        mock_get = mock_pipeline.get
+        mock_pipeline.execute.return_value = ["disabled", "disabled"]
         output = call_command(
             "cron_remote_manager", "get_status", "prod-cron01", "prod-cron02"
         )
@@ -1145,7 +1711,8 @@ class RemoteManagerCommandTestCase(BaseCronTestCase):
         """Tests call to cron_remote_manager get_status when Redis is
         unreachable.
         """
-        mock_get = mock_redis.return_value.get
+        mock_pipeline = mock_redis.return_value.pipeline.return_value
+        mock_get = mock_pipeline.get
         mock_redis.side_effect = redis.ConnectionError
         output = call_command(
             "cron_remote_manager", "get_status", "prod-cron01", "prod-cron02"
@@ -1166,7 +1733,8 @@ class RemoteManagerCommandTestCase(BaseCronTestCase):
         """Tests call to cron_remote_manager get_status when
         CronRemoteManager is disabled in settings.
         """
-        mock_get = mock_redis.return_value.get
+        mock_pipeline = mock_redis.return_value.pipeline.return_value
+        mock_get = mock_pipeline.get
         output = call_command(
             "cron_remote_manager", "get_status", "prod-cron01", "prod-cron02"
         )
@@ -1177,6 +1745,74 @@ class RemoteManagerCommandTestCase(BaseCronTestCase):
         )
         mock_get.assert_not_called()
 
+    @override_cron_settings(CRONMAN_REMOTE_MANAGER_ENABLED=True)
+    @mock.patch(
+        "cronman.remote_manager.CronRemoteManager.redis_client",
+        new_callable=mock.PropertyMock,
+    )
+    def test_disable_notifies_listeners(self, mock_redis):
+        """Tests call to cron_remote_manager disable - command published
+        for listeners next to durable key
+        """
+        call_command("cron_remote_manager", "disable", "prod-cron01")
+        mock_redis.return_value.pipeline.return_value.publish.assert_called_once_with(
+            "cron_scheduler:commands:prod-cron01", "disable"
+        )
+
+    @override_cron_settings(CRONMAN_REMOTE_MANAGER_ENABLED=True)
+    @mock.patch(
+        "cronman.remote_manager.CronRemoteManager.redis_client",
+        new_callable=mock.PropertyMock,
+    )
+    def test_disable_globs(self, mock_redis):
+        """Tests call to cron_remote_manager disable - globs expanded using
+        registered hosts, all hosts handled in single pipeline
+        """
+        mock_redis.return_value.zrangebyscore.return_value = [
+            "prod-cron02",
+            "stage-cron01",
+            "prod-cron01",
+        ]
+        mock_pipeline = mock_redis.return_value.pipeline.return_value
+        mock_pipeline.execute.return_value = [True, 1, True, 0, True, 1]
+        output = call_command(
+            "cron_remote_manager",
+            "disable",
+            "prod-cron*",
+            "prod-cron01",
+            "db01",
+        )
+        self.assertEqual(
+            output,
+            "disable prod-cron01 -> True\n"
+            "disable prod-cron02 -> True\n"
+            "disable db01 -> True",
+        )
+        mock_redis.return_value.pipeline.assert_called_once_with(
+            transaction=False
+        )
+        mock_pipeline.execute.assert_called_once_with()
+        self.assertEqual(mock_pipeline.set.call_count, 3)
+        mock_redis.return_value.zrangebyscore.assert_called_once_with(
+            "cron_scheduler:hosts", mock.ANY, "+inf"
+        )
+
+    @override_cron_settings(CRONMAN_REMOTE_MANAGER_ENABLED=True)
+    @mock.patch(
+        "cronman.remote_manager.CronRemoteManager.redis_client",
+        new_callable=mock.PropertyMock,
+    )
+    def test_disable_globs_no_match(self, mock_redis):
+        """Tests call to cron_remote_manager disable - no registered host
+        matches given glob
+        """
+        mock_redis.return_value.zrangebyscore.return_value = ["stage-cron01"]
+        with self.assertRaisesMessage(
+            CommandError, "No registered hosts match given globs."
+        ):
+            call_command("cron_remote_manager", "disable", "prod-cron*")
+        mock_redis.return_value.pipeline.assert_not_called()
+
     # KILL:
 
     @override_cron_settings(CRONMAN_REMOTE_MANAGER_ENABLED=True)
@@ -1186,8 +1822,9 @@ class RemoteManagerCommandTestCase(BaseCronTestCase):
     )
     def test_kill(self, mock_redis):
         """Tests call to cron_remote_manager kill"""
-        mock_rpush = mock_redis.return_value.rpush
-        mock_rpush.return_value = 1
+        mock_pipeline = mock_redis.return_value.pipeline.return_value
+        mock_rpush = mock_pipeline.rpush
+        mock_pipeline.execute.return_value = [1, 1]
         output = call_command(
             "cron_remote_manager", "kill:ParseInvoiceData", "prod-cron01"
         )
@@ -1205,7 +1842,8 @@ class RemoteManagerCommandTestCase(BaseCronTestCase):
         """Tests call to cron_remote_manager kill when Redis is
         unreachable.
         """
-        mock_rpush = mock_redis.return_value.rpush
+        mock_pipeline = mock_redis.return_value.pipeline.return_value
+        mock_rpush = mock_pipeline.rpush
         mock_redis.side_effect = redis.ConnectionError
         output = call_command(
             "cron_remote_manager", "kill:ParseInvoiceData", "prod-cron01"
@@ -1222,13 +1860,161 @@ class RemoteManagerCommandTestCase(BaseCronTestCase):
         """Tests call to cron_remote_manager kill when
         CronRemoteManager is disabled in settings.
         """
-        mock_rpush = mock_redis.return_value.rpush
+        mock_pipeline = mock_redis.return_value.pipeline.return_value
+        mock_rpush = mock_pipeline.rpush
         output = call_command(
             "cron_remote_manager", "kill:ParseInvoiceData", "prod-cron01"
         )
         self.assertIn("kill:ParseInvoiceData prod-cron01 -> None", output)
         mock_rpush.assert_not_called()
 
+    @override_cron_settings(CRONMAN_REMOTE_MANAGER_ENABLED=True)
+    @mock.patch(
+        "cronman.remote_manager.CronRemoteManager.redis_client",
+        new_callable=mock.PropertyMock,
+    )
+    def test_kill_notifies_listeners(self, mock_redis):
+        """Tests call to cron_remote_manager kill - command published
+        for listeners next to durable key
+        """
+        call_command("cron_remote_manager", "kill:ParseInvoiceData", "ALL")
+        mock_redis.return_value.pipeline.return_value.publish.assert_called_once_with(
+            "cron_scheduler:commands:ALL", "kill:ParseInvoiceData"
+        )
+
+    # STATUS:
+
+    @override_cron_settings(CRONMAN_REMOTE_MANAGER_ENABLED=True)
+    @mock.patch(
+        "cronman.remote_manager.CronRemoteManager.redis_client",
+        new_callable=mock.PropertyMock,
+    )
+    def test_status(self, mock_redis):
+        """Tests call to cron_remote_manager status ALL - snapshots of all
+        registered hosts retrieved in single pipeline
+        """
+        mock_redis.return_value.zrangebyscore.return_value = [
+            "prod-cron02",
+            "prod-cron01",
+        ]
+        mock_pipeline = mock_redis.return_value.pipeline.return_value
+        mock_pipeline.execute.return_value = [
+            {
+                "time": "0",
+                "load": "0.50 0.40 0.30",
+                "memory_total": str(4096 * 1024 * 1024),
+                "memory_available": str(1024 * 1024 * 1024),
+                "workers": json.dumps(
+                    [
+                        {"name": "Sleep", "status": "ALIVE", "pid": 1001},
+                        {"name": "Foo", "status": "DEAD", "pid": 1002},
+                    ]
+                ),
+                "totals": json.dumps({"TOTAL": 2, "ALIVE": 1, "DEAD": 1}),
+            },
+            {},
+        ]
+        output = call_command("cron_remote_manager", "status", "ALL")
+        self.assertRegex(
+            output,
+            r"HOSTS:\n"
+            r"prod-cron01\tOK\t\d+s ago\tload: 0.50 0.40 0.30\t"
+            r"memory: 1024.0 of 4096.0 MB available\t2 worker\(s\)\n"
+            r"prod-cron02\tMISSING\n"
+            r"TOTAL: 2\tOK: 1\tMISSING: 1\n",
+        )
+        self.assertIn(
+            "WORKERS:\n"
+            "prod-cron01\tSleep\tALIVE\t1001\n"
+            "prod-cron01\tFoo\tDEAD\t1002\n"
+            "TOTAL: 2\tALIVE: 1\tDEAD: 1\n",
+            output,
+        )
+        mock_pipeline.hgetall.assert_has_calls(
+            [
+                mock.call("cron_scheduler:snapshot:prod-cron01"),
+                mock.call("cron_scheduler:snapshot:prod-cron02"),
+            ]
+        )
+        mock_pipeline.execute.assert_called_once_with()
+
+    # LISTEN:
+
+    @override_cron_settings(CRONMAN_REMOTE_MANAGER_ENABLED=True)
+    @mock.patch(
+        "cronman.scheduler.scheduler.CronScheduler.cron_worker",
+        new_callable=mock.PropertyMock,
+    )
+    @mock.patch(
+        "cronman.remote_manager.CronRemoteManager.redis_client",
+        new_callable=mock.PropertyMock,
+    )
+    def test_listen(self, mock_redis, mock_cron_worker):
+        """Tests call to cron_remote_manager listen - commands applied
+        as soon as they are received
+        """
+        mock_pubsub = mock_redis.return_value.pubsub.return_value
+        mock_pubsub.listen.return_value = iter(
+            [
+                {
+                    "type": "message",
+                    "channel": "cron_scheduler:commands:ALL",
+                    "data": "kill:ParseInvoiceData",
+                },
+                {
+                    "type": "message",
+                    "channel": "cron_scheduler:commands:ALL",
+                    "data": "disable",
+                },
+            ]
+        )
+        mock_cron_worker.return_value.kill.return_value = "<kill output>"
+        mock_cron_worker.return_value.suspend.return_value = ""
+        stdout = io.StringIO()
+        call_command("cron_remote_manager", "listen", stdout=stdout)
+        output = stdout.getvalue()
+        mock_pubsub.subscribe.assert_called_once_with(
+            "cron_scheduler:commands:{}".format(socket.gethostname()),
+            "cron_scheduler:commands:ALL",
+        )
+        mock_cron_worker.return_value.kill.assert_called_once_with(
+            "ParseInvoiceData"
+        )
+        mock_cron_worker.return_value.suspend.assert_called_once_with()
+        self.assertIn("<kill output>", output)
+        self.assertIn("Scheduler disabled", output)
+        self.assertTrue(CronScheduler().lock_file.exists())
+        # Handled kill request removed from pending ones:
+        ack_call = mock_redis.return_value.eval.call_args_list[0]
+        self.assertEqual(
+            ack_call[0][3],
+            "cron_scheduler:kill:{}".format(socket.gethostname()),
+        )
+        self.assertEqual(ack_call[0][4], "kill:ParseInvoiceData")
+        self.assertEqual(ack_call[0][7], "ParseInvoiceData")
+
+    @override_cron_settings(CRONMAN_REMOTE_MANAGER_ENABLED=True)
+    @mock.patch(
+        "cronman.remote_manager.CronRemoteManager.reconnect_interval", 0
+    )
+    @mock.patch(
+        "cronman.remote_manager.CronRemoteManager.redis_client",
+        new_callable=mock.PropertyMock,
+    )
+    def test_listen_reconnect(self, mock_redis):
+        """Tests CronRemoteManager.listen method - reconnect after
+        connection is lost
+        """
+        mock_pubsub = mock_redis.return_value.pubsub.return_value
+        mock_pubsub.listen.side_effect = [
+            redis.ConnectionError("Connection closed"),
+            iter([{"type": "message", "channel": "c", "data": "enable"}]),
+        ]
+        callback = mock.Mock()
+        CronRemoteManager().listen(callback, max_messages=1)
+        callback.assert_called_once_with("enable")
+        self.assertEqual(mock_pubsub.subscribe.call_count, 2)
+
     # other cases:
 
     @override_cron_settings()
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# vi:si:et:sw=4:sts=4:ts=4
+
+from __future__ import unicode_literals
+
+import json
+import os
+
+from cronman.exceptions import (
+    CronJobAlreadyRegistered,
+    CronJobNotRegistered,
+)
+from cronman.job import CronJobRegistry
+from cronman.taxonomies import CPUPriority, IOPriority, LockScope, LockType
+from cronman.tests.base import TEST_CRONMAN_DATA_DIR, BaseCronTestCase
+from cronman.utils import ensure_dir
+
+MANIFEST_PATH = os.path.join(TEST_CRONMAN_DATA_DIR, "cron_jobs.json")
+
+
+class CronJobRegistryTestCase(BaseCronTestCase):
+    """Tests for CronJobRegistry class"""
+
+    def setUp(self):
+        super(CronJobRegistryTestCase, self).setUp()
+        ensure_dir(TEST_CRONMAN_DATA_DIR)
+
+    def _dump_sleep_manifest(self):
+        """Writes manifest with `LowestCPUIOSleep` class only"""
+        from cronman.cron_jobs.sleep import LowestCPUIOSleep
+
+        registry = CronJobRegistry()
+        registry.register(LowestCPUIOSleep, name="Lowest")
+        self.assertEqual(registry.dump_manifest(MANIFEST_PATH), 1)
+
+    def test_dump_manifest(self):
+        """Test for CronJobRegistry.dump_manifest method"""
+        self._dump_sleep_manifest()
+        with open(MANIFEST_PATH) as file_:
+            data = json.load(file_)
+        self.assertEqual(data["version"], 1)
+        self.assertEqual(
+            data["cron_jobs"]["Lowest"],
+            {
+                "class": "cronman.cron_jobs.sleep.LowestCPUIOSleep",
+                "lock_type": None,
+                "lock_name": None,
+                "lock_slots": 1,
+                "lock_group": None,
+                "lock_scope": LockScope.LOCAL,
+                "lock_check_attempts": 1,
+                "lock_ignore_errors": False,
+                "worker_cpu_priority": CPUPriority.LOWEST,
+                "worker_io_priority": list(IOPriority.BEST_EFFORT_LOWEST),
+                "can_resume": False,
+                "worker_settings": None,
+                "resume_priority": 0,
+                "kill_grace_seconds": None,
+            },
+        )
+
+    def test_get_info_from_manifest(self):
+        """Test for CronJobRegistry.get_info method - attributes are read
+        from the manifest, class is not imported.
+        """
+        self._dump_sleep_manifest()
+        registry = CronJobRegistry()
+        registry.load_manifest(MANIFEST_PATH)
+        info = registry.get_info("Lowest")
+        self.assertEqual(info["worker_cpu_priority"], CPUPriority.LOWEST)
+        self.assertEqual(info["lock_type"], None)
+        self.assertEqual(registry._registry, {})
+
+    def test_get_info_without_manifest(self):
+        """Test for CronJobRegistry.get_info method - no manifest"""
+        from cronman.cron_jobs.sleep import ClassLockedSleep
+
+        registry = CronJobRegistry()
+        registry.register(ClassLockedSleep)
+        info = registry.get_info("ClassLockedSleep")
+        self.assertEqual(info["lock_type"], LockType.CLASS)
+
+    def test_get_lazy(self):
+        """Test for CronJobRegistry.get method - class imported on demand"""
+        self._dump_sleep_manifest()
+        registry = CronJobRegistry()
+        registry.load_manifest(MANIFEST_PATH)
+        cron_job_class = registry.get("Lowest")
+        self.assertEqual(cron_job_class.__name__, "LowestCPUIOSleep")
+        self.assertIs(registry.get("Lowest"), cron_job_class)
+        self.assertEqual(list(dict(registry.items())), ["Lowest"])
+
+    def test_get_lazy_then_register(self):
+        """Test for CronJobRegistry.get method - class imported on demand,
+        then registered again by its `cron_jobs` module (autodiscover)
+        """
+        from cronman.cron_jobs.sleep import LowestCPUIOSleep, Sleep
+
+        self._dump_sleep_manifest()
+        registry = CronJobRegistry()
+        registry.load_manifest(MANIFEST_PATH)
+        self.assertIs(registry.get("Lowest"), LowestCPUIOSleep)
+        registry.register(LowestCPUIOSleep, name="Lowest")
+        self.assertIs(registry.get("Lowest"), LowestCPUIOSleep)
+        with self.assertRaises(CronJobAlreadyRegistered):
+            registry.register(Sleep, name="Lowest")
+
+    def test_get_not_registered(self):
+        """Test for CronJobRegistry.get method - unknown name"""
+        self._dump_sleep_manifest()
+        registry = CronJobRegistry()
+        registry.load_manifest(MANIFEST_PATH)
+        with self.assertRaises(CronJobNotRegistered):
+            registry.get("NoSuchCronJob")
+
+    def test_unregister_lazy(self):
+        """Test for CronJobRegistry.unregister method - manifest entry"""
+        self._dump_sleep_manifest()
+        registry = CronJobRegistry()
+        registry.load_manifest(MANIFEST_PATH)
+        registry.unregister("Lowest")
+        with self.assertRaises(CronJobNotRegistered):
+            registry.get("Lowest")
+
+    def test_load_manifest_missing_attributes(self):
+        """Test for CronJobRegistry.load_manifest method - attributes missing
+        in older manifest get default values.
+        """
+        with open(MANIFEST_PATH, "w") as file_:
+            json.dump(
+                {
+                    "version": 1,
+                    "cron_jobs": {
+                        "Sleep": {"class": "cronman.cron_jobs.sleep.Sleep"}
+                    },
+                },
+                file_,
+            )
+        registry = CronJobRegistry()
+        registry.load_manifest(MANIFEST_PATH)
+        info = registry.get_info("Sleep")
+        self.assertEqual(info["lock_type"], LockType.CLASS)
+        self.assertIsNone(info["worker_settings"])
+
+    def test_load_manifest_invalid_version(self):
+        """Test for CronJobRegistry.load_manifest method - unknown version"""
+        with open(MANIFEST_PATH, "w") as file_:
+            json.dump({"version": 42, "cron_jobs": {}}, file_)
+        with self.assertRaises(ValueError):
+            CronJobRegistry().load_manifest(MANIFEST_PATH)
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+# vi:si:et:sw=4:sts=4:ts=4
+
+from __future__ import unicode_literals
+
+import os
+import time
+
+from django.test import SimpleTestCase
+
+from unittest import mock
+
+from cronman.worker.phase_timer import PhaseTimer
+from cronman.worker.process_manager import get_process_start_time
+
+
+class PhaseTimerTestCase(SimpleTestCase):
+    """Tests for PhaseTimer class"""
+
+    def test_mark(self):
+        """Test for PhaseTimer.mark method - phases are consecutive and
+        repeated phases are accumulated.
+        """
+        timer = PhaseTimer(start=100.0)
+        timer.mark("import", 100.5)
+        timer.mark("run", 103.0)
+        timer.mark("import", 103.25)
+        self.assertEqual(timer.as_dict(), {"import": 0.75, "run": 2.5})
+        self.assertEqual(timer.total, 3.25)
+        self.assertEqual(timer.format(), "import=0.750s, run=2.500s")
+
+    @mock.patch(
+        "cronman.worker.phase_timer.get_process_start_time",
+        return_value=None,
+    )
+    def test_from_process_start_no_procfs(self, mock_start_time):
+        """Test for PhaseTimer.from_process_start - procfs unavailable"""
+        timer = PhaseTimer.from_process_start()
+        self.assertEqual(timer.as_dict(), {})
+
+    @mock.patch("cronman.worker.phase_timer.get_process_start_time")
+    def test_from_process_start(self, mock_start_time):
+        """Test for PhaseTimer.from_process_start - boot phases"""
+        mock_start_time.return_value = time.time() - 10
+        timer = PhaseTimer.from_process_start()
+        self.assertEqual(
+            list(timer.as_dict()), ["startup", "autodiscover", "setup"]
+        )
+        self.assertAlmostEqual(timer.total, 10, delta=1)
+
+    def test_get_process_start_time(self):
+        """Test for get_process_start_time function"""
+        if not os.path.exists("/proc/self/stat"):
+            self.assertIsNone(get_process_start_time())
+        else:
+            start_time = get_process_start_time()
+            self.assertLess(start_time, time.time())
+            self.assertGreater(start_time, time.time() - 24 * 3600)
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+# vi:si:et:sw=4:sts=4:ts=4
+
+from __future__ import unicode_literals
+
+import fcntl
+import os
+import subprocess
+import tempfile
+import time
+
+from django.test import SimpleTestCase
+
+from unittest import mock
+
+from cronman.tests.base import patch_kill, patch_ps
+from cronman.worker.process_manager import (
+    ProcessManager,
+    get_flock_inodes,
+    get_load_average,
+    get_memory_info,
+    get_process_start_time,
+    get_process_states,
+    wait_for_exit,
+)
+from cronman.utils import spawn
+
+
+class ProcessStatesTestCase(SimpleTestCase):
+    """Tests for `get_process_states` function"""
+
+    def test_procfs(self):
+        """Test for `get_process_states` function - read from `/proc`"""
+        with mock.patch(
+            "cronman.worker.process_manager.subprocess.check_output"
+        ) as mock_check_output:
+            states = get_process_states([os.getpid(), 2**22 + 1, None])
+        self.assertEqual(list(states), [os.getpid()])
+        self.assertEqual(states[os.getpid()], "R")
+        mock_check_output.assert_not_called()
+
+    @mock.patch(
+        "cronman.worker.process_manager.procfs_available", lambda: False
+    )
+    def test_ps(self):
+        """Test for `get_process_states` function - single `ps` call"""
+        with mock.patch(
+            "cronman.worker.process_manager.subprocess.check_output",
+            return_value=b"  1001 S\n  1002 Z+\n",
+        ) as mock_check_output:
+            states = get_process_states([1001, 1002, 1003])
+        self.assertEqual(states, {1001: "S", 1002: "Z+"})
+        mock_check_output.assert_called_once_with(
+            ["ps", "-p", "1001,1002,1003", "-o", "pid=,stat="]
+        )
+
+    @mock.patch(
+        "cronman.worker.process_manager.procfs_available", lambda: False
+    )
+    def test_ps_no_processes(self):
+        """Test for `get_process_states` function - `ps` finds nothing"""
+        with mock.patch(
+            "cronman.worker.process_manager.subprocess.check_output",
+            side_effect=subprocess.CalledProcessError(1, "ps"),
+        ):
+            self.assertEqual(get_process_states([1001]), {})
+
+    @patch_ps(active_pids=[1001], zombie_pids=[1002])
+    @patch_kill(active_pids=[1001, 1002])
+    def test_alive_many(self):
+        """Test for `ProcessManager.alive_many` method"""
+        self.assertEqual(
+            ProcessManager.alive_many(
+                [
+                    ProcessManager(1001),
+                    ProcessManager(1002),
+                    ProcessManager(1003),
+                ]
+            ),
+            {1001: True, 1002: False, 1003: False},
+        )
+
+    def test_pid_reused(self):
+        """Test for `ProcessManager.exists` method - PID reused by process
+        started at different time
+        """
+        start_time = get_process_start_time(os.getpid())
+        self.assertTrue(ProcessManager(os.getpid()).exists())
+        self.assertTrue(ProcessManager(os.getpid(), start_time).exists())
+        self.assertFalse(
+            ProcessManager(os.getpid(), start_time - 3600).exists()
+        )
+
+
+class WaitForExitTestCase(SimpleTestCase):
+    """Tests for `wait_for_exit` function"""
+
+    def test_exited(self):
+        """Test for `wait_for_exit` function - returns as soon as process
+        is gone
+        """
+        process = subprocess.Popen(["sleep", "10"])
+        try:
+            process_manager = ProcessManager(process.pid)
+            process_manager.terminate()
+            start = time.time()
+            self.assertEqual(wait_for_exit([process_manager], 5), [])
+            self.assertLess(time.time() - start, 2)
+        finally:
+            process.kill()
+            process.wait()
+
+    @mock.patch("cronman.worker.process_manager.open_pidfd", lambda pid: None)
+    @patch_ps(active_pids=[1001, 1002])
+    @patch_kill(active_pids=[1001, 1002])
+    def test_timeout_polling(self):
+        """Test for `wait_for_exit` function - processes still alive after
+        timeout, `pidfd_open` not available
+        """
+        processes = [ProcessManager(1001), ProcessManager(1002)]
+        self.assertEqual(wait_for_exit(processes, 0.1), processes)
+
+
+class ProcessGroupTestCase(SimpleTestCase):
+    """Tests for signalling process groups of spawned workers"""
+
+    def test_terminate_group(self):
+        """Test for `ProcessManager.terminate` method - children of spawned
+        process are terminated along with it
+        """
+        pid = spawn("sh", "-c", "sleep 30 & sleep 30 & wait")
+        process_manager = ProcessManager(pid, pgid=pid)
+        try:
+            self.assertTrue(process_manager.owns_group())
+            deadline = time.time() + 5
+            while len(process_manager.descendants()) < 2:
+                self.assertLess(time.time(), deadline)
+                time.sleep(0.05)
+            descendants = process_manager.descendants()
+            self.assertGreater(process_manager.memory_usage(), 0)
+            process_manager.terminate()
+            children = [ProcessManager(child) for child in descendants]
+            self.assertEqual(wait_for_exit(children, 5), [])
+        finally:
+            process_manager.kill()
+            os.waitpid(pid, 0)
+
+    def test_group_of_caller(self):
+        """Test for `ProcessManager.owns_group` method - process group of
+        current process is never signalled
+        """
+        self.assertFalse(
+            ProcessManager(os.getpid(), pgid=os.getpgid(0)).owns_group()
+        )
+        self.assertFalse(ProcessManager(os.getpid()).owns_group())
+
+
+class SystemInfoTestCase(SimpleTestCase):
+    """Tests for system-wide load and memory functions"""
+
+    def test_load_average(self):
+        """Test for `get_load_average` function"""
+        self.assertEqual(len(get_load_average()), 3)
+
+    def test_memory_info(self):
+        """Test for `get_memory_info` function - read from `/proc`"""
+        total, available = get_memory_info()
+        self.assertGreater(total, 0)
+        self.assertLessEqual(available, total)
+        with mock.patch(
+            "cronman.worker.process_manager.PROC_DIR", "/nonexistent"
+        ):
+            self.assertIsNone(get_memory_info())
+
+    def test_flock_inodes(self):
+        """Test for `get_flock_inodes` function - read from `/proc/locks`"""
+        with tempfile.TemporaryFile() as file_:
+            inode = os.fstat(file_.fileno()).st_ino
+            self.assertNotIn(inode, get_flock_inodes())
+            fcntl.flock(file_.fileno(), fcntl.LOCK_EX)
+            self.assertIn(inode, get_flock_inodes())
+        with mock.patch(
+            "cronman.worker.process_manager.PROC_DIR", "/nonexistent"
+        ):
+            self.assertIsNone(get_flock_inodes())
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+# vi:si:et:sw=4:sts=4:ts=4
+
+from __future__ import unicode_literals
+
+import os
+
+from django.test import SimpleTestCase
+
+from cronman.redis_client import get_strict_redis, reset_redis_clients
+from cronman.remote_manager import CronRemoteManager
+from cronman.tests.base import override_cron_settings
+from cronman.worker.cluster_lock import CronWorkerClusterLock
+
+
+class RedisClientTestCase(SimpleTestCase):
+    """Tests for shared Redis clients"""
+
+    def setUp(self):
+        super(RedisClientTestCase, self).setUp()
+        reset_redis_clients()
+
+    def tearDown(self):
+        reset_redis_clients()
+        super(RedisClientTestCase, self).tearDown()
+
+    @override_cron_settings(
+        CRONMAN_REDIS_SOCKET_TIMEOUT=2, CRONMAN_REDIS_CONNECT_TIMEOUT=1
+    )
+    def test_shared_client(self):
+        """Test for get_strict_redis function - one client (and connection
+        pool) per process, used by all consumers
+        """
+        client = get_strict_redis()
+        self.assertIs(get_strict_redis(), client)
+        self.assertIs(get_strict_redis(db=0), client)
+        self.assertIs(CronRemoteManager().redis_client, client)
+        self.assertIs(CronWorkerClusterLock("Sleep").redis_client, client)
+        self.assertIsNot(get_strict_redis(db=1), client)
+        connection_kwargs = client.connection_pool.connection_kwargs
+        self.assertEqual(connection_kwargs["socket_timeout"], 2)
+        self.assertEqual(connection_kwargs["socket_connect_timeout"], 1)
+
+    @override_cron_settings()
+    def test_settings_change(self):
+        """Test for get_strict_redis function - other host in settings"""
+        client = get_strict_redis()
+        with override_cron_settings(CRONMAN_REDIS_HOST="10.0.0.1"):
+            other_client = get_strict_redis()
+        self.assertIsNot(other_client, client)
+        self.assertEqual(
+            other_client.connection_pool.connection_kwargs["host"], "10.0.0.1"
+        )
+
+    def test_reset_after_fork(self):
+        """Test for get_strict_redis function - new client in child process"""
+        client = get_strict_redis()
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # child process
+            try:
+                os.close(read_fd)
+                shared = get_strict_redis() is client
+                os.write(write_fd, b"1" if shared else b"0")
+            finally:
+                os._exit(0)
+        os.close(write_fd)
+        os.waitpid(pid, 0)
+        with os.fdopen(read_fd, "rb") as pipe:
+            self.assertEqual(pipe.read(), b"0")
+        self.assertIs(get_strict_redis(), client)
@@ -4,15 +4,24 @@
 from __future__ import unicode_literals
 
 import datetime
+import json
+import os
+import socket
+import time
 
 from unittest import mock
 
 from cronman.exceptions import CronJobNotRegistered
+from cronman.remote_manager import CronRemoteManager
 from cronman.scheduler import CronScheduler
 from cronman.tests.base import (
     TEMP_FILE,
     BaseCronTestCase,
+    create_pid_file,
     override_cron_settings,
+    patch_kill,
+    patch_proc,
+    patch_ps,
 )
 
 
@@ -170,6 +179,262 @@ class CronSchedulerTestCase(BaseCronTestCase):
         mock_start.assert_not_called()
         mock_cron_worker.return_value.resume.assert_not_called()
 
+    @override_cron_settings()
+    @mock.patch("cronman.scheduler.scheduler.CronSpawner.start_worker")
+    @mock.patch(
+        "cronman.scheduler.scheduler.CronScheduler.cron_worker",
+        new_callable=mock.PropertyMock,
+    )
+    @patch_ps(active_pids=[1003])
+    @patch_kill(active_pids=[1003])
+    def test_run_collect_garbage(self, mock_cron_worker, mock_start):
+        """Test for CronScheduler.run method - dead PID files deleted,
+        resumable ones kept
+        """
+        create_pid_file("ParamsLockedSleep:seconds=10", 1001)
+        create_pid_file("PersistentSleep:seconds=10", 1002, can_resume=True)
+        create_pid_file("ClassLockedSleep:seconds=10", 1003)
+        scheduler = CronScheduler()
+        output = scheduler.run()
+        self.assertIn(
+            "Cleanup: 1 dead PID file(s) deleted, 1 kept for resume, "
+            "0 not checked.\n",
+            output,
+        )
+        self.assertEqual(
+            sorted(
+                name
+                for name in os.listdir(scheduler.data_dir)
+                if name.endswith(".pid")
+            ),
+            ["ClassLockedSleep.pid", "PersistentSleep.pid"],
+        )
+        # Nothing to do in next call:
+        self.assertNotIn("Cleanup:", scheduler.run())
+
+    @override_cron_settings(CRONMAN_SCHEDULER_GC_TIME_LIMIT=1e-9)
+    @mock.patch("cronman.scheduler.scheduler.CronSpawner.start_worker")
+    @mock.patch(
+        "cronman.scheduler.scheduler.CronScheduler.cron_worker",
+        new_callable=mock.PropertyMock,
+    )
+    @patch_ps()
+    @patch_kill()
+    def test_run_collect_garbage_incremental(
+        self, mock_cron_worker, mock_start
+    ):
+        """Test for CronScheduler.run method - cleanup continued in
+        consecutive calls when time limit is exceeded
+        """
+        create_pid_file("ParamsLockedSleep:seconds=10", 1001)
+        create_pid_file("PersistentSleep:seconds=10", 1002)
+        create_pid_file("ClassLockedSleep:seconds=10", 1003)
+        scheduler = CronScheduler()
+        for num_unchecked in (2, 1, 0):
+            self.assertIn(
+                "Cleanup: 1 dead PID file(s) deleted, 0 kept for resume, "
+                "{} not checked.\n".format(num_unchecked),
+                scheduler.run(),
+            )
+        self.assertFalse(
+            [
+                name
+                for name in os.listdir(scheduler.data_dir)
+                if name.endswith(".pid")
+            ]
+        )
+
+    @override_cron_settings(CRONMAN_SCHEDULER_GC_TIME_LIMIT=0)
+    @mock.patch("cronman.scheduler.scheduler.CronSpawner.start_worker")
+    @mock.patch(
+        "cronman.scheduler.scheduler.CronScheduler.cron_worker",
+        new_callable=mock.PropertyMock,
+    )
+    @patch_ps()
+    @patch_kill()
+    def test_run_collect_garbage_disabled(self, mock_cron_worker, mock_start):
+        """Test for CronScheduler.run method - cleanup disabled"""
+        pid_file = create_pid_file("ParamsLockedSleep:seconds=10", 1001)
+        self.assertNotIn("Cleanup:", CronScheduler().run())
+        self.assertTrue(pid_file.exists())
+
+    @override_cron_settings(CRONMAN_SCHEDULER_ORPHANS=True)
+    @mock.patch("cronman.scheduler.scheduler.CronSpawner.start_worker")
+    @mock.patch(
+        "cronman.scheduler.scheduler.CronScheduler.cron_worker",
+        new_callable=mock.PropertyMock,
+    )
+    @patch_proc(
+        {
+            2001: [
+                "python",
+                "manage.py",
+                "cron_worker",
+                "run",
+                "Sleep:seconds=10",
+            ]
+        }
+    )
+    @patch_ps(active_pids=[2001])
+    @patch_kill(active_pids=[2001])
+    def test_run_reconcile_orphans(self, mock_cron_worker, mock_start):
+        """Test for CronScheduler.run method - orphaned worker adopted"""
+        scheduler = CronScheduler()
+        self.assertIn("Orphans: 1 adopted.\n", scheduler.run())
+        # Nothing to do in next call:
+        self.assertNotIn("Orphans:", scheduler.run())
+
+    @override_cron_settings()
+    @mock.patch("cronman.scheduler.scheduler.CronSpawner.start_worker")
+    @mock.patch(
+        "cronman.scheduler.scheduler.CronScheduler.cron_worker",
+        new_callable=mock.PropertyMock,
+    )
+    @patch_proc(
+        {
+            2001: [
+                "python",
+                "manage.py",
+                "cron_worker",
+                "run",
+                "Sleep:seconds=10",
+            ]
+        }
+    )
+    def test_run_reconcile_orphans_disabled(
+        self, mock_cron_worker, mock_start
+    ):
+        """Test for CronScheduler.run method - orphans check disabled
+        (default)
+        """
+        self.assertNotIn("Orphans:", CronScheduler().run())
+
+    @override_cron_settings(CRONMAN_SCHEDULER_ORPHANS=True)
+    @mock.patch.dict(os.environ, {"CRONMAN_SCHEDULER_ORPHANS": "0"})
+    @mock.patch("cronman.scheduler.scheduler.CronSpawner.start_worker")
+    @mock.patch(
+        "cronman.scheduler.scheduler.CronScheduler.cron_worker",
+        new_callable=mock.PropertyMock,
+    )
+    @patch_proc(
+        {
+            2001: [
+                "python",
+                "manage.py",
+                "cron_worker",
+                "run",
+                "Sleep:seconds=10",
+            ]
+        }
+    )
+    def test_run_reconcile_orphans_disabled_env(
+        self, mock_cron_worker, mock_start
+    ):
+        """Test for CronScheduler.run method - orphans check disabled
+        through environment variable ("0" string)
+        """
+        self.assertNotIn("Orphans:", CronScheduler().run())
+
+    @override_cron_settings(CRONMAN_REMOTE_MANAGER_ENABLED=True)
+    @mock.patch("cronman.scheduler.scheduler.CronSpawner.start_worker")
+    @mock.patch(
+        "cronman.remote_manager.CronRemoteManager.redis_client",
+        new_callable=mock.PropertyMock,
+    )
+    @patch_ps(active_pids=[os.getpid()])
+    def test_run_publish_snapshot(self, mock_redis, mock_start):
+        """Test for CronScheduler.run method - status snapshot published"""
+        mock_redis.return_value.eval.return_value = [None, [], []]
+        create_pid_file("ClassLockedSleep:seconds=10")
+        CronScheduler().run()
+        mock_pipeline = mock_redis.return_value.pipeline.return_value
+        key = "cron_scheduler:snapshot:{}".format(socket.gethostname())
+        ((args, _),) = mock_pipeline.hmset.call_args_list
+        self.assertEqual(args[0], key)
+        snapshot = args[1]
+        self.assertEqual(
+            json.loads(snapshot["totals"]),
+            {"TOTAL": 1, "ALIVE": 1, "DEAD": 0},
+        )
+        worker = json.loads(snapshot["workers"])[0]
+        self.assertEqual(worker["name"], "ClassLockedSleep")
+        self.assertEqual(worker["pid"], os.getpid())
+        self.assertRegex(snapshot["load"], r"^[\d.]+ [\d.]+ [\d.]+$")
+        self.assertGreater(snapshot["memory_total"], 0)
+        mock_pipeline.expire.assert_called_once_with(
+            key, CronRemoteManager.SNAPSHOT_TTL
+        )
+
+    @override_cron_settings(
+        CRONMAN_REMOTE_MANAGER_ENABLED=True, CRONMAN_SCHEDULER_SNAPSHOT=False
+    )
+    @mock.patch("cronman.scheduler.scheduler.CronSpawner.start_worker")
+    @mock.patch(
+        "cronman.remote_manager.CronRemoteManager.redis_client",
+        new_callable=mock.PropertyMock,
+    )
+    def test_run_publish_snapshot_disabled(self, mock_redis, mock_start):
+        """Test for CronScheduler.run method - snapshots disabled"""
+        mock_redis.return_value.eval.return_value = [None, [], []]
+        CronScheduler().run()
+        mock_redis.return_value.pipeline.assert_not_called()
+
+    @override_cron_settings(CRONMAN_REMOTE_MANAGER_ENABLED=True)
+    @mock.patch.dict(os.environ, {"CRONMAN_SCHEDULER_SNAPSHOT": "0"})
+    @mock.patch("cronman.scheduler.scheduler.CronSpawner.start_worker")
+    @mock.patch(
+        "cronman.remote_manager.CronRemoteManager.redis_client",
+        new_callable=mock.PropertyMock,
+    )
+    def test_run_publish_snapshot_disabled_env(self, mock_redis, mock_start):
+        """Test for CronScheduler.run method - snapshots disabled through
+        environment variable ("0" string)
+        """
+        mock_redis.return_value.eval.return_value = [None, [], []]
+        CronScheduler().run()
+        mock_redis.return_value.pipeline.assert_not_called()
+
+    @override_cron_settings(CRONMAN_RESUME_MAX_CONCURRENT=0)
+    @mock.patch("cronman.spawner.CronSpawner.start_worker")
+    @patch_ps()
+    @patch_kill()
+    def test_run_resume_pending(self, mock_start):
+        """Test for CronScheduler.run method with resume file - workers left
+        for later, resume file created again
+        """
+        create_pid_file("PersistentSleep:seconds=20", 1002, can_resume=True)
+        scheduler = CronScheduler()
+        scheduler.resume_file.create()
+        output = scheduler.run()
+        self.assertIn("PersistentSleep\tPENDING", output)
+        self.assertNotIn(
+            mock.call("PersistentSleep:seconds=20"), mock_start.call_args_list
+        )
+        self.assertTrue(scheduler.resume_file.exists())
+
+    @override_cron_settings(CRONMAN_RESUME_RATE_LIMIT=0.5)
+    @mock.patch("cronman.spawner.CronSpawner.start_worker")
+    @patch_ps()
+    @patch_kill()
+    def test_run_resume_rate_limit(self, mock_start):
+        """Test for CronScheduler.run method with resume file - workers
+        started according to rate limit and time since previous call
+        """
+        for i, name in enumerate(
+            ("PersistentSleep", "PersistentSleep2", "ClassLockedSleep")
+        ):
+            create_pid_file(
+                "{}:seconds=20".format(name), 1002 + i, can_resume=True
+            )
+        scheduler = CronScheduler()
+        scheduler.resume_file.create()
+        created = time.time() - 4
+        os.utime(scheduler.resume_file.path, (created, created))
+        output = scheduler.run()
+        self.assertIn("\tPENDING\tPersistentSleep2:seconds=20\n", output)
+        self.assertIn("TOTAL: 2\tPENDING: 1\n", output)
+        self.assertTrue(scheduler.resume_file.exists())
+
     @override_cron_settings()
     @mock.patch(
         "cronman.scheduler.scheduler.CronSpawner.start_worker",
@@ -241,6 +506,36 @@ class CronSchedulerTestCase(BaseCronTestCase):
         self.assertTrue(scheduler.lock_file.exists())
         mock_cron_worker.return_value.suspend.assert_not_called()
 
+    @override_cron_settings()
+    @mock.patch(
+        "cronman.scheduler.scheduler.CronScheduler.cron_worker",
+        new_callable=mock.PropertyMock,
+    )
+    def test_apply_remote_command(self, mock_cron_worker):
+        """Test for CronScheduler.apply_remote_command method"""
+        mock_cron_worker.return_value.suspend.return_value = ""
+        mock_cron_worker.return_value.resume.return_value = "<resume>"
+        mock_cron_worker.return_value.kill.return_value = "<kill>"
+        scheduler = CronScheduler()
+        self.assertIn(
+            "Scheduler disabled", scheduler.apply_remote_command("disable")
+        )
+        self.assertTrue(scheduler.lock_file.exists())
+        self.assertEqual(scheduler.apply_remote_command("disable"), "")
+        output = scheduler.apply_remote_command("enable")
+        self.assertIn("Scheduler enabled", output)
+        self.assertTrue(output.endswith("<resume>"))
+        self.assertFalse(scheduler.lock_file.exists())
+        self.assertFalse(scheduler.resume_file.exists())
+        self.assertEqual(scheduler.apply_remote_command("enable"), "")
+        self.assertEqual(
+            scheduler.apply_remote_command("kill:Sleep:seconds=1"), "<kill>"
+        )
+        mock_cron_worker.return_value.kill.assert_called_once_with(
+            "Sleep:seconds=1"
+        )
+        self.assertEqual(scheduler.apply_remote_command("foo"), "")
+
     @override_cron_settings()
     def test_enable(self):
         """Test for CronScheduler.enable method - OK"""
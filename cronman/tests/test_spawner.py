@@ -380,3 +380,62 @@ class CronSpawnerTestCase(BaseCronTestCase):
             "LowCPUSleep:seconds=10",
             env=spawner.get_worker_env(),
         )
+
+    @override_cron_settings()
+    @mock.patch("cronman.spawner.cron_job_registry.get")
+    @mock.patch("cronman.spawner.cron_job_registry.get_info")
+    def test_get_process_priority_args_from_manifest(
+        self, mock_get_info, mock_get
+    ):
+        """Test for CronSpawner.get_process_priority_args method
+        - priorities read from manifest, cron job class is not imported
+        """
+        mock_get_info.return_value = {
+            "worker_cpu_priority": 10,
+            "worker_io_priority": [3, None],
+        }
+        spawner = CronSpawner()
+        self.assertEqual(
+            spawner.get_process_priority_args("Lazy:seconds=10"),
+            ["nice", "-n", "10", "ionice", "-c", "3"],
+        )
+        mock_get_info.assert_called_once_with("Lazy")
+        mock_get.assert_not_called()
+
+    @override_cron_settings(
+        CRONMAN_RAVEN_CMD=None, CRONMAN_WORKER_SETTINGS="app.settings_worker"
+    )
+    @mock.patch("cronman.spawner.spawn")
+    @mock.patch(
+        "cronman.spawner.sys.argv",
+        ["manage.py", "cron_scheduler", "run", "--settings=test"],
+    )
+    @mock.patch("cronman.spawner.sys.executable", "/bin/python")
+    def test_start_worker_worker_settings(self, mock_spawn):
+        """Test for CronSpawner.start_worker method
+        - CRONMAN_WORKER_SETTINGS replaces --settings of current process
+        """
+        spawner = CronSpawner()
+        spawner.start_worker("Sleep:seconds=10")
+        mock_spawn.assert_called_once_with(
+            "/bin/python",
+            "manage.py",
+            "cron_worker",
+            "run",
+            "Sleep:seconds=10",
+            "--settings=app.settings_worker",
+            env=spawner.get_worker_env(),
+        )
+
+    @override_cron_settings(CRONMAN_WORKER_SETTINGS="app.settings_worker")
+    @mock.patch("cronman.spawner.cron_job_registry.get_info")
+    def test_get_settings_options_cron_job_class(self, mock_get_info):
+        """Test for CronSpawner.get_settings_options method
+        - `worker_settings` declared by cron job class takes precedence
+        """
+        mock_get_info.return_value = {"worker_settings": "app.settings_slim"}
+        spawner = CronSpawner()
+        self.assertEqual(
+            spawner.get_settings_options("Slim:seconds=10"),
+            ["--settings=app.settings_slim"],
+        )
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+# vi:si:et:sw=4:sts=4:ts=4
+
+from __future__ import unicode_literals
+
+import io
+import json
+import os
+import subprocess
+import sys
+
+from cronman.config import app_settings
+from cronman.tests.base import (
+    BaseCronTestCase,
+    create_pid_file,
+    override_cron_settings,
+    patch_ps,
+)
+from cronman.worker.status_cli import (
+    EXIT_DEAD,
+    EXIT_NOT_RUNNING,
+    EXIT_OK,
+    EXIT_UNKNOWN,
+    main,
+)
+
+
+class StatusCLITestCase(BaseCronTestCase):
+    """Tests for `cronman-status` script"""
+
+    def call_main(self, *argv):
+        """Calls `main` function, returns exit code and output"""
+        stdout = io.StringIO()
+        exit_code = main(list(argv), stdout=stdout)
+        return exit_code, stdout.getvalue()
+
+    @override_cron_settings()
+    @patch_ps(active_pids=[os.getpid()])
+    def test_text(self):
+        """Test for text output - alive worker"""
+        create_pid_file("ClassLockedSleep:seconds=10")
+        exit_code, output = self.call_main()
+        self.assertEqual(exit_code, EXIT_OK)
+        self.assertEqual(
+            output,
+            "STATUS:\n"
+            "ClassLockedSleep\tALIVE\t{}\n"
+            "TOTAL: 1\tALIVE: 1\tDEAD: 0\n".format(os.getpid()),
+        )
+
+    @override_cron_settings()
+    @patch_ps()
+    def test_json_dead(self):
+        """Test for JSON output - dead worker"""
+        create_pid_file("ClassLockedSleep:seconds=10", 1001)
+        exit_code, output = self.call_main(
+            "--format=json", "--data-dir", app_settings.CRONMAN_DATA_DIR
+        )
+        self.assertEqual(exit_code, EXIT_DEAD)
+        self.assertEqual(
+            json.loads(output),
+            {
+                "data_dir": app_settings.CRONMAN_DATA_DIR,
+                "workers": [
+                    {
+                        "name": "ClassLockedSleep",
+                        "status": "DEAD",
+                        "pid": 1001,
+                    }
+                ],
+                "totals": {"TOTAL": 1, "ALIVE": 0, "DEAD": 1},
+            },
+        )
+
+    @override_cron_settings()
+    @patch_ps(active_pids=[os.getpid()])
+    def test_filter_not_running(self):
+        """Test for job spec filter - no matching worker"""
+        create_pid_file("ClassLockedSleep:seconds=10")
+        self.assertEqual(self.call_main("ClassLockedSleep")[0], EXIT_OK)
+        self.assertEqual(
+            self.call_main("ParamsLockedSleep")[0], EXIT_NOT_RUNNING
+        )
+
+    def test_missing_data_dir(self):
+        """Test for missing data directory"""
+        self.assertEqual(
+            self.call_main("--data-dir", "/nonexistent/cronman")[0],
+            EXIT_UNKNOWN,
+        )
+
+    @override_cron_settings()
+    def test_without_django_setup(self):
+        """Test for running the script in a fresh process - Django apps,
+        models and management commands are not loaded
+        """
+        os.makedirs(app_settings.CRONMAN_DATA_DIR)
+        code = (
+            "import sys\n"
+            "from cronman.worker.status_cli import main\n"
+            "exit_code = main()\n"
+            "assert 'cronman.models' not in sys.modules\n"
+            "assert 'django.core.management' not in sys.modules\n"
+            "from django.apps import apps\n"
+            "assert not apps.ready\n"
+            "sys.exit(exit_code)\n"
+        )
+        env = dict(os.environ, CRONMAN_DATA_DIR=app_settings.CRONMAN_DATA_DIR)
+        env.pop("DJANGO_SETTINGS_MODULE", None)
+        process = subprocess.run(
+            [sys.executable, "-c", code],
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        self.assertEqual(process.returncode, EXIT_OK, process.stderr)
+        self.assertEqual(process.stdout, b"STATUS:\nNo PID file(s) found.\n")
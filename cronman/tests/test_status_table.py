@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+# vi:si:et:sw=4:sts=4:ts=4
+
+from __future__ import unicode_literals
+
+import hashlib
+import os
+import time
+
+from django.core.management import call_command
+
+from unittest import mock
+
+from cronman.tests.base import (
+    TEST_CRONMAN_DATA_DIR,
+    BaseCronTestCase,
+    create_pid_file,
+    lock_pid_file,
+    override_cron_settings,
+    patch_kill,
+    patch_ps,
+)
+from cronman.worker import CronWorkerPIDFile
+from cronman.worker.worker_list import CronWorkerPIDList
+from cronman.worker.status_table import CronWorkerStatusTable, WorkerState
+
+
+class CronWorkerStatusTableTestCase(BaseCronTestCase):
+    """Tests for CronWorkerStatusTable class"""
+
+    def setUp(self):
+        super(CronWorkerStatusTableTestCase, self).setUp()
+        os.makedirs(TEST_CRONMAN_DATA_DIR)
+        self.table = CronWorkerStatusTable(TEST_CRONMAN_DATA_DIR, slots=4)
+        self.addCleanup(self.table.close)
+
+    def test_register_get_unregister(self):
+        """Test for register, get and unregister methods"""
+        self.assertFalse(self.table.exists())
+        self.assertTrue(self.table.register("Sleep", 1001, 1500000000.0))
+        self.assertTrue(self.table.available())
+        entry = self.table.get(1001)
+        self.assertEqual(entry["pid"], 1001)
+        self.assertEqual(entry["name"], "Sleep")
+        self.assertEqual(entry["state"], WorkerState.LOCKED)
+        self.assertEqual(entry["start_time"], 1500000000.0)
+        self.assertEqual(
+            entry["job_hash"], hashlib.md5(b"Sleep").hexdigest()  # nosec
+        )
+        self.assertIsNone(self.table.get(1002))
+        self.table.unregister("Sleep", 1001)
+        self.assertIsNone(self.table.get(1001))
+        self.assertEqual(self.table.entries(), [])
+
+    def test_register_collisions(self):
+        """Test for register method - PIDs in the same slot (probing)"""
+        self.assertTrue(self.table.register("A", 1))
+        self.assertTrue(self.table.register("B", 5))
+        self.assertTrue(self.table.register("C", 9))
+        self.table.unregister("B", 5)  # lookup chain must not break
+        self.assertEqual(self.table.get(9)["name"], "C")
+        self.assertTrue(self.table.register("D", 13))  # reuses slot of "B"
+        self.assertEqual(
+            sorted(entry["name"] for entry in self.table.entries()),
+            ["A", "C", "D"],
+        )
+
+    def test_register_same_name(self):
+        """Test for register method - entry of crashed worker replaced"""
+        self.assertTrue(self.table.register("Sleep", 1001))
+        self.assertTrue(self.table.register("Sleep", 1002))
+        self.assertIsNone(self.table.get(1001))
+        self.assertEqual([e["pid"] for e in self.table.entries()], [1002])
+
+    def test_register_overflow(self):
+        """Test for register method - table is full"""
+        for pid in range(1, 5):
+            self.assertTrue(self.table.register("Sleep{}".format(pid), pid))
+        self.assertTrue(self.table.available())
+        self.assertFalse(self.table.register("Sleep5", 5))
+        self.assertFalse(self.table.available())
+
+    def test_heartbeat(self):
+        """Test for heartbeat method"""
+        self.table.register("Sleep", 1001)
+        heartbeat = self.table.get(1001)["heartbeat"]
+        self.table.heartbeat(1001, WorkerState.RUNNING)
+        entry = self.table.get(1001)
+        self.assertEqual(entry["state"], WorkerState.RUNNING)
+        self.assertGreaterEqual(entry["heartbeat"], heartbeat)
+
+    def test_shared_between_objects(self):
+        """Test for table shared by several processes (objects)"""
+        self.table.register("Sleep", 1001)
+        other_table = CronWorkerStatusTable(TEST_CRONMAN_DATA_DIR)
+        self.addCleanup(other_table.close)
+        self.assertEqual(other_table.get(1001)["name"], "Sleep")
+        self.assertEqual(other_table.slots, 4)  # read from header
+
+
+class CronWorkerPIDListStatusTableTestCase(BaseCronTestCase):
+    """Tests for listing Cron Workers through status table"""
+
+    @override_cron_settings()
+    @patch_ps(active_pids=[1002])
+    @patch_kill(active_pids=[1002])
+    def test_status_from_table(self):
+        """Test for status listing - PID files not registered in status
+        table (e.g. workers started before the table was enabled) are
+        listed by `clean` only (directory scan).
+        """
+        create_pid_file("ClassLockedSleep", 1001)
+        os.unlink(
+            os.path.join(
+                TEST_CRONMAN_DATA_DIR, CronWorkerStatusTable.FILE_NAME
+            )
+        )
+        create_pid_file("PersistentSleep", 1002)  # table re-created
+        output = call_command("cron_worker", "status")
+        self.assertEqual(
+            output,
+            "STATUS:\n"
+            "PersistentSleep\tALIVE\t1002\n"
+            "TOTAL: 1\tALIVE: 1\tDEAD: 0\n",
+        )
+        self.assertIsNone(
+            CronWorkerPIDFile.by_pid(TEST_CRONMAN_DATA_DIR, 1001)
+        )
+        output = call_command("cron_worker", "clean")
+        self.assertIn("ClassLockedSleep\tDELETED\t1001\n", output)
+
+    @override_cron_settings()
+    @patch_ps(active_pids=[1002])
+    @patch_kill(active_pids=[1002])
+    def test_status_without_file_access(self):
+        """Test for status listing - workers are listed from status table
+        entries, PID files are neither scanned nor read
+        """
+        os.makedirs(TEST_CRONMAN_DATA_DIR)
+        pid_file = CronWorkerPIDFile(TEST_CRONMAN_DATA_DIR, "PersistentSleep")
+        with mock.patch("cronman.worker.worker_file.os.getpid", lambda: 1002):
+            pid_file.create("PersistentSleep", True, kill_grace_seconds=15)
+        with mock.patch(
+            "cronman.worker.worker_file.os.listdir", wraps=os.listdir
+        ) as mock_listdir:
+            with mock.patch.object(
+                CronWorkerPIDFile, "read_content"
+            ) as mock_read_content:
+                worker_pid_list = CronWorkerPIDList(TEST_CRONMAN_DATA_DIR)
+                items, totals = worker_pid_list.status()
+        self.assertNotIn(
+            mock.call(TEST_CRONMAN_DATA_DIR), mock_listdir.call_args_list
+        )
+        mock_read_content.assert_not_called()
+        self.assertEqual(
+            [(item["name"], item["status"]) for item in items],
+            [("PersistentSleep", "ALIVE")],
+        )
+        listed_pid_file = items[0]["_pid_file"]
+        self.assertEqual(listed_pid_file.process.pid, 1002)
+        self.assertEqual(listed_pid_file.kill_grace_seconds, 15)
+
+    @override_cron_settings()
+    def test_heartbeat_while_running(self):
+        """Test for CronWorkerPIDFile.start_heartbeat method - heartbeat
+        refreshed periodically until `stop_heartbeat` is called
+        """
+        pid_file = lock_pid_file("PersistentSleep")
+        self.addCleanup(pid_file.release)
+        table = CronWorkerStatusTable(TEST_CRONMAN_DATA_DIR)
+        self.addCleanup(table.close)
+        pid_file.start_heartbeat(WorkerState.RUNNING, interval=0.01)
+        entry = table.get(pid_file.pid)
+        self.assertEqual(entry["state"], WorkerState.RUNNING)
+        time.sleep(0.05)
+        pid_file.stop_heartbeat(WorkerState.LOCKED)
+        self.assertIsNone(pid_file._heartbeat_thread)
+        new_entry = table.get(pid_file.pid)
+        self.assertEqual(new_entry["state"], WorkerState.LOCKED)
+        self.assertGreater(new_entry["heartbeat"], entry["heartbeat"])
+
+    @override_cron_settings(CRONMAN_WORKER_STATUS_TABLE=False)
+    @patch_ps(active_pids=[1002])
+    @patch_kill(active_pids=[1002])
+    def test_status_table_disabled(self):
+        """Test for status listing - status table disabled"""
+        create_pid_file("PersistentSleep", 1002)
+        self.assertFalse(
+            os.path.exists(
+                os.path.join(
+                    TEST_CRONMAN_DATA_DIR, CronWorkerStatusTable.FILE_NAME
+                )
+            )
+        )
+        output = call_command("cron_worker", "status")
+        self.assertIn("PersistentSleep\tALIVE\t1002\n", output)
@@ -394,3 +394,32 @@ class CronUtilsTestCase(BaseCronTestCase):
             kwargs={"param": 0},
         )
         mock_pid_file_locked.assert_called_once_with(mock_pid_file, 1)
+
+    @mock.patch("cronman.worker.worker.CronWorker.get_pid_file")
+    @mock.patch("cronman.worker.worker.CronWorker.pid_file_locked")
+    @mock.patch(
+        "cronman.worker.cluster_lock.CronWorkerClusterLock.redis_client",
+        new_callable=mock.PropertyMock,
+    )
+    def test_is_cron_job_running_cluster(
+        self, mock_redis, mock_pid_file_locked, mock_get_pid_file
+    ):
+        """Test for `is_cron_job_running` function - case: cluster lock"""
+        mock_pid_file = mock.MagicMock()
+        mock_pid_file.name = "FakeCronJob"
+        mock_get_pid_file.return_value = mock_pid_file
+        mock_pid_file_locked.return_value = False
+        mock_redis.return_value.get.return_value = (
+            '{"token": 42, "host": "node-2", "pid": 1001}'
+        )
+
+        class FakeCronJob(object):
+            lock_type = "class"
+            lock_scope = "cluster"
+
+        self.assertTrue(utils.is_cron_job_running(FakeCronJob))
+        mock_redis.return_value.get.assert_called_once_with(
+            "cron_lock:FakeCronJob"
+        )
+        mock_redis.return_value.get.return_value = None
+        self.assertFalse(utils.is_cron_job_running(FakeCronJob))
@@ -3,21 +3,30 @@
 
 from __future__ import unicode_literals
 
+import fcntl
+import os
 import platform
+import threading
+
+from django.core.exceptions import ImproperlyConfigured
 
 from unittest import mock
+import redis
 
+from cronman.config import app_settings
+from cronman.cron_jobs.sleep import ClassLockedSleep
 from cronman.exceptions import CronWorkerInvalidParams
 from cronman.models import CronTask
 from cronman.taxonomies import CronTaskStatus
 from cronman.tests.base import (
     BaseCronTestCase,
-    create_pid_file,
+    lock_pid_file,
     override_cron_settings,
     patch_kill,
     patch_ps,
 )
-from cronman.worker import CronWorker
+from cronman.worker import CronWorker, CronWorkerPIDFile
+from cronman.worker.process_manager import get_process_start_time
 
 SYSTEM_NAME = platform.node()
 
@@ -91,7 +100,8 @@ class CronWorkerTestCase(BaseCronTestCase):
         """
         worker = CronWorker()
         worker.slack = mock.MagicMock()
-        create_pid_file("ClassLockedSleep")
+        pid_file = lock_pid_file("ClassLockedSleep")
+        self.addCleanup(pid_file.release)
         output = worker.run("ClassLockedSleep")
         self.assertIn(
             "CronWorkerLocked: "
@@ -117,7 +127,8 @@ class CronWorkerTestCase(BaseCronTestCase):
         """
         worker = CronWorker()
         worker.slack = mock.MagicMock()
-        create_pid_file("ParamsLockedSleep")
+        pid_file = lock_pid_file("ParamsLockedSleep")
+        self.addCleanup(pid_file.release)
         output = worker.run("ParamsLockedSleep")
         self.assertIn(
             "CronWorkerLocked: "
@@ -144,7 +155,8 @@ class CronWorkerTestCase(BaseCronTestCase):
         """
         worker = CronWorker()
         worker.slack = mock.MagicMock()
-        create_pid_file("IgnoreLockErrorsSleep")
+        pid_file = lock_pid_file("IgnoreLockErrorsSleep")
+        self.addCleanup(pid_file.release)
         output = worker.run("IgnoreLockErrorsSleep")
         self.assertIn(
             "CronWorkerLocked: "
@@ -246,7 +258,8 @@ class CronWorkerTestCase(BaseCronTestCase):
         cron_task = CronTask.objects.run_now("ClassLockedSleep")[0]
         worker = CronWorker()
         worker.slack = mock.MagicMock()
-        create_pid_file(cron_task.cron_job)
+        pid_file = lock_pid_file(cron_task.cron_job)
+        self.addCleanup(pid_file.release)
         worker.run(cron_task.job_spec())
 
         mock_run.assert_not_called()
@@ -333,3 +346,541 @@ class CronWorkerTestCase(BaseCronTestCase):
             "[{}] {}".format(SYSTEM_NAME, message)
         )
         mock_run.assert_not_called()
+
+    # Locks
+
+    @override_cron_settings()
+    @mock.patch("cronman.cron_jobs.sleep.ClassLockedSleep.run")
+    def test_run_after_crashed_worker(self, mock_run):
+        """Test for CronWorker.run method - lock held by crashed process
+        is released automatically, even if PID file still exists.
+        """
+        pid_file = lock_pid_file("ClassLockedSleep")
+        os.close(pid_file.lock_fd)  # process exit, PID file not deleted
+        self.assertTrue(os.path.exists(pid_file.path))
+        output = CronWorker().run("ClassLockedSleep")
+        self.assertIn("OK: Processed ClassLockedSleep", output)
+        mock_run.assert_called_once_with()
+        self.assertFalse(os.path.exists(pid_file.path))
+
+    @override_cron_settings()
+    @mock.patch("cronman.cron_jobs.sleep.ClassLockedSleep.run")
+    @mock.patch(
+        "cronman.cron_jobs.sleep.ClassLockedSleep.lock_wait_timeout", 5
+    )
+    def test_run_wait_for_lock(self, mock_run):
+        """Test for CronWorker.run method - waiting for the lock
+        to be released by other process.
+        """
+        pid_file = lock_pid_file("ClassLockedSleep")
+        timer = threading.Timer(0.2, pid_file.release)
+        timer.start()
+        self.addCleanup(timer.cancel)
+        output = CronWorker().run("ClassLockedSleep")
+        self.assertIn("OK: Processed ClassLockedSleep", output)
+        mock_run.assert_called_once_with()
+
+    @override_cron_settings()
+    def test_is_locked_without_flock(self):
+        """Test for CronWorkerPIDFile.is_locked method - lock is looked up
+        in `/proc/locks`, status check never takes it
+        """
+        pid_file = lock_pid_file("ClassLockedSleep")
+        self.addCleanup(pid_file.release)
+        checked_pid_file = CronWorkerPIDFile(pid_file.data_dir, pid_file.name)
+        with mock.patch(
+            "cronman.worker.worker_file.fcntl.flock"
+        ) as mock_flock:
+            self.assertTrue(checked_pid_file.is_locked())
+        mock_flock.assert_not_called()
+        pid_file.release()
+        pid_file.write_content("")  # Holder has just exited
+        self.assertFalse(checked_pid_file.is_locked())
+
+    @override_cron_settings()
+    @mock.patch("cronman.cron_jobs.sleep.ClassLockedSleep.run")
+    @mock.patch("cronman.worker.worker_file.time.sleep")
+    def test_run_locked_no_retries(self, mock_sleep, mock_run):
+        """Test for CronWorker.run method - lock held by alive process,
+        worker gives up without retries
+        """
+        pid_file = lock_pid_file("ClassLockedSleep")
+        self.addCleanup(pid_file.release)
+        output = CronWorker().run("ClassLockedSleep")
+        self.assertIn("ClassLockedSleep", output)
+        mock_run.assert_not_called()
+        mock_sleep.assert_not_called()
+
+    @override_cron_settings()
+    @mock.patch("cronman.cron_jobs.sleep.ClassLockedSleep.run")
+    @mock.patch(
+        "cronman.cron_jobs.sleep.ClassLockedSleep.coalesce_locked", True
+    )
+    def test_run_lock_coalesced(self, mock_run):
+        """Test for CronWorker.run method - locked call coalesced into
+        re-run request for the process holding the lock.
+        """
+        pid_file = lock_pid_file("ClassLockedSleep")
+        self.addCleanup(pid_file.release)
+        output = CronWorker().run("ClassLockedSleep:seconds=5")
+        self.assertEqual(
+            output, "COALESCED: Requested re-run of ClassLockedSleep:seconds=5"
+        )
+        mock_run.assert_not_called()
+        self.assertEqual(
+            pid_file.rerun_file.read_content(), "ClassLockedSleep:seconds=5\n"
+        )
+
+    @override_cron_settings()
+    @mock.patch("cronman.cron_jobs.sleep.ClassLockedSleep.run")
+    @mock.patch(
+        "cronman.cron_jobs.sleep.ClassLockedSleep.coalesce_locked", True
+    )
+    def test_run_lock_coalesced_rerun(self, mock_run):
+        """Test for CronWorker.run method - re-run requested while
+        the lock was held is processed once in the same process.
+        """
+        worker = CronWorker()
+        pid_file = worker.get_pid_file(
+            ClassLockedSleep, "ClassLockedSleep", [], {}
+        )
+        pid_file.rerun_file.create("ClassLockedSleep:seconds=1")  # stale
+
+        def request_reruns(*args, **kwargs):
+            if mock_run.call_count == 1:
+                self.assertFalse(os.path.exists(pid_file.rerun_file.path))
+                pid_file.rerun_file.create("ClassLockedSleep:seconds=2")
+                pid_file.rerun_file.create("ClassLockedSleep:seconds=3")
+
+        mock_run.side_effect = request_reruns
+        output = worker.run("ClassLockedSleep")
+        self.assertEqual(
+            output,
+            "OK: Processed ClassLockedSleep\n"
+            "OK: Processed ClassLockedSleep:seconds=3",
+        )
+        self.assertEqual(
+            mock_run.call_args_list, [mock.call(), mock.call(seconds="3")]
+        )
+        self.assertFalse(os.path.exists(pid_file.rerun_file.path))
+        self.assertFalse(os.path.exists(pid_file.path))
+
+    @override_cron_settings()
+    @mock.patch("cronman.cron_jobs.sleep.ClassLockedSleep.run")
+    @mock.patch(
+        "cronman.cron_jobs.sleep.ClassLockedSleep.coalesce_locked", True
+    )
+    def test_run_lock_coalesced_rerun_before_release(self, mock_run):
+        """Test for CronWorker.run method - re-run requested after the last
+        check for requests, but before the lock was released, is not lost.
+        """
+        worker = CronWorker()
+        pid_file = worker.get_pid_file(
+            ClassLockedSleep, "ClassLockedSleep", [], {}
+        )
+        rerun_file_class = type(pid_file.rerun_file)
+        pop_all = rerun_file_class.pop_all
+        requested = []
+
+        def pop_all_and_request(rerun_file):
+            job_specs = pop_all(rerun_file)
+            if not job_specs and not requested:
+                requested.append(True)
+                rerun_file.create("ClassLockedSleep:seconds=2")
+            return job_specs
+
+        with mock.patch.object(
+            rerun_file_class, "pop_all", pop_all_and_request
+        ):
+            output = worker.run("ClassLockedSleep")
+        self.assertEqual(
+            output,
+            "OK: Processed ClassLockedSleep\n"
+            "OK: Processed ClassLockedSleep:seconds=2",
+        )
+        self.assertFalse(os.path.exists(pid_file.rerun_file.path))
+        self.assertFalse(os.path.exists(pid_file.path))
+
+    @override_cron_settings()
+    @mock.patch("cronman.cron_jobs.sleep.ClassLockedSleep.run")
+    @mock.patch(
+        "cronman.cron_jobs.sleep.ClassLockedSleep.coalesce_locked", True
+    )
+    def test_run_lock_coalesced_cron_tasks(self, mock_run):
+        """Test for CronWorker.run method - CronTasks of coalesced re-run
+        requests get status of the run which satisfied them.
+        """
+        cron_tasks = [
+            CronTask.objects.run_now("ClassLockedSleep", params=params)[0]
+            for params in ("seconds=1", "seconds=2", "seconds=3")
+        ]
+        for cron_task in cron_tasks:
+            cron_task.mark_as_queued()
+        worker = CronWorker()
+        pid_file = worker.get_pid_file(
+            ClassLockedSleep, "ClassLockedSleep", [], {}
+        )
+        pid_file.rerun_file.create(cron_tasks[0].job_spec())  # stale
+
+        def request_reruns(*args, **kwargs):
+            if mock_run.call_count == 1:
+                pid_file.rerun_file.create(cron_tasks[1].job_spec())
+                pid_file.rerun_file.create(cron_tasks[2].job_spec())
+
+        mock_run.side_effect = request_reruns
+        worker.run("ClassLockedSleep")
+        self.assertEqual(
+            mock_run.call_args_list, [mock.call(), mock.call(seconds="3")]
+        )
+        for cron_task in cron_tasks:
+            cron_task.refresh_from_db()
+            self.assertEqual(cron_task.status, CronTaskStatus.FINISHED)
+
+    @override_cron_settings()
+    @mock.patch("cronman.cron_jobs.sleep.SlotsLockedSleep.run")
+    def test_run_lock_slots(self, mock_run):
+        """Test for CronWorker.run method - lock by slots"""
+        pid_file_1 = lock_pid_file("SlotsLockedSleep:seconds=1")
+        self.addCleanup(pid_file_1.release)
+        self.assertEqual(pid_file_1.name, "SlotsLockedSleep_slot1")
+        output = CronWorker().run("SlotsLockedSleep:seconds=2")
+        self.assertIn("OK: Processed SlotsLockedSleep:seconds=2", output)
+        mock_run.assert_called_once_with(seconds="2")
+        pid_file_2 = lock_pid_file("SlotsLockedSleep:seconds=3")
+        self.addCleanup(pid_file_2.release)
+        self.assertEqual(pid_file_2.name, "SlotsLockedSleep_slot2")
+        self.assertTrue(pid_file_2.is_locked())
+        output = CronWorker().run("SlotsLockedSleep:seconds=4")
+        self.assertIn(
+            'CronWorkerLocked: Unable to start "SlotsLockedSleep:seconds=4"',
+            output,
+        )
+        mock_run.assert_called_once_with(seconds="2")
+        output = CronWorker().status("SlotsLockedSleep")
+        self.assertIn("SlotsLockedSleep_slot1\tALIVE", output)
+        self.assertIn("SlotsLockedSleep_slot2\tALIVE", output)
+
+    @override_cron_settings()
+    @mock.patch("cronman.cron_jobs.sleep.ClassLockedSleep.run")
+    @mock.patch(
+        "cronman.cron_jobs.sleep.ClassLockedSleep.lock_scope", "cluster"
+    )
+    @mock.patch(
+        "cronman.worker.cluster_lock.CronWorkerClusterLock.redis_client",
+        new_callable=mock.PropertyMock,
+    )
+    def test_run_lock_cluster(self, mock_redis, mock_run):
+        """Test for CronWorker.run method - cluster lock acquired,
+        fencing token passed to the job.
+        """
+        mock_redis.return_value.incr.return_value = 42
+        mock_redis.return_value.set.return_value = True
+        tokens = []
+        mock_run.side_effect = lambda *a, **kw: tokens.append(
+            worker.cluster_lock.token
+        )
+        worker = CronWorker()
+        output = worker.run("ClassLockedSleep")
+        self.assertIn("OK: Processed ClassLockedSleep", output)
+        self.assertEqual(tokens, [42])
+        mock_redis.return_value.set.assert_called_once()
+        self.assertEqual(
+            mock_redis.return_value.set.call_args[0][0],
+            "cron_lock:ClassLockedSleep",
+        )
+        mock_redis.return_value.eval.assert_called_once()  # release
+
+    @override_cron_settings()
+    @mock.patch("cronman.cron_jobs.sleep.ClassLockedSleep.run")
+    @mock.patch(
+        "cronman.cron_jobs.sleep.ClassLockedSleep.lock_scope", "cluster"
+    )
+    @mock.patch(
+        "cronman.worker.cluster_lock.CronWorkerClusterLock.redis_client",
+        new_callable=mock.PropertyMock,
+    )
+    def test_run_lock_cluster_taken(self, mock_redis, mock_run):
+        """Test for CronWorker.run method - cluster lock held by other host"""
+        mock_redis.return_value.incr.return_value = 43
+        mock_redis.return_value.set.return_value = None
+        mock_redis.return_value.get.return_value = (
+            '{"token": 42, "host": "node-2", "pid": 1001}'
+        )
+        worker = CronWorker()
+        output = worker.run("ClassLockedSleep")
+        self.assertIn(
+            'CronWorkerLocked: Unable to start "ClassLockedSleep", '
+            "because similar process is already running in the cluster "
+            "(host node-2, PID 1001, token 42).",
+            output,
+        )
+        mock_run.assert_not_called()
+        pid_file = worker.get_pid_file(
+            ClassLockedSleep, "ClassLockedSleep", [], {}
+        )
+        self.assertFalse(pid_file.is_locked())
+
+    @override_cron_settings()
+    @mock.patch("cronman.cron_jobs.sleep.ClassLockedSleep.run")
+    @mock.patch(
+        "cronman.cron_jobs.sleep.ClassLockedSleep.lock_scope", "cluster"
+    )
+    @mock.patch(
+        "cronman.worker.cluster_lock.CronWorkerClusterLock.redis_client",
+        new_callable=mock.PropertyMock,
+    )
+    def test_run_lock_cluster_no_redis(self, mock_redis, mock_run):
+        """Test for CronWorker.run method - cluster lock not acquired
+        due to Redis error (reported as error, not as running job)
+        """
+        mock_redis.return_value.incr.side_effect = redis.ConnectionError(
+            "Connection refused."
+        )
+        worker = CronWorker()
+        output = worker.run("ClassLockedSleep")
+        self.assertEqual(
+            output,
+            "CronWorkerClusterLockError: Cluster lock ClassLockedSleep: "
+            "acquire FAILED (Redis error): Connection refused.\n",
+        )
+        mock_run.assert_not_called()
+        pid_file = worker.get_pid_file(
+            ClassLockedSleep, "ClassLockedSleep", [], {}
+        )
+        self.assertFalse(pid_file.is_locked())
+
+    @override_cron_settings()
+    @mock.patch("cronman.cron_jobs.sleep.ClassLockedSleep.run")
+    @mock.patch(
+        "cronman.cron_jobs.sleep.ClassLockedSleep.lock_scope", "cluster"
+    )
+    @mock.patch(
+        "cronman.worker.cluster_lock.CronWorkerClusterLock.redis_client",
+        new_callable=mock.PropertyMock,
+    )
+    def test_run_lock_cluster_lost(self, mock_redis, mock_run):
+        """Test for CronWorker.run method - cluster lock lost while
+        the job was running
+        """
+        mock_redis.return_value.incr.return_value = 42
+        mock_redis.return_value.set.return_value = True
+
+        def lose_lock(*args, **kwargs):
+            worker.cluster_lock.lost = True
+
+        mock_run.side_effect = lose_lock
+        worker = CronWorker()
+        output = worker.run("ClassLockedSleep")
+        self.assertEqual(
+            output,
+            "OK: Processed ClassLockedSleep\n"
+            'CronWorkerClusterLockError: Cluster lock of "ClassLockedSleep" '
+            "was lost while running, similar process may have been started "
+            "in the cluster (token 42).",
+        )
+
+    @override_cron_settings()
+    @mock.patch("cronman.cron_jobs.sleep.PersistentSleep.run")
+    def test_run_pid_file_v2(self, mock_run):
+        """Test for CronWorker.run method - PID file (v2) content"""
+        infos = []
+        worker = CronWorker()
+        pid_file = worker.get_pid_file(
+            worker.parse_job_spec_with_class("PersistentSleep")[3],
+            "PersistentSleep",
+            [],
+            {},
+        )
+        mock_run.side_effect = lambda *a, **kw: infos.append(
+            CronWorkerPIDFile.parse_info(pid_file.read_content())
+        )
+        worker.run("PersistentSleep:seconds=5")
+        info = infos[0]
+        self.assertEqual(info["version"], 2)
+        self.assertEqual(info["pid"], os.getpid())
+        self.assertEqual(info["job_spec"], "PersistentSleep:seconds=5")
+        self.assertAlmostEqual(
+            info["process_start_time"],
+            get_process_start_time(os.getpid()),
+            delta=1,
+        )
+        self.assertIn("started_at", info)
+        self.assertFalse(os.path.exists(pid_file.path))
+        self.assertFalse(os.path.exists(pid_file.job_spec_file.path))
+
+    def test_pid_file_parse_info(self):
+        """Test for CronWorkerPIDFile.parse_info method - v1 and v2"""
+        parse_info = CronWorkerPIDFile.parse_info
+        self.assertEqual(parse_info("1234"), {"version": 1, "pid": 1234})
+        self.assertEqual(parse_info(""), {"pid": None})
+        self.assertEqual(parse_info(None), {"pid": None})
+        self.assertEqual(
+            parse_info('{"version": 2, "pid": 1234, "job_spec": null}'),
+            {"version": 2, "pid": 1234, "job_spec": None},
+        )
+
+    @override_cron_settings()
+    def test_pid_file_acquire_release(self):
+        """Test for CronWorkerPIDFile lock acquire/release methods"""
+        pid_file_1 = lock_pid_file("ClassLockedSleep")
+        pid_file_2 = CronWorkerPIDFile(pid_file_1.data_dir, pid_file_1.name)
+        self.assertEqual(pid_file_1.pid, os.getpid())
+        self.assertTrue(pid_file_2.is_locked())
+        self.assertFalse(pid_file_2.acquire())
+        pid_file_1.release()
+        self.assertFalse(pid_file_2.is_locked())
+        self.assertTrue(pid_file_2.acquire())
+        pid_file_2.release()
+        self.assertFalse(os.path.exists(pid_file_2.path))
+
+    # Phase timing
+
+    @override_cron_settings()
+    @mock.patch("cronman.cron_jobs.sleep.Sleep.run")
+    def test_run_phase_timing(self, mock_run):
+        """Test for CronWorker.run method - phase timing is logged
+        and stored in the stats file.
+        """
+        worker = CronWorker()
+        worker.logger = mock.MagicMock()
+        worker.run("Sleep:seconds=1")
+        message = worker.logger.info.call_args[0][0]
+        self.assertIn('Processing "Sleep:seconds=1" finished after', message)
+        self.assertIn("run=", message)
+        records = worker.get_stats_file("Sleep").records
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["job_spec"], "Sleep:seconds=1")
+        self.assertTrue(records[0]["ok"])
+        self.assertEqual(
+            list(records[0]["phases"])[-7:],
+            [
+                "import",
+                "cron_task",
+                "lock",
+                "before_start",
+                "run",
+                "notify",
+                "teardown",
+            ],
+        )
+
+    @override_cron_settings()
+    @mock.patch("cronman.cron_jobs.sleep.Sleep.run", side_effect=ValueError)
+    def test_run_stats_max_records(self, mock_run):
+        """Test for CronWorker.run method - stats file keeps only
+        most recent records.
+        """
+        worker = CronWorker()
+        stats_file = worker.get_stats_file("Sleep")
+        stats_file.max_records = 2
+        with mock.patch.object(worker, "get_stats_file", lambda n: stats_file):
+            for i in range(3):
+                worker.run("Sleep:{}".format(i))
+        records = worker.get_stats_file("Sleep").records
+        self.assertEqual(
+            [r["job_spec"] for r in records], ["Sleep:1", "Sleep:2"]
+        )
+        self.assertFalse(records[-1]["ok"])
+
+    @override_cron_settings()
+    def test_stats_concurrent_updates(self):
+        """Test for CronWorkerStatsFile.add method - concurrent updates
+        (separate file objects, as in separate workers) are not lost
+        """
+        worker = CronWorker()
+
+        def add_records(thread_number):
+            for i in range(10):
+                stats_file = worker.get_stats_file("Sleep")
+                stats_file.max_records = 100
+                stats_file.add(
+                    {"job_spec": "Sleep:{},{}".format(thread_number, i)}
+                )
+
+        threads = [
+            threading.Thread(target=add_records, args=(n,)) for n in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(worker.get_stats_file("Sleep").records), 40)
+
+    @override_cron_settings(CRONMAN_DATA_DIR_DURABILITY="fsync")
+    @mock.patch("cronman.cron_jobs.sleep.Sleep.run")
+    def test_run_durability_fsync(self, mock_run):
+        """Test for CronWorker.run method - data directory writes flushed
+        to disk
+        """
+        with mock.patch(
+            "cronman.worker.worker_file.os.fsync", wraps=os.fsync
+        ) as mock_fsync:
+            with mock.patch(
+                "cronman.worker.worker_file.os.rename", wraps=os.rename
+            ) as mock_rename:
+                CronWorker().run("ClassLockedSleep:seconds=1")
+        self.assertEqual(mock_fsync.call_count, 2)  # PID file, stats
+        self.assertEqual(self._get_renamed_files(mock_rename), [])
+
+    @override_cron_settings(CRONMAN_DATA_DIR_DURABILITY="atomic")
+    @mock.patch("cronman.cron_jobs.sleep.Sleep.run")
+    def test_run_durability_atomic(self, mock_run):
+        """Test for CronWorker.run method - data directory files replaced
+        atomically, without flushing to disk
+        """
+        with mock.patch(
+            "cronman.worker.worker_file.os.fsync", wraps=os.fsync
+        ) as mock_fsync:
+            with mock.patch(
+                "cronman.worker.worker_file.os.rename", wraps=os.rename
+            ) as mock_rename:
+                CronWorker().run("ClassLockedSleep:seconds=1")
+        mock_fsync.assert_not_called()
+        self.assertEqual(
+            self._get_renamed_files(mock_rename), ["ClassLockedSleep.stats"]
+        )
+        records = CronWorker().get_stats_file("ClassLockedSleep").records
+        self.assertEqual(len(records), 1)
+        self.assertEqual(
+            sorted(os.listdir(app_settings.CRONMAN_DATA_DIR)),
+            [
+                "ClassLockedSleep.stats",
+                "ClassLockedSleep.stats.lock",
+                "workers.table",
+            ],
+        )
+
+    @override_cron_settings(CRONMAN_DATA_DIR_DURABILITY="none")
+    @mock.patch("cronman.cron_jobs.sleep.Sleep.run")
+    def test_run_durability_none(self, mock_run):
+        """Test for CronWorker.run method - data directory writes not flushed
+        to disk
+        """
+        with mock.patch(
+            "cronman.worker.worker_file.os.fsync", wraps=os.fsync
+        ) as mock_fsync:
+            with mock.patch(
+                "cronman.worker.worker_file.os.rename", wraps=os.rename
+            ) as mock_rename:
+                CronWorker().run("ClassLockedSleep:seconds=1")
+        mock_fsync.assert_not_called()
+        self.assertEqual(self._get_renamed_files(mock_rename), [])
+
+    @override_cron_settings(CRONMAN_DATA_DIR_DURABILITY="async")
+    def test_run_durability_invalid(self):
+        """Test for CronWorker.run method - invalid durability mode"""
+        with self.assertRaisesMessage(
+            ImproperlyConfigured, "Invalid CRONMAN_DATA_DIR_DURABILITY: async."
+        ):
+            CronWorker().run("ClassLockedSleep:seconds=1")
+
+    @staticmethod
+    def _get_renamed_files(mock_rename):
+        """Names of files replaced through `os.rename`
+        (except claimed re-run requests)
+        """
+        return [
+            os.path.basename(call[0][1])
+            for call in mock_rename.call_args_list
+            if not call[0][0].endswith(".rerun")
+        ]
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+# vi:si:et:sw=4:sts=4:ts=4
+
+from __future__ import unicode_literals
+
+from django.core.management import call_command
+
+from unittest import mock
+
+from cronman.exceptions import CronWorkerInvalidParams
+from cronman.tests.base import (
+    BaseCronTestCase,
+    create_pid_file,
+    lock_pid_file,
+    override_cron_settings,
+    patch_kill,
+    patch_proc,
+    patch_ps,
+)
+from cronman.worker import CronWorker
+from cronman.worker.worker_orphans import (
+    CronWorkerOrphanList,
+    parse_worker_cmdline,
+)
+
+
+def worker_cmdline(job_spec):
+    """Command line of worker process started by Cron Spawner"""
+    return ["python", "manage.py", "cron_worker", "run", job_spec]
+
+
+class CronWorkerOrphanListTestCase(BaseCronTestCase):
+    """Tests for CronWorkerOrphanList class and `CronWorker.orphans`"""
+
+    def test_parse_worker_cmdline(self):
+        """Test for parse_worker_cmdline function"""
+        self.assertEqual(
+            parse_worker_cmdline(worker_cmdline("Sleep:seconds=1")),
+            "Sleep:seconds=1",
+        )
+        self.assertIsNone(
+            parse_worker_cmdline(["python", "manage.py", "cron_worker"])
+        )
+        self.assertIsNone(
+            parse_worker_cmdline(
+                ["python", "manage.py", "cron_worker", "status", "Sleep"]
+            )
+        )
+        self.assertIsNone(parse_worker_cmdline([]))
+
+    @override_cron_settings()
+    @patch_proc(
+        {
+            2001: worker_cmdline("ClassLockedSleep:seconds=10"),
+            2002: worker_cmdline("ParamsLockedSleep:seconds=10"),
+            2003: ["python", "manage.py", "runserver"],
+        }
+    )
+    def test_status(self):
+        """Test for CronWorker.orphans method - listing only,
+        processes with PID files and other processes are skipped
+        """
+        create_pid_file("ParamsLockedSleep:seconds=10", 2002)
+        output = CronWorker().orphans()
+        self.assertIn("ClassLockedSleep:seconds=10\tORPHAN\t2001\n", output)
+        self.assertNotIn("2002", output)
+        self.assertNotIn("2003", output)
+        self.assertIn("TOTAL: 1", output)
+
+    @override_cron_settings()
+    @patch_proc({2001: worker_cmdline("ClassLockedSleep:seconds=10")}, age=1)
+    def test_status_young_process(self):
+        """Test for CronWorker.orphans method - recently started process
+        (may be waiting for the lock) is not an orphan
+        """
+        self.assertEqual(
+            CronWorker().orphans(),
+            "ORPHANS:\nNo orphaned worker process(es) found.\n",
+        )
+
+    @override_cron_settings()
+    @patch_proc(
+        {2001: worker_cmdline("ClassLockedSleep:seconds=10")},
+        data_dir="/other/project",
+    )
+    def test_status_other_data_dir(self):
+        """Test for CronWorker.orphans method - process of other project
+        (different data directory) is not an orphan
+        """
+        self.assertEqual(CronWorkerOrphanList(CronWorker()).find(), [])
+
+    @override_cron_settings()
+    @patch_proc(
+        {
+            2001: worker_cmdline("PersistentSleep:seconds=10"),
+            2002: worker_cmdline("UnknownJob:seconds=10"),
+        }
+    )
+    @patch_ps(active_pids=[2001])
+    @patch_kill(active_pids=[2001])
+    def test_adopt(self):
+        """Test for CronWorker.orphans method - PID file created for
+        orphaned process, unknown cron jobs ignored
+        """
+        worker = CronWorker()
+        output = worker.orphans("adopt")
+        self.assertIn("PersistentSleep:seconds=10\tADOPTED\t2001\n", output)
+        self.assertIn("UnknownJob:seconds=10\tIGNORED\t2002\n", output)
+        pid_file = worker.get_worker_pid_list().files[0]
+        self.assertEqual(pid_file.name, "PersistentSleep")
+        self.assertEqual(pid_file.pid, 2001)
+        self.assertEqual(
+            pid_file.info["job_spec"], "PersistentSleep:seconds=10"
+        )
+        self.assertTrue(pid_file.is_locked())
+        # Adopted process is no longer an orphan:
+        self.assertNotIn("2001", worker.orphans())
+
+    @override_cron_settings()
+    @patch_proc({2001: worker_cmdline("ClassLockedSleep:seconds=10")})
+    @patch_ps(active_pids=[1003, 2001])
+    @patch_kill(active_pids=[1003, 2001])
+    def test_adopt_locked(self):
+        """Test for CronWorker.orphans method - orphaned process terminated
+        because its lock is held by other worker
+        """
+        create_pid_file("ClassLockedSleep:seconds=10", 1003)
+        with mock.patch(
+            "cronman.worker.worker_orphans.ProcessManager.terminate"
+        ) as mock_terminate:
+            output = CronWorker().orphans("adopt")
+        self.assertIn("ClassLockedSleep:seconds=10\tTERMED\t2001\n", output)
+        mock_terminate.assert_called_once_with()
+
+    @override_cron_settings()
+    @patch_proc({2001: worker_cmdline("ClassLockedSleep:seconds=10")})
+    @patch_ps(active_pids=[2001])
+    @patch_kill(active_pids=[2001])
+    def test_adopt_flock(self):
+        """Test for CronWorker.orphans method - PID file locked (`flock`)
+        by new worker is not overwritten by adoption
+        """
+        pid_file = lock_pid_file("ClassLockedSleep:seconds=10")
+        self.addCleanup(pid_file.release)
+        with mock.patch(
+            "cronman.worker.worker_orphans.ProcessManager.terminate"
+        ) as mock_terminate:
+            output = CronWorker().orphans("adopt")
+        self.assertIn("ClassLockedSleep:seconds=10\tTERMED\t2001\n", output)
+        mock_terminate.assert_called_once_with()
+        self.assertEqual(
+            pid_file.parse_info(pid_file.read_content())["pid"], pid_file.pid
+        )
+
+    @override_cron_settings()
+    @patch_proc({2001: worker_cmdline("ClassLockedSleep:seconds=10")})
+    def test_kill_command(self):
+        """Test for `cron_worker orphans kill` command"""
+        with mock.patch(
+            "cronman.worker.worker_orphans.ProcessManager.terminate"
+        ) as mock_terminate:
+            output = call_command("cron_worker", "orphans", "kill")
+        self.assertIn("ClassLockedSleep:seconds=10\tTERMED\t2001\n", output)
+        mock_terminate.assert_called_once_with()
+
+    @override_cron_settings()
+    def test_invalid_action(self):
+        """Test for CronWorker.orphans method - invalid action"""
+        with self.assertRaisesMessage(
+            CronWorkerInvalidParams, 'Invalid action "foo".'
+        ):
+            CronWorker()._orphans("foo")
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# vi:si:et:sw=4:sts=4:ts=4
+
+from __future__ import unicode_literals
+
+import io
+import os
+
+from django.core.management import call_command
+
+from unittest import mock
+
+from cronman.config import app_settings
+from cronman.exceptions import CronWorkerInvalidParams
+from cronman.tests.base import (
+    BaseCronTestCase,
+    create_pid_file,
+    override_cron_settings,
+)
+from cronman.worker import CronWorker
+from cronman.worker.worker_top import CronWorkerTop, DirectoryWatcher
+
+
+class CronWorkerTopTestCase(BaseCronTestCase):
+    """Tests for CronWorkerTop class and `CronWorker.top` method"""
+
+    @override_cron_settings()
+    def test_top(self):
+        """Test for CronWorker.top method - single frame"""
+        create_pid_file("ClassLockedSleep:seconds=10")
+        worker = CronWorker()
+        for duration in (10.0, 20.0, 600.0):
+            worker.get_stats_file("ClassLockedSleep").add(
+                {"ok": True, "duration": duration}
+            )
+        worker.get_stats_file("ClassLockedSleep").add(
+            {"ok": False, "duration": 1.0}
+        )
+        output = worker.top("rss")
+        lines = output.splitlines()
+        self.assertEqual(lines[0], "TOP (sorted by rss):")
+        self.assertEqual(lines[1], CronWorkerTop.HEADER)
+        self.assertEqual(len(lines), 3)
+        columns = lines[2].split("\t")
+        self.assertEqual(columns[:2], ["ClassLockedSleep", str(os.getpid())])
+        self.assertTrue(columns[2].endswith("%"))
+        self.assertTrue(columns[3].endswith(" MB"))
+        self.assertEqual(columns[5], "0:00:20")  # median of successful runs
+        self.assertEqual(columns[8], "-")  # worker_cpu_priority
+
+    @override_cron_settings()
+    @mock.patch(
+        "cronman.cron_jobs.sleep.ClassLockedSleep.worker_cpu_priority", 10
+    )
+    def test_top_live(self):
+        """Test for CronWorker.top method - refreshed frames"""
+        create_pid_file("ClassLockedSleep:seconds=10")
+        stdout = io.StringIO()
+        output = CronWorker().top(interval=0, iterations=2, stdout=stdout)
+        self.assertEqual(output, "")
+        frames = stdout.getvalue().split(CronWorker.CLEAR_SCREEN)[1:]
+        self.assertEqual(len(frames), 2)
+        for frame in frames:
+            self.assertTrue(frame.startswith("TOP (sorted by cpu):\n"))
+            self.assertTrue(frame.splitlines()[2].endswith("\t10"))
+
+    @override_cron_settings()
+    def test_top_no_workers(self):
+        """Test for CronWorker.top method - no workers"""
+        self.assertEqual(
+            CronWorker().top(),
+            "TOP (sorted by cpu):\n{}\nNo PID file(s) found.\n".format(
+                CronWorkerTop.HEADER
+            ),
+        )
+
+    @override_cron_settings()
+    def test_top_command(self):
+        """Test for `cron_worker top` command - single frame"""
+        create_pid_file("ClassLockedSleep:seconds=10")
+        output = call_command("cron_worker", "top", "name", iterations=1)
+        self.assertTrue(output.startswith("TOP (sorted by name):\n"))
+        self.assertIn("ClassLockedSleep\t{}\t".format(os.getpid()), output)
+
+    def test_invalid_sort_key(self):
+        """Test for CronWorkerTop class - invalid sort key"""
+        with self.assertRaisesMessage(
+            CronWorkerInvalidParams, 'Invalid sort key "foo".'
+        ):
+            CronWorkerTop(app_settings.CRONMAN_DATA_DIR, "foo")
+
+    def test_get_cron_job_name(self):
+        """Test for CronWorkerTop.get_cron_job_name method"""
+        self.assertEqual(
+            CronWorkerTop.get_cron_job_name("Sleep_0123456789"), "Sleep"
+        )
+        self.assertEqual(
+            CronWorkerTop.get_cron_job_name("SlotsLockedSleep_slot1"),
+            "SlotsLockedSleep",
+        )
+        self.assertIsNone(CronWorkerTop.get_cron_job_name("Unknown"))
+
+    @override_cron_settings()
+    def test_directory_watcher(self):
+        """Test for DirectoryWatcher class - wakes up on new file"""
+        os.makedirs(app_settings.CRONMAN_DATA_DIR)
+        watcher = DirectoryWatcher(app_settings.CRONMAN_DATA_DIR)
+        try:
+            if watcher.fd is None:
+                self.skipTest("inotify is not available")
+            self.assertFalse(watcher.wait(0))
+            create_pid_file("ClassLockedSleep:seconds=10")
+            self.assertTrue(watcher.wait(1))
+            self.assertFalse(watcher.wait(0))
+        finally:
+            watcher.close()
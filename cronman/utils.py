@@ -19,6 +19,7 @@ from django.utils.functional import cached_property
 from dateutil.parser import parse as dateutil_parse
 
 from cronman.config import app_settings
+from cronman.taxonomies import LockScope
 
 MYPY = False
 if MYPY:
@@ -255,6 +256,16 @@ def is_cron_process_resumed():
     return bool_param(os.environ.get("CRON_PROCESS_RESUMED"), default=False)
 
 
+def get_cron_process_resume_attempt():
+    """Returns number of consecutive resumes of current process
+    (0 if it wasn't resumed)
+    """
+    try:
+        return int(os.environ.get("CRON_PROCESS_RESUME_ATTEMPT") or 0)
+    except ValueError:
+        return 0
+
+
 def is_cron_job_running(cron_job_class, name=None, args=None, kwargs=None):
     """Returns True if cron job is running, False otherwise"""
     from .worker import CronWorker
@@ -266,14 +277,23 @@ def is_cron_job_running(cron_job_class, name=None, args=None, kwargs=None):
         args=args or [],
         kwargs=kwargs or {},
     )
-    return worker.pid_file_locked(pid_file, 1)
+    if worker.pid_file_locked(pid_file, 1):
+        return True
+    # Lock held by worker on other host:
+    if getattr(cron_job_class, "lock_scope", None) == LockScope.CLUSTER:
+        cluster_lock = worker.get_cluster_lock(cron_job_class, pid_file)
+        return bool(cluster_lock and cluster_lock.holder())
+    return False
 
 
 def spawn(*args, **kwargs):
     """Creates a subprocess that can survive process exit.
+    The subprocess starts a new session (and process group), so it can be
+    signalled along with its own children.
     Returns PID of the new process.
     Non-blocking call.
     """
+    kwargs.setdefault("start_new_session", True)
     kwargs["stdout"] = open(os.devnull, "wb")
     kwargs["stderr"] = subprocess.STDOUT
     return subprocess.Popen(args, **kwargs).pid
@@ -1,18 +1,34 @@
 # -*- coding: utf-8 -*-
 # vi:si:et:sw=4:sts=4:ts=4
 
-from cronman.worker.cron_job_info import CronJobClassList
-from cronman.worker.process_manager import ProcessManager
-from cronman.worker.signal_notifier import SignalNotifier
-from cronman.worker.worker import CronWorker
-from cronman.worker.worker_file import CronWorkerPIDFile
-from cronman.worker.worker_list import CronWorkerPIDList
+import sys
+from importlib import import_module
 
-__all__ = [
-    "CronJobClassList",
-    "CronWorker",
-    "CronWorkerPIDFile",
-    "CronWorkerPIDList",
-    "ProcessManager",
-    "SignalNotifier",
-]
+# Exports are imported lazily, so modules which don't need Django to be set
+# up (`worker_file`, `worker_list`, `process_manager`) can be used without it
+# (e.g. by `cronman-status`):
+EXPORTS = {
+    "CronJobClassList": "cronman.worker.cron_job_info",
+    "CronWorker": "cronman.worker.worker",
+    "CronWorkerPIDFile": "cronman.worker.worker_file",
+    "CronWorkerPIDList": "cronman.worker.worker_list",
+    "ProcessManager": "cronman.worker.process_manager",
+    "SignalNotifier": "cronman.worker.signal_notifier",
+}
+
+__all__ = sorted(EXPORTS)
+
+
+def __getattr__(name):
+    if name not in EXPORTS:
+        raise AttributeError(
+            "module {!r} has no attribute {!r}".format(__name__, name)
+        )
+    value = getattr(import_module(EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+if sys.version_info < (3, 7):  # No module `__getattr__` (PEP 562)
+    for _name in __all__:
+        __getattr__(_name)
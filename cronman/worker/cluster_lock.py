@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+# vi:si:et:sw=4:sts=4:ts=4
+
+from __future__ import unicode_literals
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+
+from django.utils.functional import cached_property
+
+from cronman.exceptions import CronWorkerClusterLockError, MissingDependency
+from cronman.redis_client import get_strict_redis
+from cronman.utils import config
+
+logger = logging.getLogger("cronman.command.cron_worker")
+
+# Extends the lease only if it's still held by given owner:
+RENEW_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Removes the lease only if it's still held by given owner:
+RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def get_redis_error_class():
+    """Retrieves base class of Redis errors"""
+    try:
+        from redis import RedisError
+    except ImportError:
+        raise MissingDependency(
+            "Unable to import redis. " "Cluster locks require this dependency."
+        )
+    return RedisError
+
+
+class CronWorkerClusterLock(object):
+    """Cluster-wide lock for Cron Worker (`lock_scope = "cluster"`):
+    a lease in Redis, renewed by background thread while the job is running.
+    Each acquisition gets a fencing token - number greater than tokens
+    of all previous owners of the lock.
+    """
+
+    KEY = "cron_lock:{name}"
+    TOKEN_KEY = "cron_lock:{name}:token"
+
+    def __init__(self, name, ttl=None, logger=logger):
+        self.name = name
+        self.ttl = ttl or int(config("CRONMAN_CLUSTER_LOCK_TTL"))
+        self.key = self.KEY.format(name=name)
+        self.token_key = self.TOKEN_KEY.format(name=name)
+        self.logger = logger
+        self.token = None  # fencing token
+        self.value = None
+        self.lost = False
+        self._stop_renewal = threading.Event()
+        self._renewal_thread = None
+
+    @cached_property
+    def redis_client(self):
+        """Redis client object (StrictRedis)"""
+        return get_strict_redis()
+
+    def acquire(self):
+        """Attempts to acquire the lock (non-blocking).
+        Returns True on success, False if lock is taken.
+        Raises CronWorkerClusterLockError if Redis is down.
+        """
+        redis_error_class = get_redis_error_class()
+        try:
+            token = self.redis_client.incr(self.token_key)
+            value = json.dumps(
+                {
+                    "token": token,
+                    "host": socket.gethostname(),
+                    "pid": os.getpid(),
+                }
+            )
+            acquired = self.redis_client.set(
+                self.key, value, nx=True, px=self.ttl * 1000
+            )
+        except redis_error_class as error:
+            raise CronWorkerClusterLockError(
+                "Cluster lock {}: acquire FAILED (Redis error): {}".format(
+                    self.name, error
+                )
+            )
+        if not acquired:
+            return False
+        self.token = token
+        self.value = value
+        self.lost = False
+        self._stop_renewal.clear()
+        self._renewal_thread = threading.Thread(
+            target=self._renew_periodically,
+            name="cluster-lock-renewal-{}".format(self.name),
+        )
+        self._renewal_thread.daemon = True
+        self._renewal_thread.start()
+        return True
+
+    def renew(self):
+        """Extends the lease, returns False if it's not held anymore"""
+        return bool(
+            self.redis_client.eval(
+                RENEW_SCRIPT, 1, self.key, self.value, self.ttl * 1000
+            )
+        )
+
+    def release(self):
+        """Stops the renewal and releases the lock"""
+        if self._renewal_thread:
+            self._stop_renewal.set()
+            self._renewal_thread.join()
+            self._renewal_thread = None
+        if self.value:
+            redis_error_class = get_redis_error_class()
+            try:
+                self.redis_client.eval(RELEASE_SCRIPT, 1, self.key, self.value)
+            except redis_error_class as error:  # lease will expire anyway
+                self.logger.warning(
+                    "Cluster lock {}: release FAILED: {}".format(
+                        self.name, error
+                    )
+                )
+        self.token = None
+        self.value = None
+
+    def holder(self):
+        """Retrieves information about current owner of the lock
+        (dict with host, pid, token) or None if lock is free.
+        """
+        redis_error_class = get_redis_error_class()
+        try:
+            value = self.redis_client.get(self.key)
+        except redis_error_class as error:
+            self.logger.warning(
+                "Cluster lock {}: GET FAILED: {}".format(self.name, error)
+            )
+            return None
+        return json.loads(value) if value else None
+
+    def _renew_periodically(self):
+        """Renews the lease until stopped (background thread).
+        Lease is considered lost when it's held by other owner or
+        could not be renewed (Redis errors) within TTL.
+        """
+        redis_error_class = get_redis_error_class()
+        renewed_at = time.time()
+        while not self._stop_renewal.wait(self.ttl / 3.0):
+            try:
+                renewed = self.renew()
+            except redis_error_class as error:  # retry in next round
+                self.logger.warning(
+                    "Cluster lock {}: renewal FAILED: {}".format(
+                        self.name, error
+                    )
+                )
+                renewed = time.time() - renewed_at < self.ttl
+            else:
+                renewed_at = time.time()
+            if not renewed:
+                self.lost = True
+                self.logger.error(
+                    "Cluster lock {}: lease lost (token {})!".format(
+                        self.name, self.token
+                    )
+                )
+                break
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# vi:si:et:sw=4:sts=4:ts=4
+
+from __future__ import unicode_literals
+
+import time
+from collections import OrderedDict
+
+from django.apps import apps
+
+from cronman.worker.process_manager import get_process_start_time
+
+
+class PhaseTimer(object):
+    """Measures duration of consecutive phases of worker process lifecycle"""
+
+    def __init__(self, start=None):
+        self.start = time.time() if start is None else start
+        self.last = self.start
+        self.phases = OrderedDict()
+
+    @classmethod
+    def from_process_start(cls):
+        """Creates a timer with boot phases measured from process start:
+        * `startup` - interpreter start, settings, app imports,
+        * `autodiscover` - discovery of cron jobs (`CronConfig.ready`),
+        * `setup` - remaining Django setup and command parsing.
+        """
+        process_start = get_process_start_time()
+        app_config = apps.get_app_config("cronman")
+        if process_start is None or app_config.ready_started is None:
+            return cls()  # boot phases can't be measured
+        timer = cls(start=process_start)
+        timer.mark("startup", app_config.ready_started)
+        timer.mark("autodiscover", app_config.ready_finished)
+        timer.mark("setup")
+        return timer
+
+    def mark(self, phase, now=None):
+        """Ends current phase"""
+        now = time.time() if now is None else now
+        self.phases[phase] = self.phases.get(phase, 0.0) + max(
+            now - self.last, 0.0
+        )
+        self.last = now
+
+    @property
+    def total(self):
+        """Total duration of all phases"""
+        return self.last - self.start
+
+    def as_dict(self):
+        """Phase durations as dictionary (machine-readable format)"""
+        return OrderedDict(
+            (phase, round(duration, 6))
+            for phase, duration in self.phases.items()
+        )
+
+    def format(self):
+        """Phase durations as text"""
+        return ", ".join(
+            "{}={:.3f}s".format(phase, duration)
+            for phase, duration in self.phases.items()
+        )
@@ -7,13 +7,325 @@ import errno
 import functools
 import logging
 import os
+import select
 import signal
 import subprocess
+import time
 
 from django.utils.encoding import force_text
 
 logger = logging.getLogger("cronman.command.cron_worker")
 
+PROC_DIR = "/proc"
+EXIT_POLL_INTERVAL = 0.05  # seconds, used when `pidfd_open` is not available
+
+
+def procfs_available():
+    """Checks if process information is available in `/proc`"""
+    return os.path.exists(os.path.join(PROC_DIR, "self", "stat"))
+
+
+def read_process_stat(pid):
+    """Reads fields of `/proc/<pid>/stat` following process name
+    (which may contain spaces), starting from field 3 (state).
+    Returns None if process does not exist.
+    """
+    try:
+        with open(os.path.join(PROC_DIR, str(pid), "stat"), "rb") as file_:
+            stat = force_text(file_.read())
+        return stat[stat.rindex(")") + 2 :].split()
+    except (IOError, OSError, ValueError):  # No such process
+        return None
+
+
+def get_process_states(pids):
+    """Retrieves states (as in `ps` STAT column: "R", "S", "Z", ...) of
+    given processes in one pass - from `/proc/<pid>/stat` files or, when
+    procfs is not available, from single `ps` call.
+    Returns dict {pid: state}, processes which don't exist are omitted.
+    """
+    pids = [pid for pid in pids if pid is not None]
+    states = {}
+    if not pids:
+        return states
+    if procfs_available():
+        for pid in pids:
+            fields = read_process_stat(pid)
+            if fields is not None:
+                states[pid] = fields[0]
+    else:
+        try:
+            output = force_text(
+                subprocess.check_output(
+                    [
+                        "ps",
+                        "-p",
+                        ",".join(str(pid) for pid in pids),
+                        "-o",
+                        "pid=,stat=",
+                    ]
+                )
+            )
+        except subprocess.CalledProcessError:  # None of processes exists
+            output = ""
+        for line in output.splitlines():
+            parts = line.split()
+            if len(parts) == 2:
+                states[int(parts[0])] = parts[1]
+    return states
+
+
+def get_process_start_time(pid="self"):
+    """Retrieves start time (UNIX timestamp) of given process
+    from `/proc/<pid>/stat`. Returns None when procfs is not available.
+    """
+    fields = read_process_stat(pid)
+    if fields is None:
+        return None
+    try:
+        with open(os.path.join(PROC_DIR, "uptime"), "rb") as file_:
+            uptime = float(file_.read().split()[0])
+        # Field 22 (starttime) has index 19:
+        start_uptime = float(fields[19]) / os.sysconf("SC_CLK_TCK")
+    except (IOError, OSError, ValueError, IndexError):
+        return None
+    return time.time() - (uptime - start_uptime)
+
+
+def get_process_cpu_time(pid):
+    """Retrieves CPU time (user + system, seconds) consumed by given process
+    from `/proc/<pid>/stat`. Returns None if not available.
+    """
+    fields = read_process_stat(pid)
+    if fields is None:
+        return None
+    # Fields 14 (utime) and 15 (stime) have indexes 11 and 12:
+    try:
+        ticks = int(fields[11]) + int(fields[12])
+    except (ValueError, IndexError):
+        return None
+    return float(ticks) / os.sysconf("SC_CLK_TCK")
+
+
+def get_process_io(pid):
+    """Retrieves number of bytes read from and written to storage by given
+    process from `/proc/<pid>/io`. Returns (None, None) if not available
+    (e.g. process owned by other user).
+    """
+    counters = {}
+    try:
+        with open(os.path.join(PROC_DIR, str(pid), "io"), "rb") as file_:
+            for line in force_text(file_.read()).splitlines():
+                key, _, value = line.partition(":")
+                counters[key] = int(value)
+    except (IOError, OSError, ValueError):
+        pass
+    return counters.get("read_bytes"), counters.get("write_bytes")
+
+
+def get_process_group(pid=0):
+    """Retrieves process group ID of given (or current) process if the group
+    leads a session (worker spawned with `start_new_session`), None
+    otherwise - signalling group shared with the caller (e.g. shell)
+    is not safe.
+    """
+    try:
+        pgid = os.getpgid(pid)
+        sid = os.getsid(pid)
+    except OSError:  # No such process
+        return None
+    return pgid if pgid == sid else None
+
+
+def get_process_cmdline(pid):
+    """Retrieves command line arguments of given process
+    from `/proc/<pid>/cmdline`. Returns None if not available.
+    """
+    try:
+        with open(os.path.join(PROC_DIR, str(pid), "cmdline"), "rb") as file_:
+            content = file_.read()
+    except (IOError, OSError):
+        return None
+    return [force_text(arg) for arg in content.split(b"\0")[:-1]]
+
+
+def get_process_environ(pid):
+    """Retrieves environment variables of given process
+    from `/proc/<pid>/environ`. Returns None if not available
+    (e.g. process owned by other user).
+    """
+    try:
+        with open(os.path.join(PROC_DIR, str(pid), "environ"), "rb") as file_:
+            content = file_.read()
+    except (IOError, OSError):
+        return None
+    environ = {}
+    for entry in content.split(b"\0"):
+        key, _, value = force_text(entry).partition("=")
+        if key:
+            environ[key] = value
+    return environ
+
+
+def get_all_pids():
+    """Retrieves PIDs of all processes from `/proc`
+    (empty list when procfs is not available)
+    """
+    if not procfs_available():
+        return []
+    return sorted(
+        int(entry) for entry in os.listdir(PROC_DIR) if entry.isdigit()
+    )
+
+
+def get_process_table():
+    """Retrieves parent -> child PIDs and process group -> member PIDs
+    mappings of all processes from `/proc` (single scan, may be shared
+    by several `get_process_descendants` calls).
+    Returns None when procfs is not available.
+    """
+    if not procfs_available():
+        return None
+    children = {}
+    groups = {}
+    for entry in os.listdir(PROC_DIR):
+        if not entry.isdigit():
+            continue
+        fields = read_process_stat(entry)
+        if fields is None:
+            continue
+        children.setdefault(int(fields[1]), []).append(int(entry))
+        groups.setdefault(int(fields[2]), []).append(int(entry))
+    return children, groups
+
+
+def get_process_descendants(pid, pgid=None, process_table=None):
+    """Retrieves PIDs of all descendants of given process and other members
+    of its process group (e.g. orphaned grandchildren) from `/proc`
+    (or from `process_table` retrieved earlier).
+    Returns None when procfs is not available.
+    """
+    if process_table is None:
+        process_table = get_process_table()
+        if process_table is None:
+            return None
+    children, groups = process_table
+    descendants = set()
+    stack = [pid]
+    while stack:
+        for child_pid in children.get(stack.pop(), []):
+            if child_pid not in descendants:
+                descendants.add(child_pid)
+                stack.append(child_pid)
+    if pgid is not None:
+        descendants.update(groups.get(pgid, []))
+    descendants.discard(pid)
+    return sorted(descendants)
+
+
+def get_process_rss(pid):
+    """Retrieves resident set size (bytes) of given process
+    from `/proc/<pid>/statm`. Returns None if not available.
+    """
+    try:
+        with open(os.path.join(PROC_DIR, str(pid), "statm"), "rb") as file_:
+            resident_pages = int(file_.read().split()[1])
+    except (IOError, OSError, ValueError, IndexError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def get_flock_inodes():
+    """Retrieves inode numbers of files locked with `flock` (by any
+    process) from `/proc/locks`, without taking any lock.
+    Devices are not compared - numbers reported there differ from `st_dev`
+    on some file systems (e.g. btrfs). Returns None if not available.
+    """
+    inodes = set()
+    try:
+        with open(os.path.join(PROC_DIR, "locks"), "rb") as file_:
+            for line in file_:
+                fields = line.split()
+                # Waiting processes are listed with "->" marker:
+                if len(fields) >= 6 and fields[1] == b"FLOCK":
+                    inodes.add(int(fields[5].split(b":")[-1]))
+    except (IOError, OSError, ValueError):
+        return None
+    return inodes
+
+
+def get_load_average():
+    """Retrieves system load averages (1, 5 and 15 minutes).
+    Returns None if not available.
+    """
+    try:
+        return os.getloadavg()
+    except (AttributeError, OSError):
+        return None
+
+
+def get_memory_info():
+    """Retrieves total and available system memory (bytes)
+    from `/proc/meminfo`. Returns None if not available.
+    """
+    values = {}
+    try:
+        with open(os.path.join(PROC_DIR, "meminfo"), "rb") as file_:
+            for line in file_:
+                fields = line.split()
+                if len(fields) >= 2:
+                    values[fields[0].rstrip(b":")] = int(fields[1]) * 1024
+    except (IOError, OSError, ValueError):
+        return None
+    if b"MemTotal" not in values or b"MemAvailable" not in values:
+        return None
+    return values[b"MemTotal"], values[b"MemAvailable"]
+
+
+def open_pidfd(pid):
+    """Opens process file descriptor (Linux 5.3+, Python 3.9+) which becomes
+    readable when the process exits. Returns None if not supported.
+    """
+    pidfd_open = getattr(os, "pidfd_open", None)
+    if pidfd_open is None or pid is None:
+        return None
+    try:
+        return pidfd_open(pid)
+    except (OSError, ValueError):  # No such process or not supported
+        return None
+
+
+def wait_for_exit(processes, timeout):
+    """Waits up to `timeout` seconds until all given processes (ProcessManager
+    instances) are gone. Exits are awaited on `pidfd_open` descriptors,
+    processes without descriptor are polled.
+    Returns list of processes which are still alive.
+    """
+    deadline = time.time() + timeout
+    pidfds = {}
+    poll = select.poll()
+    for process in processes:
+        fd = open_pidfd(process.pid)
+        if fd is not None:
+            pidfds[fd] = process
+            poll.register(fd, select.POLLIN)
+    polling_only = len(pidfds) < len(processes)
+    try:
+        pending = processes
+        while True:
+            alive = ProcessManager.alive_many(pending)
+            pending = [process for process in pending if alive[process.pid]]
+            remaining = deadline - time.time()
+            if not pending or remaining <= 0:
+                return pending
+            if polling_only:
+                remaining = min(remaining, EXIT_POLL_INTERVAL)
+            for fd, _ in poll.poll(remaining * 1000):
+                poll.unregister(fd)
+    finally:
+        for fd in pidfds:
+            os.close(fd)
+
 
 def pid_required(otherwise):
     """Decorator for ProcessManager methods to provide alternative result
@@ -39,15 +351,22 @@ class ProcessManager(object):
     signals.
     """
 
-    def __init__(self, pid):
+    start_time_tolerance = 1.0  # seconds
+
+    def __init__(self, pid, start_time=None, pgid=None):
         self.pid = pid
+        self.start_time = start_time  # to detect reused PIDs
+        self.pgid = pgid  # process group of the session started by spawn
         self.logger = logger
 
     @pid_required(otherwise=False)  # Same as `errno.ESRCH`
-    def _kill(self, sig):
-        """Sends signal to the process"""
+    def _kill(self, sig, group=False):
+        """Sends signal to the process (or its whole process group)"""
         try:
-            os.kill(self.pid, sig)
+            if group and self.owns_group():
+                os.killpg(self.pgid, sig)
+            else:
+                os.kill(self.pid, sig)
         except OSError as e:
             if e.errno == errno.ESRCH:
                 result = False
@@ -58,44 +377,96 @@ class ProcessManager(object):
         return result
 
     def exists(self):
-        """Check if PID is assigned to existing process"""
-        return self._kill(0)
+        """Check if PID is assigned to existing process
+        (started at `start_time`, if known)
+        """
+        result = self._kill(0)
+        if result and self.reused():
+            result = False
+        return result
+
+    def reused(self):
+        """Checks if PID has been reused by other process
+        (start time doesn't match)
+        """
+        if self.start_time is None:
+            return False
+        start_time = get_process_start_time(self.pid)
+        return (
+            start_time is not None
+            and abs(start_time - self.start_time) > self.start_time_tolerance
+        )
 
     def alive(self):
         """Check if PID is assigned to existing ALIVE process"""
-        process_exists = self.exists()
-        if process_exists:
-            if "Z" in self.status():
-                self.logger.warning(
+        return self.alive_many([self])[self.pid]
+
+    @staticmethod
+    def alive_many(processes):
+        """Checks if ProcessManagers' PIDs are assigned to existing ALIVE
+        processes, reading process states in one pass.
+        Returns dict {pid: True/False/None (no access)}.
+        """
+        result = {}
+        existing_pids = []
+        for process in processes:
+            pid = process.pid
+            result[pid] = process.exists()  # False or None (no access)
+            if result[pid]:
+                existing_pids.append(pid)
+        states = get_process_states(existing_pids)
+        for pid in existing_pids:
+            if "Z" in states.get(pid, ""):
+                logger.warning(
                     "PID {} belongs to zombie process. "
                     "This means that parent process is still alive, while "
                     "child process have been killed. This is OK during tests, "
-                    "but should never happen in real life.".format(self.pid)
+                    "but should never happen in real life.".format(pid)
                 )
-                is_alive = False
-            else:
-                is_alive = True
-        else:
-            is_alive = process_exists  # False or None (no access)
-        return is_alive
+                result[pid] = False
+        return result
+
+    def owns_group(self):
+        """Checks if the process is still a member of its own process group
+        (other than group of current process), so the group can be signalled
+        """
+        if self.pgid is None or self.pgid == os.getpgid(0):
+            return False
+        try:
+            return os.getpgid(self.pid) == self.pgid
+        except OSError:  # No such process
+            return False
 
     def terminate(self):
-        """Terminates the process"""
-        return self._kill(signal.SIGTERM)
+        """Terminates the process and its process group"""
+        return self._kill(signal.SIGTERM, group=True)
 
     def kill(self):
-        """Kills the process"""
-        return self._kill(signal.SIGKILL)
+        """Kills the process and its process group"""
+        return self._kill(signal.SIGKILL, group=True)
+
+    @pid_required(otherwise=None)
+    def descendants(self, process_table=None):
+        """Retrieves PIDs of processes started by the process
+        (None if not available), optionally from `process_table`
+        (see `get_process_table`)
+        """
+        pgid = self.pgid if self.owns_group() else None
+        return get_process_descendants(self.pid, pgid, process_table)
+
+    @pid_required(otherwise=None)
+    def memory_usage(self, descendants=None):
+        """Retrieves total RSS (bytes) of the process and its descendants
+        (None if not available)
+        """
+        if descendants is None:
+            descendants = self.descendants() or []
+        sizes = [get_process_rss(pid) for pid in [self.pid] + descendants]
+        if sizes[0] is None:
+            return None
+        return sum(size for size in sizes if size is not None)
 
     @pid_required(otherwise="")
     def status(self):
-        """Retrieves status of the process using `ps` command"""
-        try:
-            stat = force_text(
-                subprocess.check_output(
-                    ["ps", "-p", str(self.pid), "-o", "stat="]
-                ).strip()
-            )
-        except subprocess.CalledProcessError:
-            stat = ""
-        return stat
+        """Retrieves status of the process (from `/proc` or `ps` command)"""
+        return get_process_states([self.pid]).get(self.pid, "")
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+# vi:si:et:sw=4:sts=4:ts=4
+"""`cronman-status` - lists Cron Worker processes (same as
+`cron_worker status`) without setting up Django, so it's cheap enough
+for monitoring agents and health checks.
+
+Exit codes:
+    0 - OK, all listed workers are alive (or there are none),
+    1 - dead PID files found (workers died without cleanup),
+    2 - no alive worker matches given job spec or PID,
+    3 - status could not be determined (e.g. missing data directory).
+"""
+
+from __future__ import print_function, unicode_literals
+
+import argparse
+import json
+import os
+import re
+import sys
+
+EXIT_OK = 0
+EXIT_DEAD = 1
+EXIT_NOT_RUNNING = 2
+EXIT_UNKNOWN = 3
+
+
+def configure_settings():
+    """Configures Django settings with defaults, unless settings module
+    is given - settings are only read, Django is not set up.
+    """
+    from django.conf import settings
+
+    if not settings.configured and not os.environ.get(
+        "DJANGO_SETTINGS_MODULE"
+    ):
+        settings.configure()
+
+
+def get_parser():
+    """Command line arguments parser"""
+    parser = argparse.ArgumentParser(
+        prog="cronman-status",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "job_spec_or_pid", nargs="?", help="Job spec or PID filter"
+    )
+    parser.add_argument(
+        "--data-dir",
+        default=os.environ.get("CRONMAN_DATA_DIR"),
+        help="Cronman data directory (default: $CRONMAN_DATA_DIR or "
+        "CRONMAN_DATA_DIR of $DJANGO_SETTINGS_MODULE)",
+    )
+    parser.add_argument(
+        "--format", choices=("text", "json"), default="text", dest="fmt"
+    )
+    parser.add_argument(
+        "--tree",
+        action="store_true",
+        default=False,
+        help="Include descendant processes and RSS (scans /proc)",
+    )
+    return parser
+
+
+def main(argv=None, stdout=None):
+    """Entry point of `cronman-status` script, returns exit code"""
+    options = get_parser().parse_args(argv)
+    stdout = stdout or sys.stdout
+    configure_settings()
+
+    from cronman.taxonomies import PIDStatus
+    from cronman.utils import TabularFormatter, config, parse_job_spec
+    from cronman.worker.worker_list import CronWorkerPIDList
+
+    data_dir = options.data_dir or config("CRONMAN_DATA_DIR")
+    if not os.path.isdir(data_dir):
+        print(
+            "Data directory {} does not exist.".format(data_dir),
+            file=sys.stderr,
+        )
+        return EXIT_UNKNOWN
+    name = args = kwargs = pid = None
+    job_spec_or_pid = options.job_spec_or_pid
+    if job_spec_or_pid:
+        if re.match(r"\d+$", job_spec_or_pid):
+            pid = int(job_spec_or_pid)
+        else:
+            try:
+                name, args, kwargs = parse_job_spec(job_spec_or_pid)
+            except ValueError as error:
+                print(
+                    "Invalid job spec {}: {}".format(job_spec_or_pid, error),
+                    file=sys.stderr,
+                )
+                return EXIT_UNKNOWN
+    items, totals = CronWorkerPIDList(
+        data_dir, name=name, args=args, kwargs=kwargs, pid=pid
+    ).status(process_tree=options.tree)
+
+    if options.fmt == "json":
+        output = json.dumps(
+            {
+                "data_dir": data_dir,
+                "workers": [
+                    {
+                        key: value
+                        for key, value in item.items()
+                        if not key.startswith("_")
+                    }
+                    for item in items
+                ],
+                "totals": totals,
+            }
+        )
+        stdout.write(output + "\n")
+    else:
+        stdout.write(
+            TabularFormatter.format_listing_output(
+                items,
+                totals=totals,
+                title="STATUS:",
+                empty_message="No PID file(s) found.",
+            )
+        )
+
+    if job_spec_or_pid and not totals[PIDStatus.ALIVE]:
+        return EXIT_NOT_RUNNING
+    if totals[PIDStatus.DEAD]:
+        return EXIT_DEAD
+    return EXIT_OK
+
+
+def run():
+    """Console script wrapper"""
+    sys.exit(main())
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+# vi:si:et:sw=4:sts=4:ts=4
+
+from __future__ import unicode_literals
+
+import fcntl
+import hashlib
+import math
+import mmap
+import os
+import struct
+import time
+from contextlib import contextmanager
+
+from django.utils.encoding import force_bytes, force_text
+
+# Header: magic, version, overflow flag, number of slots
+HEADER = struct.Struct("<4sHHI")
+# Record: pid, state, job hash, process start time, heartbeat,
+# job start time, kill grace period, process group, PID file name,
+# job key (job name with params hash - slots are named after the group)
+# (missing float values are stored as NaN, missing process group as 0)
+RECORD = struct.Struct("<iB3x16sddddi4x128s128s")
+HEARTBEAT = struct.Struct("<d")
+HEARTBEAT_OFFSET = 32  # in the record
+MAGIC = b"CRWT"
+VERSION = 3
+
+
+class WorkerState(object):
+    """State of the slot in worker status table"""
+
+    FREE = 0  # never used
+    DELETED = 1  # used before (keeps PID lookup chains intact)
+    LOCKED = 2  # worker holds the lock (PID file)
+    RUNNING = 3  # worker is running the job
+
+
+class CronWorkerStatusTable(object):
+    """Fixed-slot table of running Cron Workers in shared memory (`mmap`),
+    kept in data directory next to PID files.
+    Workers register on lock acquisition and unregister on release,
+    slot is picked by PID (linear probing), so lookup by PID is O(1)
+    and listing doesn't need to scan and read PID files.
+    Entries hold everything needed to list and kill workers (PID, process
+    start time, process group, kill grace period), so PID files are not read.
+    If the table is full, it's marked as overflowed and readers should
+    fall back to PID files.
+    """
+
+    FILE_NAME = "workers.table"
+    slots = 1024
+
+    def __init__(self, data_dir, slots=None):
+        self.data_dir = data_dir
+        self.path = os.path.join(data_dir, self.FILE_NAME)
+        self.slots = slots or self.slots
+        self.fd = None
+        self.map = None
+
+    def exists(self):
+        """Checks if the table file exists"""
+        return os.path.exists(self.path)
+
+    def available(self):
+        """Checks if the table can be used for listing of workers"""
+        return self.exists() and self._open() and not self._overflow
+
+    def close(self):
+        """Unmaps and closes the table file"""
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    # Write operations:
+
+    def register(
+        self,
+        name,
+        pid,
+        start_time=None,
+        state=WorkerState.LOCKED,
+        started_at=None,
+        kill_grace_seconds=None,
+        pgid=None,
+        job_key=None,
+    ):
+        """Adds worker holding PID file of given name to the table,
+        replaces older entries of the same PID file (crashed workers).
+        Returns False if the worker could not be registered.
+        """
+        name_bytes = force_bytes(name)
+        job_key_bytes = force_bytes(job_key or "")
+        if not self._open():
+            return False
+        with self._locked():
+            if len(name_bytes) > 128 or len(job_key_bytes) > 128:
+                self._set_overflow()
+                return False
+            job_hash = self.get_job_hash(name)
+            for slot in self._occupied_slots():
+                if self._read(slot)[2] == job_hash:
+                    self._write_state(slot, WorkerState.DELETED)
+            for slot in self._probe(pid):
+                if self._read(slot)[1] in (
+                    WorkerState.FREE,
+                    WorkerState.DELETED,
+                ):
+                    now = time.time()
+                    self._write(
+                        slot,
+                        pid,
+                        state,
+                        job_hash,
+                        self._float(start_time),
+                        now,
+                        started_at or now,
+                        self._float(kill_grace_seconds),
+                        pgid or 0,
+                        name_bytes,
+                        job_key_bytes,
+                    )
+                    return True
+            self._set_overflow()
+            return False
+
+    def unregister(self, name, pid):
+        """Removes worker's entry from the table"""
+        slot = self._find(pid, name)
+        if slot is not None:
+            with self._locked():
+                self._write_state(slot, WorkerState.DELETED)
+
+    def heartbeat(self, pid, state=None):
+        """Updates worker's heartbeat (and state) in the table.
+        Other fields are not rewritten - the slot may be reused concurrently.
+        """
+        slot = self._find(pid)
+        if slot is not None:
+            HEARTBEAT.pack_into(
+                self.map, self._offset(slot) + HEARTBEAT_OFFSET, time.time()
+            )
+            if state is not None:
+                self._write_state(slot, state)
+
+    # Read operations:
+
+    def get(self, pid):
+        """Retrieves entry of worker with given PID or None"""
+        slot = self._find(pid)
+        return self._entry(slot) if slot is not None else None
+
+    def entries(self):
+        """Retrieves entries of all registered workers"""
+        if not self._open():
+            return []
+        return [self._entry(slot) for slot in self._occupied_slots()]
+
+    @staticmethod
+    def get_job_hash(name):
+        """Hash of PID file name"""
+        return hashlib.md5(force_bytes(name)).digest()  # nosec
+
+    # Helpers:
+
+    def _open(self):
+        """Opens and maps the table file (creates it if needed).
+        Returns False if data directory does not exist.
+        """
+        if self.map is None:
+            size = HEADER.size + RECORD.size * self.slots
+            try:
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            except OSError:
+                return False
+            self.fd = fd
+            with self._locked():
+                header = os.read(fd, HEADER.size)
+                if len(header) == HEADER.size:
+                    magic, version, overflow, slots = HEADER.unpack(header)
+                else:
+                    magic = version = slots = None
+                if magic == MAGIC and version == VERSION:
+                    self.slots = slots
+                    size = HEADER.size + RECORD.size * slots
+                else:  # New (or incompatible) table
+                    os.ftruncate(fd, 0)
+                    os.ftruncate(fd, size)
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    os.write(fd, HEADER.pack(MAGIC, VERSION, 0, self.slots))
+            self.map = mmap.mmap(fd, size)
+        return True
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive lock on the table (writers only)"""
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+    @property
+    def _overflow(self):
+        return HEADER.unpack_from(self.map, 0)[2]
+
+    def _set_overflow(self):
+        HEADER.pack_into(self.map, 0, MAGIC, VERSION, 1, self.slots)
+
+    def _offset(self, slot):
+        return HEADER.size + RECORD.size * slot
+
+    def _read(self, slot):
+        return RECORD.unpack_from(self.map, self._offset(slot))
+
+    def _write(self, slot, *values):
+        RECORD.pack_into(self.map, self._offset(slot), *values)
+
+    @staticmethod
+    def _float(value):
+        return float("nan") if value is None else float(value)
+
+    def _write_state(self, slot, state):
+        self.map[self._offset(slot) + 4] = state
+
+    def _probe(self, pid):
+        """Slots to check for given PID, in order"""
+        first = pid % self.slots
+        for i in range(self.slots):
+            yield (first + i) % self.slots
+
+    def _occupied_slots(self):
+        for slot in range(self.slots):
+            if self.map[self._offset(slot) + 4] >= WorkerState.LOCKED:
+                yield slot
+
+    def _find(self, pid, name=None):
+        """Finds slot of worker with given PID (and PID file name)"""
+        if pid is None or not self.exists() or not self._open():
+            return None
+        job_hash = self.get_job_hash(name) if name is not None else None
+        for slot in self._probe(pid):
+            slot_pid, state, slot_job_hash = self._read(slot)[:3]
+            if state == WorkerState.FREE:
+                break  # end of the chain
+            if (
+                state >= WorkerState.LOCKED
+                and slot_pid == pid
+                and (job_hash is None or slot_job_hash == job_hash)
+            ):
+                return slot
+        return None
+
+    def _entry(self, slot):
+        (
+            pid,
+            state,
+            job_hash,
+            start_time,
+            heartbeat,
+            started_at,
+            kill_grace_seconds,
+            pgid,
+            name,
+            job_key,
+        ) = self._read(slot)
+        return {
+            "pid": pid,
+            "state": state,
+            "job_hash": job_hash.hex(),
+            "start_time": None if math.isnan(start_time) else start_time,
+            "heartbeat": heartbeat,
+            "started_at": started_at,
+            "kill_grace_seconds": (
+                None if math.isnan(kill_grace_seconds) else kill_grace_seconds
+            ),
+            "pgid": pgid or None,
+            "name": force_text(name.rstrip(b"\0")),
+            "job_key": force_text(job_key.rstrip(b"\0")) or None,
+        }
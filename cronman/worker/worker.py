@@ -4,30 +4,52 @@
 from __future__ import unicode_literals
 
 import logging
+import os
 import re
 import sys
-import time
 import traceback
+from collections import OrderedDict
 
 from django.utils import timezone
 
+from cronman import autodiscover
 from cronman.base import BaseCronObject
 from cronman.exceptions import (
     CronJobNotRegistered,
     CronTaskInvalidStatus,
+    CronWorkerClusterLockError,
     CronWorkerInvalidParams,
     CronWorkerLocked,
 )
 from cronman.job import cron_job_registry
 from cronman.models import CronTask
 from cronman.monitor import send_errors_to_sentry
-from cronman.taxonomies import LockType
-from cronman.utils import TabularFormatter, format_exception, parse_job_spec
+from cronman.remote_manager import CronRemoteManager
+from cronman.taxonomies import LockScope, LockType
+from cronman.utils import (
+    TabularFormatter,
+    config,
+    format_exception,
+    parse_job_spec,
+)
+from cronman.worker.cluster_lock import CronWorkerClusterLock
 from cronman.worker.cron_job_info import CronJobClassList
+from cronman.worker.phase_timer import PhaseTimer
 from cronman.worker.process_manager import ProcessManager
 from cronman.worker.signal_notifier import SignalNotifier
-from cronman.worker.worker_file import CronWorkerPIDFile
-from cronman.worker.worker_list import CronWorkerJobSpecList, CronWorkerPIDList
+from cronman.worker.status_table import WorkerState
+from cronman.worker.worker_file import (
+    CronWorkerPIDFile,
+    CronWorkerSlotPIDFile,
+    CronWorkerStatsFile,
+)
+from cronman.worker.worker_list import (
+    CronWorkerJobSpecList,
+    CronWorkerPIDList,
+    CronWorkerStatsList,
+)
+from cronman.worker.worker_orphans import CronWorkerOrphanList
+from cronman.worker.worker_top import CronWorkerTop, DirectoryWatcher
 
 logger = logging.getLogger("cronman.command.cron_worker")
 
@@ -45,10 +67,15 @@ class CronWorker(BaseCronObject):
 
     NO_PID_FILES_MESSAGE = "No PID file(s) found."
     NO_JOB_SPEC_FILES_MESSAGE = "No JobSpec file(s) found."
+    NO_STATS_FILES_MESSAGE = "No Stats file(s) found."
     NO_CRON_JOBS_MESSAGE = "No cron job(s) found."
+    NO_ORPHANS_MESSAGE = "No orphaned worker process(es) found."
+    CLEAR_SCREEN = "\033[H\033[2J"
 
     def __init__(self, **kwargs):
         self.cronitor_id = None
+        self.cluster_lock = None
+        self.timer = PhaseTimer()
         self.formatter = TabularFormatter()
         kwargs["logger"] = kwargs.get("logger", logger)
         super(CronWorker, self).__init__(**kwargs)
@@ -63,30 +90,46 @@ class CronWorker(BaseCronObject):
     @send_errors_to_sentry
     def run(self, job_spec):
         """Executes logic defined in CronJob class specified by `job_spec`"""
+        self.timer = PhaseTimer.from_process_start()
         name, args, kwargs, cron_job_class = self.parse_job_spec_with_class(
             job_spec
         )
+        self.timer.mark("import")
         self.cronitor_id = self.get_cronitor_id(kwargs)
         cron_task = self.get_cron_task(kwargs)
-        if cron_task and not cron_task.is_pending():
-            if self.cron_task_killed(cron_task):
-                self.logger.info(
-                    'Starting "{}" for killed CronTask.'.format(job_spec)
-                )
-            else:
-                error = CronTaskInvalidStatus(
-                    'Unable to start "{}", because associated CronTask '
-                    'has invalid status "{}".'.format(
-                        job_spec, cron_task.get_status_display()
-                    )
-                )
-                return self.warning(error)
+        error = self.check_cron_task(job_spec, cron_task)
+        if error:
+            return self.warning(error)
 
         if cron_task:
             cron_task.mark_as_queued()
+        self.timer.mark("cron_task")
 
         pid_file = self.get_pid_file(cron_job_class, name, args, kwargs)
-        if self.pid_file_locked(pid_file, cron_job_class.lock_check_attempts):
+        locked = not pid_file.acquire(
+            timeout=self.get_lock_wait_timeout(cron_job_class),
+            job_spec=job_spec,
+            can_resume=cron_job_class.can_resume,
+            kill_grace_seconds=cron_job_class.kill_grace_seconds,
+        )
+        if locked and cron_job_class.coalesce_locked:
+            # Ask the process holding the lock to re-run this job:
+            pid_file.rerun_file.create(job_spec)
+            # ... unless it has finished in the meantime:
+            locked = not pid_file.acquire(
+                job_spec=job_spec,
+                can_resume=cron_job_class.can_resume,
+                kill_grace_seconds=cron_job_class.kill_grace_seconds,
+            )
+            if locked:
+                self.logger.info(
+                    'Re-run of "{}" requested from running process.'.format(
+                        job_spec
+                    )
+                )
+                return "COALESCED: Requested re-run of {}".format(job_spec)
+        if locked:
+            self.timer.mark("lock")
             error = CronWorkerLocked(
                 'Unable to start "{}", because similar process '
                 "is already running (PID file exists).".format(job_spec)
@@ -94,45 +137,195 @@ class CronWorker(BaseCronObject):
             return self.warning(
                 error, silent=cron_job_class.lock_ignore_errors
             )
-        job_spec_file = self.get_job_spec_file(cron_job_class, pid_file)
+        cluster_lock = self.get_cluster_lock(cron_job_class, pid_file)
+        try:
+            cluster_locked = cluster_lock and not cluster_lock.acquire()
+        except CronWorkerClusterLockError as error:
+            pid_file.release()
+            self.timer.mark("lock")
+            return self.warning(error)
+        if cluster_locked:
+            pid_file.release()
+            self.timer.mark("lock")
+            error = CronWorkerLocked(
+                'Unable to start "{}", because similar process '
+                "is already running in the cluster ({}).".format(
+                    job_spec, self.format_lock_holder(cluster_lock.holder())
+                )
+            )
+            return self.warning(
+                error, silent=cron_job_class.lock_ignore_errors
+            )
+        self.cluster_lock = cluster_lock
+        self.timer.mark("lock")
+        # Earlier re-run requests are satisfied by this run:
+        coalesced_tasks = self.get_coalesced_cron_tasks(
+            pid_file.rerun_file.pop_all()
+        )
 
         with SignalNotifier(job_spec):
+            outputs = [
+                self.process(
+                    job_spec,
+                    name,
+                    args,
+                    kwargs,
+                    cron_job_class,
+                    cron_task,
+                    pid_file,
+                    coalesced_tasks,
+                )
+            ]
+            outputs += self.process_reruns(pid_file)
+            pid_file.release()
+            # Re-run requested after the last check, but before the lock
+            # was released (the requesting worker gave up):
+            while pid_file.rerun_file.exists() and pid_file.acquire(
+                job_spec=job_spec,
+                can_resume=cron_job_class.can_resume,
+                kill_grace_seconds=cron_job_class.kill_grace_seconds,
+            ):
+                outputs += self.process_reruns(pid_file)
+                pid_file.release()
+            if cluster_lock:
+                cluster_lock.release()
+
+        return "\n".join(outputs)
+
+    def process(
+        self,
+        job_spec,
+        name,
+        args,
+        kwargs,
+        cron_job_class,
+        cron_task,
+        pid_file,
+        coalesced_tasks=(),
+    ):
+        """Runs a CronJob while the lock is held, maintains job spec stored
+        in PID file, CronTask status and stats.
+        CronTasks of re-run requests satisfied by this run (`coalesced_tasks`)
+        get the same final status.
+        """
+        resume_job_spec = job_spec if cron_job_class.can_resume else None
+        if pid_file.info.get("job_spec") != resume_job_spec:  # re-run
+            pid_file.update(
+                job_spec,
+                cron_job_class.can_resume,
+                cron_job_class.kill_grace_seconds,
+            )
+        self.timer.mark("lock")
 
-            pid_file.create()
-            if job_spec_file:
-                job_spec_file.create(job_spec)
-
-            run_start = timezone.now()
-            if cron_task:
-                cron_task.mark_as_started(pid_file.pid, run_start)
-            self.logger.info('Starting "{}"...'.format(job_spec))
+        run_start = timezone.now()
+        if cron_task:
+            cron_task.mark_as_started(pid_file.pid, run_start)
+            self.timer.mark("cron_task")
+        self.logger.info('Starting "{}"...'.format(job_spec))
 
+        pid_file.start_heartbeat(WorkerState.RUNNING)
+        try:
             ok = self.run_cron_job(job_spec, cron_job_class, args, kwargs)
+        finally:
+            pid_file.stop_heartbeat(WorkerState.LOCKED)
 
-            run_end = timezone.now()
-            duration = run_end - run_start
+        run_end = timezone.now()
+        duration = run_end - run_start
+        cron_tasks = ([cron_task] if cron_task else []) + list(coalesced_tasks)
+        for task in cron_tasks:
             if ok:
-                if cron_task:
-                    cron_task.mark_as_finished(run_end)
-                self.logger.info(
-                    'Processing "{}" finished after {}'.format(
-                        job_spec, duration
-                    )
+                task.mark_as_finished(run_end)
+            else:
+                task.mark_as_failed()
+        if cron_tasks:
+            self.timer.mark("cron_task")
+
+        self.timer.mark("teardown")
+
+        if ok:
+            self.logger.info(
+                'Processing "{}" finished after {} ({})'.format(
+                    job_spec, duration, self.timer.format()
+                )
+            )
+        else:
+            self.logger.warning(
+                'Processing "{}" FAILED after {} ({})'.format(
+                    job_spec, duration, self.timer.format()
                 )
+            )
+        self.save_stats(name, job_spec, ok)
+
+        output = "{}: Processed {}".format("OK" if ok else "FAIL", job_spec)
+        if self.cluster_lock and self.cluster_lock.lost:
+            error = CronWorkerClusterLockError(
+                'Cluster lock of "{}" was lost while running, '
+                "similar process may have been started in the cluster "
+                "(token {}).".format(job_spec, self.cluster_lock.token)
+            )
+            output += "\n" + self.warning(error).rstrip("\n")
+        return output
+
+    def process_reruns(self, pid_file):
+        """Runs CronJobs requested while the lock was held
+        (`coalesce_locked` option) in current process, one by one.
+        Only the latest of pending requests is run, it satisfies
+        the earlier ones.
+        """
+        outputs = []
+        job_specs = pid_file.rerun_file.pop_all()
+        while job_specs:
+            job_spec = job_specs[-1]
+            coalesced_tasks = self.get_coalesced_cron_tasks(job_specs[:-1])
+            self.logger.info(
+                'Re-running "{}" requested while locked...'.format(job_spec)
+            )
+            self.timer = PhaseTimer()
+            (
+                name,
+                args,
+                kwargs,
+                cron_job_class,
+            ) = self.parse_job_spec_with_class(job_spec)
+            self.timer.mark("import")
+            self.cronitor_id = self.get_cronitor_id(kwargs)
+            cron_task = self.get_cron_task(kwargs)
+            error = self.check_cron_task(job_spec, cron_task)
+            self.timer.mark("cron_task")
+            if error:
+                for task in coalesced_tasks:
+                    task.mark_as_failed()
+                outputs.append(self.warning(error))
             else:
-                if cron_task:
-                    cron_task.mark_as_failed()
-                self.logger.warning(
-                    'Processing "{}" FAILED after {}'.format(
-                        job_spec, duration
+                outputs.append(
+                    self.process(
+                        job_spec,
+                        name,
+                        args,
+                        kwargs,
+                        cron_job_class,
+                        cron_task,
+                        pid_file,
+                        coalesced_tasks,
                     )
                 )
+            job_specs = pid_file.rerun_file.pop_all()
+        return outputs
 
-            if job_spec_file:
-                job_spec_file.delete()
-            pid_file.delete()
-
-        return "{}: Processed {}".format("OK" if ok else "FAIL", job_spec)
+    def get_coalesced_cron_tasks(self, job_specs):
+        """Retrieves pending CronTasks of re-run requests satisfied
+        by other run
+        """
+        cron_tasks = []
+        for job_spec in job_specs:
+            try:
+                _, _, kwargs = parse_job_spec(job_spec)
+            except ValueError:
+                continue
+            cron_task = self.get_cron_task(kwargs)
+            if cron_task and cron_task.is_pending():
+                cron_tasks.append(cron_task)
+        return cron_tasks
 
     @send_errors_to_sentry
     def status(self, job_spec_or_pid=None):
@@ -148,6 +341,43 @@ class CronWorker(BaseCronObject):
             empty_message=self.NO_PID_FILES_MESSAGE,
         )
 
+    @send_errors_to_sentry
+    def top(self, sort_by=None, interval=2.0, iterations=1, stdout=None):
+        """Shows CPU, memory and I/O usage of running worker processes,
+        sorted by given key. Refreshes the view every `interval` seconds
+        (or when workers start or finish) `iterations` times
+        (0 - until interrupted), writing each frame to `stdout`.
+        """
+        worker_top = CronWorkerTop(self.data_dir, sort_by)
+        if iterations == 1:
+            return self._format_top(worker_top)
+        stdout = stdout or sys.stdout
+        watcher = DirectoryWatcher(self.data_dir)
+        try:
+            iteration = 0
+            while True:
+                stdout.write(self.CLEAR_SCREEN + self._format_top(worker_top))
+                stdout.flush()
+                iteration += 1
+                if iterations and iteration >= iterations:
+                    break
+                watcher.wait(interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            watcher.close()
+        return ""
+
+    def _format_top(self, worker_top):
+        """Formats single frame of `top` output"""
+        return self.formatter.format_listing_output(
+            worker_top.items(),
+            title="TOP (sorted by {}):\n{}".format(
+                worker_top.sort_by, worker_top.HEADER
+            ),
+            empty_message=self.NO_PID_FILES_MESSAGE,
+        )
+
     def _kill(self, job_spec_or_pid=None):
         """Kills all worker processes,
         optionally filtered by job_spec or PID
@@ -165,7 +395,8 @@ class CronWorker(BaseCronObject):
 
     def _clean_pid_files(self):
         """Removes all dead PID files"""
-        items, totals = self.get_worker_pid_list().clean()
+        # All files are scanned, including ones of unregistered workers:
+        items, totals = self.get_worker_pid_list(scan_files=True).clean()
         return self.formatter.format_listing_output(
             items,
             totals=totals,
@@ -183,29 +414,88 @@ class CronWorker(BaseCronObject):
             empty_message=self.NO_JOB_SPEC_FILES_MESSAGE,
         )
 
+    def _clean_stats_files(self):
+        """Removes Stats files not updated for `CRONMAN_STATS_MAX_AGE`
+        seconds
+        """
+        items, totals = CronWorkerStatsList(self.data_dir).clean(
+            max_age=float(config("CRONMAN_STATS_MAX_AGE"))
+        )
+        return self.formatter.format_listing_output(
+            items,
+            totals=totals,
+            title="CLEAN STATS FILES:",
+            empty_message=self.NO_STATS_FILES_MESSAGE,
+        )
+
     def _clean(self):
-        """Removes all dead PID files and stalled JobSpec files"""
-        return self._clean_pid_files() + self._clean_job_spec_files()
+        """Removes all dead PID files, stalled JobSpec files and outdated
+        Stats files
+        """
+        return (
+            self._clean_pid_files()
+            + self._clean_job_spec_files()
+            + self._clean_stats_files()
+        )
 
     clean = send_errors_to_sentry(_clean)
 
     @send_errors_to_sentry
-    def suspend(self):
+    def suspend(self, handoff=False):
         """Shortcut command to get:
-        1. `clean` - remove all DEAD PID files and STALLED JobSpec files
-        2. `kill` - kill ALL running worker processes.
+        1. `clean` - remove all DEAD PID files, STALLED JobSpec files and
+           outdated Stats files
+        2. `kill` - kill ALL running worker processes
+        3. `handoff` (optional) - publish job specs of killed workers, so
+           they can be resumed on other hosts.
         Returns joined output of called commands.
         """
-        return self._clean() + self._kill()
+        output = self._clean() + self._kill()
+        if handoff:
+            output += self._handoff()
+        return output
+
+    def _handoff(self):
+        """Publishes job specs of all killed resumable workers through
+        Remote Manager, so Cron Schedulers on other hosts resume them
+        """
+        remote_manager = CronRemoteManager(logger=self.logger)
+        items, totals = self.get_worker_job_spec_list().handoff(remote_manager)
+        return self.formatter.format_listing_output(
+            items,
+            totals=totals,
+            title="HANDOFF:",
+            empty_message=self.NO_JOB_SPEC_FILES_MESSAGE,
+        )
 
     @send_errors_to_sentry
-    def resume(self, job_spec_or_pid=None):
+    def resume(self, job_spec_or_pid=None, period=None):
         """Starts all previously killed worker processes with `can_resume`
         capability,
-        optionally filtered by job_spec or PID
+        optionally filtered by job_spec or PID.
+        Throttled according to `CRONMAN_RESUME_RATE_LIMIT` (number of workers
+        started per second of `period` since previous call, 1 second
+        by default) and `CRONMAN_RESUME_MAX_CONCURRENT` settings,
+        capped by `CRONMAN_RESUME_MAX_ATTEMPTS`.
         """
         worker_job_spec_list = self.get_worker_job_spec_list(job_spec_or_pid)
-        items, totals = worker_job_spec_list.resume()
+        rate_limit = config("CRONMAN_RESUME_RATE_LIMIT")
+        max_concurrent = config("CRONMAN_RESUME_MAX_CONCURRENT")
+        max_attempts = config("CRONMAN_RESUME_MAX_ATTEMPTS")
+        if rate_limit:
+            seconds = 1.0 if period is None else period
+            max_started = max(1, int(float(rate_limit) * seconds))
+        else:
+            max_started = None
+        items, totals = worker_job_spec_list.resume(
+            max_started=max_started,
+            max_concurrent=(
+                int(max_concurrent)
+                if max_concurrent not in (None, "")
+                else None
+            ),
+            max_attempts=int(max_attempts) if max_attempts else None,
+        )
         return self.formatter.format_listing_output(
             items,
             totals=totals,
@@ -213,6 +503,26 @@ class CronWorker(BaseCronObject):
             empty_message=self.NO_JOB_SPEC_FILES_MESSAGE,
         )
 
+    def _orphans(self, action=None):
+        """Shows worker processes running without PID files (orphans).
+        Action "adopt" creates PID files for them (or terminates them
+        if their lock is held by other worker), "kill" terminates them.
+        """
+        orphan_list = CronWorkerOrphanList(self)
+        if action not in (None, "adopt", "kill"):
+            raise CronWorkerInvalidParams(
+                'Invalid action "{}". Choices: adopt, kill.'.format(action)
+            )
+        items, totals = getattr(orphan_list, action or "status")()
+        return self.formatter.format_listing_output(
+            items,
+            totals=totals,
+            title="ORPHANS:",
+            empty_message=self.NO_ORPHANS_MESSAGE,
+        )
+
+    orphans = send_errors_to_sentry(_orphans)
+
     @send_errors_to_sentry
     def info(self, name=None):
         """Shows a list of all available cron job class,
@@ -235,19 +545,43 @@ class CronWorker(BaseCronObject):
             empty_message=self.NO_CRON_JOBS_MESSAGE,
         )
 
+    @send_errors_to_sentry
+    def manifest(self, path=None):
+        """Discovers all cron job classes and writes the manifest file,
+        so other processes can import them lazily.
+        """
+        path = path or config("CRONMAN_JOBS_MANIFEST")
+        if not path:
+            raise CronWorkerInvalidParams(
+                "Manifest path is required. Please set "
+                "CRONMAN_JOBS_MANIFEST or pass the path as argument."
+            )
+        autodiscover()
+        num_cron_jobs = cron_job_registry.dump_manifest(path)
+        return "MANIFEST:\n{} cron job(s) written to {}\n".format(
+            num_cron_jobs, path
+        )
+
     # Cron Job running internals:
 
     def run_cron_job(self, job_spec, cron_job_class, args, kwargs):
         """Initializes and runs a CronJob"""
         self.before_start(job_spec, cron_job_class, args, kwargs)
+        self.timer.mark("before_start")
         try:
-            results = cron_job_class().run(*args, **kwargs)
+            cron_job = cron_job_class()
+            if self.cluster_lock:
+                cron_job.fencing_token = self.cluster_lock.token
+            results = cron_job.run(*args, **kwargs)
         except Exception as e:
+            self.timer.mark("run")
             self.on_error(job_spec, cron_job_class, args, kwargs, e)
             ok = False
         else:
+            self.timer.mark("run")
             self.on_success(job_spec, cron_job_class, args, kwargs, results)
             ok = True
+        self.timer.mark("notify")
         return ok
 
     def before_start(self, job_spec, cron_job_class, args, kwargs):
@@ -277,6 +611,23 @@ class CronWorker(BaseCronObject):
 
     # Helpers:
 
+    def save_stats(self, name, job_spec, ok):
+        """Stores machine-readable record of current run in the stats file"""
+        record = OrderedDict()
+        record["job_spec"] = job_spec
+        record["pid"] = os.getpid()
+        record["ok"] = ok
+        record["finished_at"] = round(self.timer.last, 3)
+        record["duration"] = round(self.timer.total, 6)
+        record["phases"] = self.timer.as_dict()
+        self.get_stats_file(name).add(record)
+
+    def get_stats_file(self, name):
+        """Retrieves stats file for given CronJob name"""
+        return CronWorkerStatsFile(
+            self.data_dir, CronWorkerStatsFile.get_file_name(name)
+        )
+
     @staticmethod
     def get_cron_task(kwargs):
         """Retrieves CronTask by ID passed through cron job params.
@@ -289,6 +640,25 @@ class CronWorker(BaseCronObject):
             cron_task = None
         return cron_task
 
+    def check_cron_task(self, job_spec, cron_task):
+        """Checks if given CronTask can be started,
+        returns CronTaskInvalidStatus error otherwise.
+        """
+        error = None
+        if cron_task and not cron_task.is_pending():
+            if self.cron_task_killed(cron_task):
+                self.logger.info(
+                    'Starting "{}" for killed CronTask.'.format(job_spec)
+                )
+            else:
+                error = CronTaskInvalidStatus(
+                    'Unable to start "{}", because associated CronTask '
+                    'has invalid status "{}".'.format(
+                        job_spec, cron_task.get_status_display()
+                    )
+                )
+        return error
+
     @staticmethod
     def cron_task_killed(cron_task):
         """Checks if given Cron Task is in killed state
@@ -303,6 +673,12 @@ class CronWorker(BaseCronObject):
     def get_pid_file(self, cron_job_class, name, args, kwargs):
         """Retrieves PID file for given CronJob and its parameters"""
         name = cron_job_class.lock_name or name
+        if cron_job_class.lock_type == LockType.SLOTS:
+            return CronWorkerSlotPIDFile(
+                self.data_dir,
+                cron_job_class.lock_group or name,
+                cron_job_class.lock_slots,
+            )
         if cron_job_class.lock_type == LockType.CLASS:
             pid_file_name = CronWorkerPIDFile.get_file_name(name)
         elif cron_job_class.lock_type == LockType.PARAMS:
@@ -313,28 +689,49 @@ class CronWorker(BaseCronObject):
             )
         return CronWorkerPIDFile(self.data_dir, pid_file_name)
 
-    def get_job_spec_file(self, cron_job_class, pid_file):
-        """Retrieves JobSpec file for given CronJob class and PIDFile"""
-        return pid_file.job_spec_file if cron_job_class.can_resume else None
+    def get_cluster_lock(self, cron_job_class, pid_file):
+        """Retrieves cluster lock for given CronJob class and PIDFile,
+        if required by `lock_scope` (lock by class or params only).
+        """
+        if cron_job_class.lock_scope == LockScope.CLUSTER and (
+            cron_job_class.lock_type in (LockType.CLASS, LockType.PARAMS)
+        ):
+            return CronWorkerClusterLock(pid_file.name, logger=self.logger)
+        return None
+
+    @staticmethod
+    def format_lock_holder(holder):
+        """Describes owner of the cluster lock"""
+        if not holder:
+            return "unknown holder"
+        return "host {}, PID {}, token {}".format(
+            holder.get("host"), holder.get("pid"), holder.get("token")
+        )
+
+    @staticmethod
+    def get_lock_wait_timeout(cron_job_class):
+        """Number of seconds to wait for the lock held by other process"""
+        if cron_job_class.lock_wait_timeout is not None:
+            timeout = cron_job_class.lock_wait_timeout
+        else:  # Backwards compatibility - 1 second per extra attempt
+            timeout = max(cron_job_class.lock_check_attempts - 1, 0)
+        return timeout
 
     @staticmethod
     def pid_file_locked(pid_file, lock_check_attempts):
-        """Checks if given PIDFile exists and belongs to running process"""
-        locked = True
-        while lock_check_attempts > 0:
-            lock_check_attempts -= 1
-            locked = pid_file.exists_with_alive_process()
-            if not locked:
-                break
-            elif lock_check_attempts:
-                time.sleep(1)
-        return locked
-
-    def get_worker_pid_list(self, job_spec_or_pid=None):
+        """Checks if given PIDFile is locked by running process"""
+        return pid_file.is_locked(timeout=max(lock_check_attempts - 1, 0))
+
+    def get_worker_pid_list(self, job_spec_or_pid=None, scan_files=False):
         """Retrieves CronWorkerPIDList instance"""
         name, args, kwargs, pid = self.parse_job_spec_or_pid(job_spec_or_pid)
         return CronWorkerPIDList(
-            self.data_dir, name=name, args=args, kwargs=kwargs, pid=pid
+            self.data_dir,
+            name=name,
+            args=args,
+            kwargs=kwargs,
+            pid=pid,
+            scan_files=scan_files,
         )
 
     def get_worker_job_spec_list(self, job_spec_or_pid=None):
@@ -3,14 +3,56 @@
 
 from __future__ import unicode_literals
 
+import errno
+import fcntl
 import hashlib
+import json
 import os
+import re
+import threading
+import time
 
+from django.core.exceptions import ImproperlyConfigured
 from django.utils.encoding import force_bytes, force_text
 from django.utils.functional import cached_property
 
-from cronman.spawner import CronSpawner
-from cronman.worker.process_manager import ProcessManager
+from cronman.taxonomies import DataDirDurability
+from cronman.utils import (
+    bool_param,
+    config,
+    get_cron_process_resume_attempt,
+    parse_job_spec,
+)
+from cronman.worker.process_manager import (
+    ProcessManager,
+    get_flock_inodes,
+    get_process_group,
+    get_process_start_time,
+)
+from cronman.worker.status_table import CronWorkerStatusTable, WorkerState
+
+
+def get_status_table(data_dir):
+    """Retrieves worker status table for given data directory,
+    None if disabled in configuration.
+    """
+    if bool_param(config("CRONMAN_WORKER_STATUS_TABLE")):
+        return CronWorkerStatusTable(data_dir)
+    return None
+
+
+def get_durability():
+    """Retrieves durability mode of data directory writes
+    (`CRONMAN_DATA_DIR_DURABILITY`)
+    """
+    durability = config("CRONMAN_DATA_DIR_DURABILITY")
+    if durability not in DataDirDurability.CHOICES:
+        raise ImproperlyConfigured(
+            "Invalid CRONMAN_DATA_DIR_DURABILITY: {}. Choices: {}.".format(
+                durability, ", ".join(DataDirDurability.CHOICES)
+            )
+        )
+    return durability
 
 
 class BaseCronWorkerFile(object):
@@ -52,15 +94,26 @@ class BaseCronWorkerFile(object):
                     yield cls(data_dir, base_name)
 
     def write_content(self, content):
-        """Populates this file with new content"""
+        """Populates this file with new content
+        (according to `CRONMAN_DATA_DIR_DURABILITY`)
+        """
+        durability = get_durability()
+        if durability == DataDirDurability.ATOMIC:
+            # Readers never see partially written file:
+            temp_path = "{}.{}".format(self.path, os.getpid())
+            with open(temp_path, "wb") as file_:
+                file_.write(force_bytes(content))
+            os.rename(temp_path, self.path)
+            return
         with open(self.path, "wb") as file_:
             file_.write(force_bytes(content))
-            file_.flush()
-            # NOTE:
-            # "flush() does not necessarily write the file’s data to disk.
-            # Use flush() followed by os.fsync() to ensure this behavior."
-            # (from Python 2.7 docs)
-            os.fsync(file_.fileno())
+            if durability == DataDirDurability.FSYNC:
+                file_.flush()
+                # NOTE:
+                # "flush() does not necessarily write the file’s data to disk.
+                # Use flush() followed by os.fsync() to ensure this behavior."
+                # (from Python 2.7 docs)
+                os.fsync(file_.fileno())
 
     def read_content(self):
         """Reads contents of this file"""
@@ -84,13 +137,95 @@ class BaseCronWorkerFile(object):
 
 
 class CronWorkerPIDFile(BaseCronWorkerFile):
-    """PID file (and lock) for Cron Worker"""
+    """PID file (and lock) for Cron Worker.
+    Lock is acquired atomically with `flock` and held by the process until
+    it's released or the process exits (also on crash).
+    Content (version 2) is a JSON object with PID, process start time
+    (to detect PID reuse), job spec of resumable job and start timestamp.
+    Version 1 (older workers) contains the PID only.
+    """
 
     EXTENSION = ".pid"
+    VERSION = 2
+    lock_poll_interval = 0.05  # number of seconds between lock attempts
+
+    def __init__(self, data_dir, name):
+        super(CronWorkerPIDFile, self).__init__(data_dir, name)
+        self.lock_fd = None
+        self._stop_heartbeat = threading.Event()
+        self._heartbeat_thread = None
+
+    @classmethod
+    def from_status_table_entry(cls, data_dir, entry):
+        """Creates PID file object from worker status table entry
+        (PID file is not read unless other information is requested)
+        """
+        pid_file = cls(data_dir, entry["name"])
+        # Bypass properties reading the file:
+        pid_file.__dict__["pid"] = entry["pid"]
+        pid_file.__dict__["process"] = ProcessManager(
+            entry["pid"], entry["start_time"], entry["pgid"]
+        )
+        pid_file.__dict__["started_at"] = entry["started_at"]
+        pid_file.__dict__["kill_grace_seconds"] = entry["kill_grace_seconds"]
+        pid_file.__dict__["job_key"] = entry["job_key"]
+        return pid_file
+
+    @classmethod
+    def registered(cls, data_dir, name=None, args=None, kwargs=None):
+        """Retrieves PID files of workers registered in status table,
+        None if the table is not available (PID files should be scanned).
+        """
+        table = get_status_table(data_dir)
+        if table is None or not table.available():
+            return None
+        try:
+            entries = table.entries()
+        finally:
+            table.close()
+        name_begin = cls.get_file_name(name, args, kwargs) if name else ""
+        pid_files = [
+            cls.from_status_table_entry(data_dir, entry) for entry in entries
+        ]
+        return [
+            pid_file for pid_file in pid_files if pid_file.matches(name_begin)
+        ]
+
+    @classmethod
+    def all(cls, data_dir, name=None, args=None, kwargs=None):
+        """Iterates over PID files in given directory.
+        Slot files (named after the group) are matched by the job stored
+        in the file.
+        """
+        name_begin = cls.get_file_name(name, args, kwargs) if name else ""
+        for pid_file in super(CronWorkerPIDFile, cls).all(data_dir):
+            if pid_file.matches(name_begin):
+                yield pid_file
+
+    def matches(self, name_begin):
+        """Checks if this file belongs to a job with given name (and params)
+        - file name or job key (slot files) starts with `name_begin`
+        """
+        if self.name.startswith(name_begin):
+            return True
+        if CronWorkerSlotPIDFile.SLOT_NAME_REGEX.search(self.name):
+            return (self.job_key or "").startswith(name_begin)
+        return False
 
     @classmethod
     def by_pid(cls, data_dir, pid):
-        """Retrieves PID file from given directory by PID value"""
+        """Retrieves PID file from given directory by PID value
+        (from status table if available)
+        """
+        table = get_status_table(data_dir)
+        if table is not None and table.available():
+            try:
+                entry = table.get(pid)
+            finally:
+                table.close()
+            if entry:
+                return cls.from_status_table_entry(data_dir, entry)
+            return None
         for candidate_pid_file in cls.all(data_dir):
             if candidate_pid_file.pid == pid:
                 pid_file = candidate_pid_file
@@ -99,25 +234,341 @@ class CronWorkerPIDFile(BaseCronWorkerFile):
             pid_file = None
         return pid_file
 
-    def create(self):
+    def create(self, job_spec=None, can_resume=False, kill_grace_seconds=None):
         """Creates the PID file"""
-        pid = os.getpid()
-        self.write_content(pid)
-        self.__dict__["pid"] = pid  # Bypass `pid` property
+        info = self.get_info(job_spec, can_resume, kill_grace_seconds)
+        self.write_content(json.dumps(info))
+        self.__dict__["info"] = info  # Bypass `info` property
+        self.register()
+
+    def acquire(
+        self,
+        timeout=0,
+        job_spec=None,
+        can_resume=False,
+        kill_grace_seconds=None,
+    ):
+        """Acquires the lock and writes current PID (and job spec of
+        resumable job) to this file.
+        Waits up to `timeout` seconds for the lock to be released by
+        other process. Returns True on success, False otherwise.
+        """
+        info = self.get_info(job_spec, can_resume, kill_grace_seconds)
+        deadline = time.time() + timeout
+        while not self._try_acquire(info):
+            if time.time() >= deadline:
+                return False
+            time.sleep(self.lock_poll_interval)
+        return True
+
+    def update(self, job_spec=None, can_resume=False, kill_grace_seconds=None):
+        """Stores new job spec in this file (lock must be held)"""
+        info = self.get_info(job_spec, can_resume, kill_grace_seconds)
+        self._write_info(self.lock_fd, info)
+
+    def adopt(
+        self, pid, job_spec=None, can_resume=False, kill_grace_seconds=None
+    ):
+        """Creates the PID file for running worker process which lost it
+        (orphan), if the lock is free. The file is written under the same
+        `flock` as taken by `acquire`, then the lock is released - the file
+        is treated as locked as long as the process is alive (same as files
+        of older workers). Returns True on success, False otherwise.
+        """
+        info = self.get_info(job_spec, can_resume, kill_grace_seconds, pid)
+        fd = self._lock()
+        if fd is None:
+            return False
+        try:
+            if self._locked_by_other_process(fd):
+                return False
+            self._write_info(fd, info)
+        finally:
+            os.close(fd)
+        self.register()
+        return True
+
+    @staticmethod
+    def get_info(
+        job_spec=None, can_resume=False, kill_grace_seconds=None, pid=None
+    ):
+        """Content of the PID file (v2) for current (or given) process"""
+        own_process = pid is None
+        pid = os.getpid() if own_process else pid
+        start_time = get_process_start_time(pid)
+        return {
+            "version": CronWorkerPIDFile.VERSION,
+            "pid": pid,
+            "process_start_time": start_time,
+            "job_spec": job_spec if can_resume else None,
+            "job_key": CronWorkerPIDFile.get_job_key(job_spec),
+            "started_at": (
+                time.time() if own_process else start_time or time.time()
+            ),
+            "kill_grace_seconds": kill_grace_seconds,
+            "pgid": get_process_group(0 if own_process else pid),
+            "resume_attempt": (
+                get_cron_process_resume_attempt() if own_process else 0
+            ),
+        }
+
+    @classmethod
+    def get_job_key(cls, job_spec):
+        """Name of the job with params hash (None if unknown)"""
+        try:
+            name, args, kwargs = parse_job_spec(job_spec or "")
+        except ValueError:
+            return None
+        return cls.get_file_name(name, args, kwargs) if name else None
+
+    @staticmethod
+    def parse_info(content):
+        """Parses content of the PID file (v1 or v2)"""
+        try:
+            info = json.loads(content)
+        except (ValueError, TypeError):  # Deleted / truncated
+            info = {}
+        if not isinstance(info, dict):  # v1 - PID only
+            info = {"version": 1, "pid": info}
+        if not isinstance(info.get("pid"), int):
+            info["pid"] = None
+        return info
+
+    def release(self):
+        """Deletes this file and releases the lock"""
+        self.delete()
+        if self.lock_fd is not None:
+            os.close(self.lock_fd)
+            self.lock_fd = None
+
+    def delete(self):
+        """Deletes this file and removes the worker from status table"""
+        pid = self.pid
+        super(CronWorkerPIDFile, self).delete()
+        self._update_status_table("unregister", self.name, pid)
+
+    def delete_unlocked(self):
+        """Deletes this file unless it's locked (e.g. acquired by new worker
+        in the meantime). Returns True if the file has been deleted.
+        """
+        try:
+            fd = os.open(self.path, os.O_RDONLY)
+        except OSError:  # Deleted already
+            return False
+        try:
+            if not self._flock(fd, fcntl.LOCK_EX):
+                return False
+            try:
+                same_file = os.path.samestat(os.fstat(fd), os.stat(self.path))
+            except OSError:
+                same_file = False
+            if not same_file:  # Replaced in the meantime
+                return False
+            self.delete()  # while locked - new owner will notice
+        finally:
+            os.close(fd)
+        return True
+
+    def register(self):
+        """Adds the worker to status table"""
+        if self.pid:
+            self._update_status_table(
+                "register",
+                self.name,
+                self.pid,
+                self.info.get("process_start_time"),
+                WorkerState.LOCKED,
+                self.info.get("started_at"),
+                self.info.get("kill_grace_seconds"),
+                self.info.get("pgid"),
+                self.info.get("job_key"),
+            )
+
+    def heartbeat(self, state=None):
+        """Updates worker's heartbeat and state in status table"""
+        self._update_status_table("heartbeat", self.pid, state)
+
+    def start_heartbeat(self, state, interval=None):
+        """Updates worker's state in status table and keeps its heartbeat
+        fresh from background thread (every `interval` seconds),
+        until `stop_heartbeat` is called.
+        """
+        self.heartbeat(state)
+        if get_status_table(self.data_dir) is None:
+            return
+        interval = interval or int(config("CRONMAN_WORKER_HEARTBEAT_INTERVAL"))
+        self._stop_heartbeat.clear()
+        self._heartbeat_thread = threading.Thread(
+            target=self._heartbeat_periodically,
+            args=(interval,),
+            name="worker-heartbeat-{}".format(self.name),
+        )
+        self._heartbeat_thread.daemon = True
+        self._heartbeat_thread.start()
+
+    def stop_heartbeat(self, state=None):
+        """Stops the background heartbeat, updates worker's state"""
+        if self._heartbeat_thread:
+            self._stop_heartbeat.set()
+            self._heartbeat_thread.join()
+            self._heartbeat_thread = None
+        self.heartbeat(state)
+
+    def _heartbeat_periodically(self, interval):
+        """Body of background heartbeat thread"""
+        while not self._stop_heartbeat.wait(interval):
+            self.heartbeat()
+
+    def _update_status_table(self, method_name, *args):
+        """Calls status table method, if the table is enabled"""
+        table = get_status_table(self.data_dir)
+        if table is not None:
+            try:
+                getattr(table, method_name)(*args)
+            finally:
+                table.close()
+
+    def is_locked(self, timeout=0):
+        """Checks if this file is locked by running process.
+        Waits up to `timeout` seconds for the lock to be released.
+        """
+        deadline = time.time() + timeout
+        while self._check_locked():
+            if time.time() >= deadline:
+                return True
+            time.sleep(self.lock_poll_interval)
+        return False
+
+    def _try_acquire(self, info):
+        """Single non-blocking attempt to acquire the lock"""
+        fd = self._lock()
+        if fd is None:
+            return False
+        if self._locked_by_other_process(fd):
+            os.close(fd)
+            return False
+        self._write_info(fd, info)
+        self.lock_fd = fd
+        self.register()
+        return True
+
+    def _lock(self):
+        """Opens (creates) this file and takes exclusive `flock` on it
+        (non-blocking). Returns file descriptor or None if lock is taken.
+        """
+        while True:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            if not self._flock(fd, fcntl.LOCK_EX):
+                os.close(fd)
+                return None
+            try:
+                same_file = os.path.samestat(os.fstat(fd), os.stat(self.path))
+            except OSError:
+                same_file = False
+            if same_file:
+                return fd
+            # File has been deleted by previous owner, try again:
+            os.close(fd)
+
+    def _write_info(self, fd, info):
+        """Replaces content of the file opened by this process
+        (always in place - the lock is bound to the inode)
+        """
+        os.ftruncate(fd, 0)
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.write(fd, force_bytes(json.dumps(info)))
+        if get_durability() == DataDirDurability.FSYNC:
+            os.fsync(fd)
+        self.__dict__["info"] = info  # Bypass `info` property
+        for attribute in (
+            "pid",
+            "process",
+            "started_at",
+            "kill_grace_seconds",
+            "job_key",
+        ):
+            self.__dict__.pop(attribute, None)
+
+    def _check_locked(self):
+        """Single non-blocking check if this file is locked.
+        Lock is looked up in `/proc/locks` - taking it here (even shared
+        for a moment) would make `_try_acquire` of a new worker fail.
+        """
+        try:
+            fd = os.open(self.path, os.O_RDONLY)
+        except OSError:  # No PID file
+            return False
+        try:
+            flock_inodes = get_flock_inodes()
+            if flock_inodes is not None:
+                locked = os.fstat(fd).st_ino in flock_inodes
+            else:  # No `/proc/locks`, shared lock taken for a moment:
+                locked = not self._flock(fd, fcntl.LOCK_SH)
+            if not locked:
+                locked = self._locked_by_other_process(fd)
+        finally:
+            os.close(fd)
+        return locked
+
+    @staticmethod
+    def _flock(fd, operation):
+        """Non-blocking `flock` call, returns False if lock is taken"""
+        try:
+            fcntl.flock(fd, operation | fcntl.LOCK_NB)
+        except (IOError, OSError) as error:
+            if error.errno in (errno.EAGAIN, errno.EACCES):
+                return False
+            raise
+        return True
+
+    @classmethod
+    def _locked_by_other_process(cls, fd):
+        """Checks if PID file (opened and flock-ed) belongs to other alive
+        process which does not use `flock` (started by older version).
+        """
+        info = cls.parse_info(force_text(os.read(fd, 4096)))
+        pid = info["pid"]
+        if not pid or pid == os.getpid():  # Empty or truncated file
+            return False
+        process = ProcessManager(pid, info.get("process_start_time"))
+        return process.alive() is not False
+
+    @cached_property
+    def info(self):
+        """Information extracted from this file (single read)"""
+        return self.parse_info(self.read_content())
 
     @cached_property
     def pid(self):
         """PID extracted from this file"""
-        try:
-            pid = int(self.read_content())
-        except (ValueError, TypeError):  # PID file deleted / truncated
-            pid = None
-        return pid
+        return self.info["pid"]
+
+    @cached_property
+    def job_key(self):
+        """Name of the job with params hash (as in names of PID files
+        locked by params) extracted from this file
+        """
+        return self.info.get("job_key")
+
+    @cached_property
+    def started_at(self):
+        """Start timestamp of the job extracted from this file"""
+        return self.info.get("started_at")
+
+    @cached_property
+    def kill_grace_seconds(self):
+        """Time between SIGTERM and SIGKILL on kill (None - default)"""
+        return self.info.get("kill_grace_seconds")
 
     @cached_property
     def process(self):
         """Process Manager instance for this PID file"""
-        return ProcessManager(self.pid)  # ProcessManager can handle `None`
+        # ProcessManager can handle `None`:
+        return ProcessManager(
+            self.pid,
+            self.info.get("process_start_time"),
+            self.info.get("pgid"),
+        )
 
     def exists_with_alive_process(self):
         """Checks if PID file exists and corresponding process is alive.
@@ -139,12 +590,112 @@ class CronWorkerPIDFile(BaseCronWorkerFile):
         """JobSpec file associated with this file"""
         return CronWorkerJobSpecFile(self.data_dir, self.name)
 
+    @cached_property
+    def rerun_file(self):
+        """Re-run request file associated with this file"""
+        return CronWorkerRerunFile(self.data_dir, self.name)
+
+    def get_free_job_spec_file(self):
+        """JobSpec file for new job to be resumed (e.g. handed off by other
+        host) under this lock
+        """
+        return self.job_spec_file
+
+
+class CronWorkerSlotPIDFile(CronWorkerPIDFile):
+    """PID file (and lock) for Cron Worker - one of N slots shared by
+    a group of workers (counting semaphore).
+    First free slot file (`<group>_slot<N>.pid`) is acquired.
+    """
+
+    SLOT_NAME_REGEX = re.compile(r"_slot\d+$")
+
+    def __init__(self, data_dir, group_name, slots):
+        self.group_name = group_name
+        self.slots = slots
+        self.slot = None
+        super(CronWorkerSlotPIDFile, self).__init__(
+            data_dir, self.get_slot_name(group_name, 1)
+        )
+
+    @staticmethod
+    def get_slot_name(group_name, slot):
+        """Generates file name for given slot number"""
+        return "{}_slot{}".format(group_name, slot)
+
+    def get_free_job_spec_file(self):
+        """JobSpec file for new job to be resumed (e.g. handed off by other
+        host) - named after first slot without JobSpec file or worker,
+        numbers beyond `slots` are used when all of them are taken
+        """
+        slot = 0
+        while True:
+            slot += 1
+            slot_file = CronWorkerPIDFile(
+                self.data_dir, self.get_slot_name(self.group_name, slot)
+            )
+            if slot_file.job_spec_file.exists():
+                continue
+            if slot_file.exists() and (
+                slot_file.is_locked() or slot_file.info.get("job_spec")
+            ):
+                continue
+            return slot_file.job_spec_file
+
+    def get_slot_files(self):
+        """Retrieves PID files of all slots in the group"""
+        return [
+            CronWorkerPIDFile(
+                self.data_dir, self.get_slot_name(self.group_name, slot)
+            )
+            for slot in range(1, self.slots + 1)
+        ]
+
+    @cached_property
+    def rerun_file(self):
+        """Re-run request file shared by all slots in the group"""
+        return CronWorkerRerunFile(self.data_dir, self.group_name)
+
+    def _try_acquire(self, info):
+        """Single non-blocking attempt to acquire any of the slots"""
+        for slot, slot_file in enumerate(self.get_slot_files(), 1):
+            if slot_file._try_acquire(info):
+                self.name = slot_file.name
+                self.path = slot_file.path
+                self.lock_fd = slot_file.lock_fd
+                self.__dict__["info"] = info  # Bypass `info` property
+                self.slot = slot
+                return True
+        return False
+
+    def _check_locked(self):
+        """Single non-blocking check if all slots are taken"""
+        return all(
+            slot_file._check_locked() for slot_file in self.get_slot_files()
+        )
+
 
 class CronWorkerJobSpecFile(BaseCronWorkerFile):
-    """JobSpec file for Cron Worker's running jobs with resume feature"""
+    """JobSpec file for Cron Worker's running jobs with resume feature.
+    Workers store job spec in PID file (v2), separate JobSpec files are
+    left by older workers.
+    """
 
     EXTENSION = ".jobspec"
 
+    @classmethod
+    def all(cls, data_dir, name=None, args=None, kwargs=None):
+        """Iterates over JobSpec files and PID files with job spec"""
+        names = set()
+        for job_spec_file in super(CronWorkerJobSpecFile, cls).all(
+            data_dir, name, args, kwargs
+        ):
+            names.add(job_spec_file.name)
+            yield job_spec_file
+        for pid_file in CronWorkerPIDFile.all(data_dir, name, args, kwargs):
+            if pid_file.name not in names and pid_file.info.get("job_spec"):
+                yield CronWorkerPIDJobSpecFile(pid_file)
+
     @classmethod
     def by_pid(cls, data_dir, pid):
         """Retrieves JobSpec file from given directory by PID value"""
@@ -153,7 +704,10 @@ class CronWorkerJobSpecFile(BaseCronWorkerFile):
         if pid_file:
             job_spec_file = cls(data_dir, pid_file.name)
             if not job_spec_file.exists():
-                job_spec_file = None
+                if pid_file.info.get("job_spec"):
+                    job_spec_file = CronWorkerPIDJobSpecFile(pid_file)
+                else:
+                    job_spec_file = None
         return job_spec_file
 
     def create(self, job_spec):
@@ -164,13 +718,24 @@ class CronWorkerJobSpecFile(BaseCronWorkerFile):
     def resume(self):
         """Starts a worker process for job spec stored in this file"""
         job_spec = self.job_spec
+        attempt = self.resume_attempt + 1
         self.delete()  # file is deleted before spawning new worker
         if job_spec:
+            self.cron_spawner.extra_env["CRON_PROCESS_RESUME_ATTEMPT"] = str(
+                attempt
+            )
             pid = self.cron_spawner.start_worker(job_spec)
         else:
             pid = None
         return pid
 
+    @cached_property
+    def resume_attempt(self):
+        """Number of consecutive resumes of the job which left this file
+        (stored in PID file by resumed worker)
+        """
+        return self.pid_file.info.get("resume_attempt") or 0
+
     @cached_property
     def job_spec(self):
         """JobSpec extracted from this file"""
@@ -184,6 +749,149 @@ class CronWorkerJobSpecFile(BaseCronWorkerFile):
     @cached_property
     def cron_spawner(self):
         """Cron Spawner instance"""
+        # Imported only when JobSpec files are resumed, so listing workers
+        # stays cheap (e.g. `cronman-status`):
+        from cronman.spawner import CronSpawner
+
         return CronSpawner(
             data_dir=self.data_dir, extra_env={"CRON_PROCESS_RESUMED": "1"}
         )
+
+
+class CronWorkerPIDJobSpecFile(CronWorkerJobSpecFile):
+    """Job spec stored in PID file (v2) - used as JobSpec file"""
+
+    def __init__(self, pid_file):
+        super(CronWorkerPIDJobSpecFile, self).__init__(
+            pid_file.data_dir, pid_file.name
+        )
+        self.path = pid_file.path
+        self.__dict__["pid_file"] = pid_file  # Bypass `pid_file` property
+        self.__dict__["job_spec"] = pid_file.info.get("job_spec")
+
+    def delete(self):
+        """Deletes the PID file"""
+        self.pid_file.delete()
+
+    def exists(self):
+        """Checks if the PID file exists"""
+        return self.pid_file.exists()
+
+
+class CronWorkerRerunFile(BaseCronWorkerFile):
+    """Request to re-run a cron job, left by worker which couldn't acquire
+    the lock (`coalesce_locked` option) for the process holding it.
+    """
+
+    EXTENSION = ".rerun"
+
+    def create(self, job_spec):
+        """Adds a request to the file. Writers and `pop_all` are serialized
+        with `flock`, so concurrent requests are not lost.
+        """
+        while True:
+            fd = os.open(
+                self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644
+            )
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                try:
+                    same_file = os.path.samestat(
+                        os.fstat(fd), os.stat(self.path)
+                    )
+                except OSError:
+                    same_file = False
+                if same_file:
+                    os.write(fd, force_bytes(job_spec + "\n"))
+                    return
+                # File has been claimed by `pop_all`, try again
+            finally:
+                os.close(fd)
+
+    def pop_all(self):
+        """Retrieves job specs of all requests (oldest first) and deletes
+        the file. Returns empty list if there are no requests.
+        """
+        claimed_path = "{}.{}".format(self.path, os.getpid())
+        try:
+            os.rename(self.path, claimed_path)  # atomic claim
+        except OSError:  # No requests
+            return []
+        try:
+            with open(claimed_path, "rb") as file_:
+                fcntl.flock(file_.fileno(), fcntl.LOCK_EX)  # Pending writes
+                content = force_text(file_.read())
+        finally:
+            os.unlink(claimed_path)
+        return [job_spec for job_spec in content.splitlines() if job_spec]
+
+
+class CronWorkerStatsFile(BaseCronWorkerFile):
+    """Stats file with records (JSON lines) of recent runs of a cron job"""
+
+    EXTENSION = ".stats"
+    max_records = 20
+
+    @property
+    def lock_path(self):
+        """Path of the lock file"""
+        return self.path + ".lock"
+
+    def _lock(self):
+        """Opens and locks (`flock`) the lock file, returns its descriptor"""
+        while True:
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                same_file = os.path.samestat(
+                    os.fstat(fd), os.stat(self.lock_path)
+                )
+            except OSError:
+                same_file = False
+            if same_file:
+                return fd
+            # Lock file has been deleted (`delete`), try again:
+            os.close(fd)
+
+    def add(self, record):
+        """Appends a new record, keeps only `max_records` most recent ones.
+        Concurrent updates (workers of the same job) are serialized with
+        `flock` on separate lock file - stats file may be replaced by rename.
+        """
+        fd = self._lock()
+        try:
+            self.__dict__.pop("records", None)  # Read again under the lock
+            records = self.records[-(self.max_records - 1) :] + [record]
+            self.write_content(
+                "".join(json.dumps(item) + "\n" for item in records)
+            )
+        finally:
+            os.close(fd)  # Releases the lock
+        self.__dict__["records"] = records  # Bypass `records` property
+
+    def delete(self):
+        """Deletes this file together with its lock file"""
+        fd = self._lock()
+        try:
+            super(CronWorkerStatsFile, self).delete()
+            os.unlink(self.lock_path)
+        finally:
+            os.close(fd)
+
+    def age(self):
+        """Number of seconds since the last update (or None)"""
+        try:
+            return max(0.0, time.time() - os.path.getmtime(self.path))
+        except OSError:  # File deleted already
+            return None
+
+    @cached_property
+    def records(self):
+        """Records extracted from this file"""
+        records = []
+        for line in (self.read_content() or "").splitlines():
+            try:
+                records.append(json.loads(line))
+            except ValueError:  # Truncated line
+                continue
+        return records
@@ -7,10 +7,19 @@ import logging
 import time
 from collections import OrderedDict
 
-from cronman.exceptions import PIDAccessError
-from cronman.taxonomies import JobSpecStatus, PIDStatus
+from cronman.exceptions import CronJobNotRegistered
+from cronman.taxonomies import JobSpecStatus, PIDStatus, StatsFileStatus
 from cronman.utils import format_exception, parse_job_spec
-from cronman.worker.worker_file import CronWorkerJobSpecFile, CronWorkerPIDFile
+from cronman.worker.process_manager import (
+    ProcessManager,
+    get_process_table,
+    wait_for_exit,
+)
+from cronman.worker.worker_file import (
+    CronWorkerJobSpecFile,
+    CronWorkerPIDFile,
+    CronWorkerStatsFile,
+)
 
 logger = logging.getLogger("cronman.command.cron_worker")
 
@@ -37,19 +46,59 @@ class BaseCronWorkerList(object):
                 name, args, kwargs = parse_job_spec(job_spec)
             # Files sorted by name:
             files = sorted(
-                self.file_class.all(data_dir, name, args, kwargs),
+                self.get_files(data_dir, name, args, kwargs),
                 key=lambda pf: pf.name,
             )
         self.data_dir = data_dir
         self.files = files
         self.logger = logger
 
+    def get_files(self, data_dir, name, args, kwargs):
+        """Retrieves files to be listed"""
+        return self.file_class.all(data_dir, name, args, kwargs)
+
 
 class CronWorkerPIDList(BaseCronWorkerList):
-    """Listing and killing Cron Worker processes through PID files"""
+    """Listing and killing Cron Worker processes through PID files.
+    Workers are listed from status table if available, PID files in data
+    directory are scanned otherwise (or if `scan_files` is set).
+    """
 
     file_class = CronWorkerPIDFile
-    wait_to_kill = 7
+    wait_to_kill = 7  # default grace period (seconds) between TERM and KILL
+
+    def __init__(
+        self,
+        data_dir,
+        job_spec=None,
+        name=None,
+        args=None,
+        kwargs=None,
+        pid=None,
+        scan_files=False,
+    ):
+        self.scan_files = scan_files
+        super(CronWorkerPIDList, self).__init__(
+            data_dir,
+            job_spec=job_spec,
+            name=name,
+            args=args,
+            kwargs=kwargs,
+            pid=pid,
+        )
+
+    def get_files(self, data_dir, name, args, kwargs):
+        """Retrieves PID files of registered workers (status table),
+        or all PID files from data directory (`scan_files` or fallback).
+        Files of unregistered workers (e.g. started before the table was
+        enabled) are listed by the scan only (`clean`).
+        """
+        files = None
+        if not self.scan_files:
+            files = self.file_class.registered(data_dir, name, args, kwargs)
+        if files is None:
+            files = self.file_class.all(data_dir, name, args, kwargs)
+        return files
 
     def _iter_status_items(self):
         """Iterator over status information dicts extracted from files"""
@@ -57,6 +106,8 @@ class CronWorkerPIDList(BaseCronWorkerList):
             pid = pid_file.pid
             process_exists = pid_file.process.exists()
             if process_exists is None:
+                from cronman.exceptions import PIDAccessError
+
                 error = PIDAccessError(
                     "{} No access to PID {}!".format(pid_file.name, pid)
                 )
@@ -73,32 +124,77 @@ class CronWorkerPIDList(BaseCronWorkerList):
             item["_pid_file"] = pid_file
             yield item
 
-    def status(self):
-        """Retrieves status information about listed PID files"""
+    def status(self, process_tree=True):
+        """Retrieves status information about listed PID files,
+        with descendant processes of alive workers if `process_tree` is set
+        """
         items = []
         totals = OrderedDict()
         totals["TOTAL"] = 0
         totals[PIDStatus.ALIVE] = 0
         totals[PIDStatus.DEAD] = 0
+        process_table = None
         for item in self._iter_status_items():
+            if process_tree and item["status"] == PIDStatus.ALIVE:
+                if process_table is None:  # single `/proc` scan
+                    process_table = get_process_table() or False
+                if process_table:
+                    self._add_process_tree_info(item, process_table)
             totals[item["status"]] += 1
             totals["TOTAL"] += 1
             items.append(item)
         return items, totals
 
-    def clean(self):
-        """Removes dead PID files"""
+    @staticmethod
+    def _add_process_tree_info(item, process_table):
+        """Adds number of descendant processes and their total RSS
+        (including worker process) to status item, when available
+        """
+        process = item["_pid_file"].process
+        descendants = process.descendants(process_table)
+        if descendants is None:
+            return
+        memory_usage = process.memory_usage(descendants)
+        if memory_usage is None:
+            return
+        item["descendants"] = "{} descendant(s)".format(len(descendants))
+        item["rss"] = "{:.1f} MB RSS".format(memory_usage / 1024.0 / 1024.0)
+
+    def clean(self, keep_resumable=False, time_limit=None, start_after=None):
+        """Removes dead PID files.
+        Options of incremental cleanup (scheduler):
+        * `keep_resumable` - keeps files holding job spec of resumable job
+          (candidates for `resume`),
+        * `time_limit` - stops after given number of seconds,
+        * `start_after` - starts with files following given name
+          (and wraps around).
+        Numbers of kept and not checked files and name of the last checked
+        one are stored in `clean_stats`.
+        """
+        if start_after is not None:
+            self.files = [f for f in self.files if f.name > start_after] + [
+                f for f in self.files if f.name <= start_after
+            ]
+        deadline = None if time_limit is None else time.time() + time_limit
+        self.clean_stats = {"kept": 0, "unchecked": 0, "last_checked": None}
         items = []
         totals = OrderedDict()
         totals["TOTAL"] = 0
+        num_checked = 0
         for item in self._iter_status_items():
-            if item["status"] == PIDStatus.DEAD:
-                item["_pid_file"].delete()
-                item["status"] = PIDStatus.DELETED
-            else:
-                continue
-            totals["TOTAL"] += 1
-            items.append(item)
+            num_checked += 1
+            self.clean_stats["last_checked"] = item["name"]
+            # File without PID may have been just created by new worker:
+            if item["status"] == PIDStatus.DEAD and item["pid"]:
+                if keep_resumable and item["_pid_file"].info.get("job_spec"):
+                    self.clean_stats["kept"] += 1
+                elif item["_pid_file"].delete_unlocked():
+                    item["status"] = PIDStatus.DELETED
+                    totals["TOTAL"] += 1
+                    items.append(item)
+            if deadline is not None and time.time() >= deadline:
+                self.clean_stats["unchecked"] = len(self.files) - num_checked
+                break
         return items, totals
 
     def kill(self):
@@ -119,27 +215,50 @@ class CronWorkerPIDList(BaseCronWorkerList):
             items.append(item)
         # Round 2: wait and KILL:
         if at_least_one_termed:
-            wait = True
-            for item in items:
-                if (
-                    item["status"] == PIDStatus.TERMED
-                    and item["_pid_file"].process.alive()
-                ):
-                    # Sleep only once, before first kill:
-                    if wait:
-                        time.sleep(self.wait_to_kill)
-                        wait = False
-                        # Skip if process finished while we were sleeping:
-                        if not item["_pid_file"].process.alive():
-                            continue
-                    item["_pid_file"].process.kill()
-                    item["status"] = PIDStatus.KILLED
+            self._wait_and_kill(
+                [item for item in items if item["status"] == PIDStatus.TERMED]
+            )
         # Update totals:
         for item in items:
             totals[item["status"]] += 1
             totals["TOTAL"] += 1
         return items, totals
 
+    def _wait_and_kill(self, termed_items):
+        """Waits for terminated processes to exit and kills the ones which
+        outlive their grace period (`kill_grace_seconds` of the cron job
+        class or `wait_to_kill`). Returns as soon as all processes are gone.
+        """
+        now = time.time()
+        deadlines = {
+            item["pid"]: now + self.get_grace_period(item)
+            for item in termed_items
+        }
+        pending = termed_items
+        while pending:
+            timeout = min(deadlines[item["pid"]] for item in pending) - now
+            alive_processes = wait_for_exit(
+                [item["_pid_file"].process for item in pending],
+                max(timeout, 0),
+            )
+            alive_pids = {process.pid for process in alive_processes}
+            now = time.time()
+            still_pending = []
+            for item in pending:
+                if item["pid"] not in alive_pids:
+                    continue  # finished while we were waiting
+                if deadlines[item["pid"]] <= now:
+                    item["_pid_file"].process.kill()
+                    item["status"] = PIDStatus.KILLED
+                else:
+                    still_pending.append(item)
+            pending = still_pending
+
+    def get_grace_period(self, item):
+        """Seconds to wait for the worker to exit after SIGTERM"""
+        grace_period = item["_pid_file"].kill_grace_seconds
+        return self.wait_to_kill if grace_period is None else grace_period
+
 
 class CronWorkerJobSpecList(BaseCronWorkerList):
     """Listing and resuming Cron Worker processes through JobSpec files"""
@@ -153,6 +272,8 @@ class CronWorkerJobSpecList(BaseCronWorkerList):
             if pid_file.exists():
                 process_exists = pid_file.process.exists()
                 if process_exists is None:
+                    from cronman.exceptions import PIDAccessError
+
                     error = PIDAccessError(
                         "{} No access to PID {}!".format(
                             pid_file.name, pid_file.pid
@@ -201,19 +322,123 @@ class CronWorkerJobSpecList(BaseCronWorkerList):
             items.append(item)
         return items, totals
 
-    def resume(self):
-        """Starts Cron Worker process for each stalled JobSpec file (resume)"""
+    def resume(self, max_started=None, max_concurrent=None, max_attempts=None):
+        """Starts Cron Worker process for each stalled JobSpec file (resume),
+        in order of `resume_priority` of cron job classes.
+        Throttling options (remaining files are left for next call,
+        status PENDING):
+        * `max_started` - max number of workers started by this call,
+        * `max_concurrent` - max number of running workers.
+        Files of jobs resumed `max_attempts` times in a row (e.g. crashing
+        right after start) are deleted (status ABANDONED).
+        """
         items = []
         totals = OrderedDict()
         totals["TOTAL"] = 0
-        for item in self._iter_status_items():
-            if item["status"] == JobSpecStatus.STALLED:
-                pid = item["_job_spec_file"].resume()  # file gets deleted
+        stalled_items = sorted(
+            (
+                item
+                for item in self._iter_status_items()
+                if item["status"] == JobSpecStatus.STALLED
+            ),
+            key=lambda item: (
+                -self.get_resume_priority(item["job_spec"]),
+                item["name"],
+            ),
+        )
+        if max_concurrent is not None:
+            num_running = self.get_num_running_workers()
+        num_started = 0
+        for item in stalled_items:
+            job_spec_file = item["_job_spec_file"]
+            if max_attempts and job_spec_file.resume_attempt >= max_attempts:
+                job_spec_file.delete()
+                item["status"] = JobSpecStatus.ABANDONED
+                self.logger.warning(
+                    'Resume of "{}" abandoned after {} attempt(s).'.format(
+                        item["job_spec"], job_spec_file.resume_attempt
+                    )
+                )
+            elif (max_started is not None and num_started >= max_started) or (
+                max_concurrent is not None and num_running >= max_concurrent
+            ):
+                item["status"] = JobSpecStatus.PENDING
+            else:
+                pid = job_spec_file.resume()  # file gets deleted
                 if pid is None:
                     continue
                 item["status"] = JobSpecStatus.RESUMED
-            else:
+                num_started += 1
+                if max_concurrent is not None:
+                    num_running += 1
+                totals["TOTAL"] += 1
+                items.append(item)
+                continue
+            totals[item["status"]] = totals.get(item["status"], 0) + 1
+            items.append(item)
+        return items, totals
+
+    def handoff(self, remote_manager):
+        """Publishes job spec of each stalled JobSpec file through Remote
+        Manager, so it can be resumed on other host. Files are deleted once
+        published, unpublished ones are left for local resume.
+        """
+        items = []
+        totals = OrderedDict()
+        totals["TOTAL"] = 0
+        for item in self._iter_status_items():
+            if item["status"] != JobSpecStatus.STALLED:
+                continue
+            if not item["job_spec"] or not remote_manager.handoff(
+                item["job_spec"]
+            ):
                 continue
+            item["_job_spec_file"].delete()
+            item["status"] = JobSpecStatus.HANDED_OFF
+            totals["TOTAL"] += 1
+            items.append(item)
+        return items, totals
+
+    @staticmethod
+    def get_resume_priority(job_spec):
+        """`resume_priority` of cron job class (0 if not registered)"""
+        from cronman.job import cron_job_registry
+
+        try:
+            name = parse_job_spec(job_spec or "")[0]
+            cron_job_info = cron_job_registry.get_info(name)
+        except (CronJobNotRegistered, ValueError):
+            return 0
+        return cron_job_info.get("resume_priority") or 0
+
+    def get_num_running_workers(self):
+        """Number of running Cron Worker processes"""
+        pid_files = CronWorkerPIDList(self.data_dir).files
+        alive = ProcessManager.alive_many(
+            [pid_file.process for pid_file in pid_files]
+        )
+        return sum(1 for value in alive.values() if value)
+
+
+class CronWorkerStatsList(BaseCronWorkerList):
+    """Listing and removing Stats files"""
+
+    file_class = CronWorkerStatsFile
+
+    def clean(self, max_age):
+        """Removes Stats files not updated for `max_age` seconds"""
+        items = []
+        totals = OrderedDict()
+        totals["TOTAL"] = 0
+        for stats_file in self.files:
+            age = stats_file.age()
+            if age is None or age < max_age:
+                continue
+            stats_file.delete()
+            item = OrderedDict()
+            item["name"] = stats_file.name
+            item["status"] = StatsFileStatus.DELETED
+            item["age"] = "{} day(s) old".format(int(age // (24 * 3600)))
             totals["TOTAL"] += 1
             items.append(item)
         return items, totals
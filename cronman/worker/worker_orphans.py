@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+# vi:si:et:sw=4:sts=4:ts=4
+
+from __future__ import unicode_literals
+
+import os
+import time
+from collections import OrderedDict
+
+from cronman.exceptions import CronJobNotRegistered, CronWorkerInvalidParams
+from cronman.taxonomies import OrphanStatus
+from cronman.worker.process_manager import (
+    ProcessManager,
+    get_all_pids,
+    get_process_cmdline,
+    get_process_environ,
+    get_process_start_time,
+)
+from cronman.worker.worker_list import CronWorkerPIDList
+
+
+def parse_worker_cmdline(args):
+    """Retrieves job spec from command line of `cron_worker run` process,
+    None for other processes
+    """
+    for i, arg in enumerate(args[:-2]):
+        if arg == "cron_worker" and args[i + 1] == "run":
+            return args[i + 2]
+    return None
+
+
+class CronWorkerOrphanList(object):
+    """Running Cron Worker processes without PID files (orphans), found by
+    scanning `/proc/*/cmdline` - e.g. after data directory has been wiped.
+    Only processes using the same data directory (`CRONMAN_DATA_DIR`
+    in process environment) are taken into account.
+    """
+
+    min_age = 60  # seconds, younger workers may not have created PID file yet
+
+    def __init__(self, cron_worker):
+        self.cron_worker = cron_worker
+        self.data_dir = cron_worker.data_dir
+        self.logger = cron_worker.logger
+
+    def find(self):
+        """Retrieves list of orphaned processes: dicts with PID, job spec,
+        process start time and cron job class (None if not registered)
+        """
+        known_pids = {
+            pid_file.pid
+            for pid_file in CronWorkerPIDList(
+                self.data_dir, scan_files=True
+            ).files
+        }
+        known_pids.add(os.getpid())
+        data_dir = os.path.realpath(self.data_dir)
+        now = time.time()
+        orphans = []
+        for pid in get_all_pids():
+            if pid in known_pids:
+                continue
+            job_spec = parse_worker_cmdline(get_process_cmdline(pid) or [])
+            if job_spec is None:
+                continue
+            environ = get_process_environ(pid) or {}
+            if "CRONMAN_DATA_DIR" not in environ or (
+                os.path.realpath(environ["CRONMAN_DATA_DIR"]) != data_dir
+            ):
+                continue  # other project or unknown data directory
+            start_time = get_process_start_time(pid)
+            try:
+                cron_job_class = self.cron_worker.parse_job_spec_with_class(
+                    job_spec
+                )[3]
+            except (CronJobNotRegistered, CronWorkerInvalidParams):
+                cron_job_class = None
+            lock_wait_timeout = (
+                self.cron_worker.get_lock_wait_timeout(cron_job_class)
+                if cron_job_class
+                else 0
+            )
+            if start_time and now - start_time < (
+                self.min_age + (lock_wait_timeout or 0)
+            ):
+                continue  # may be still starting or waiting for the lock
+            orphans.append(
+                {
+                    "pid": pid,
+                    "job_spec": job_spec,
+                    "start_time": start_time,
+                    "cron_job_class": cron_job_class,
+                }
+            )
+        return orphans
+
+    def status(self):
+        """Retrieves status information about orphaned processes"""
+        return self._process(lambda orphan: OrphanStatus.ORPHAN)
+
+    def adopt(self):
+        """Creates PID files for orphaned processes. Processes of jobs
+        locked by other workers (lock violations) are terminated.
+        """
+        return self._process(self._adopt)
+
+    def kill(self):
+        """Terminates orphaned processes"""
+        return self._process(self._terminate)
+
+    def _process(self, action):
+        """Applies given action to orphaned processes.
+        Returns list of status items and totals.
+        """
+        items = []
+        totals = OrderedDict()
+        totals["TOTAL"] = 0
+        for orphan in self.find():
+            item = OrderedDict()
+            item["job_spec"] = orphan["job_spec"]
+            item["status"] = action(orphan)
+            item["pid"] = orphan["pid"]
+            totals[item["status"]] = totals.get(item["status"], 0) + 1
+            totals["TOTAL"] += 1
+            items.append(item)
+        return items, totals
+
+    def _adopt(self, orphan):
+        """Creates PID file for orphaned process, if its lock is free"""
+        cron_job_class = orphan["cron_job_class"]
+        if cron_job_class is None:
+            return OrphanStatus.IGNORED
+        name, args, kwargs = self.cron_worker.parse_job_spec_with_class(
+            orphan["job_spec"]
+        )[:3]
+        pid_file = self.cron_worker.get_pid_file(
+            cron_job_class, name, args, kwargs
+        )
+        slot_files = getattr(pid_file, "get_slot_files", None)
+        for candidate in slot_files() if slot_files else [pid_file]:
+            if candidate.adopt(
+                orphan["pid"],
+                job_spec=orphan["job_spec"],
+                can_resume=cron_job_class.can_resume,
+                kill_grace_seconds=cron_job_class.kill_grace_seconds,
+            ):
+                self.logger.warning(
+                    'Orphaned worker "{}" (PID {}) adopted.'.format(
+                        orphan["job_spec"], orphan["pid"]
+                    )
+                )
+                return OrphanStatus.ADOPTED
+        return self._terminate(orphan)
+
+    def _terminate(self, orphan):
+        """Terminates orphaned process"""
+        ProcessManager(orphan["pid"], orphan["start_time"]).terminate()
+        self.logger.warning(
+            'Orphaned worker "{}" (PID {}) terminated.'.format(
+                orphan["job_spec"], orphan["pid"]
+            )
+        )
+        return OrphanStatus.TERMED
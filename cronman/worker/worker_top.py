@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+# vi:si:et:sw=4:sts=4:ts=4
+
+from __future__ import unicode_literals
+
+import ctypes
+import ctypes.util
+import os
+import select
+import statistics
+import time
+from collections import OrderedDict
+
+from cronman.exceptions import CronJobNotRegistered, CronWorkerInvalidParams
+from cronman.job import cron_job_registry
+from cronman.worker.process_manager import (
+    ProcessManager,
+    get_process_cpu_time,
+    get_process_io,
+    get_process_rss,
+    get_process_start_time,
+)
+from cronman.worker.worker_file import CronWorkerStatsFile
+from cronman.worker.worker_list import CronWorkerPIDList
+
+# inotify(7) constants:
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+IN_WATCH_MASK = (
+    0x00000100  # IN_CREATE
+    | 0x00000200  # IN_DELETE
+    | 0x00000040  # IN_MOVED_FROM
+    | 0x00000080  # IN_MOVED_TO
+)
+
+
+class DirectoryWatcher(object):
+    """Waits for files being created or deleted in a directory (inotify),
+    falls back to sleeping when inotify is not available.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.fd = None
+        libc_name = ctypes.util.find_library("c")
+        try:
+            libc = ctypes.CDLL(libc_name, use_errno=True)
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        except (OSError, AttributeError):  # Not Linux
+            return
+        if fd < 0:
+            return
+        if libc.inotify_add_watch(fd, os.fsencode(path), IN_WATCH_MASK) < 0:
+            os.close(fd)
+            return
+        self.fd = fd
+
+    def wait(self, timeout):
+        """Waits up to `timeout` seconds for a change in the directory.
+        Returns True if a change was detected.
+        """
+        if self.fd is None:
+            time.sleep(timeout)
+            return False
+        readable = select.select([self.fd], [], [], timeout)[0]
+        if readable:
+            try:
+                while os.read(self.fd, 4096):  # Drain pending events
+                    pass
+            except (IOError, OSError):  # EAGAIN - no more events
+                pass
+        return bool(readable)
+
+    def close(self):
+        """Closes inotify file descriptor"""
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class CronWorkerTop(object):
+    """Resource usage of running Cron Worker processes, read from `/proc`.
+    Only processes of registered workers are read on each refresh, so
+    it's cheap enough to keep running on a loaded host.
+    CPU% is computed between consecutive samples (over process lifetime
+    for the first one).
+    """
+
+    SORT_KEYS = OrderedDict(
+        [
+            ("cpu", ("_cpu_percent", True)),
+            ("rss", ("_rss", True)),
+            ("elapsed", ("_elapsed", True)),
+            ("io", ("_io", True)),
+            ("name", ("name", False)),
+            ("pid", ("pid", False)),
+        ]
+    )
+    HEADER = "\t".join(
+        [
+            "NAME",
+            "PID",
+            "CPU%",
+            "RSS",
+            "ELAPSED",
+            "MEDIAN",
+            "READ",
+            "WRITTEN",
+            "CPU PRIORITY",
+        ]
+    )
+
+    def __init__(self, data_dir, sort_by=None):
+        sort_by = sort_by or "cpu"
+        if sort_by not in self.SORT_KEYS:
+            raise CronWorkerInvalidParams(
+                'Invalid sort key "{}". Choices: {}.'.format(
+                    sort_by, ", ".join(self.SORT_KEYS)
+                )
+            )
+        self.data_dir = data_dir
+        self.sort_by = sort_by
+        self.cpu_samples = {}  # {(pid, start time): (CPU time, timestamp)}
+        self.medians = {}  # {cron job name: (stats mtime, median duration)}
+
+    def items(self):
+        """Retrieves list of resource usage dicts of running workers,
+        sorted according to `sort_by`
+        """
+        pid_files = [
+            pid_file
+            for pid_file in CronWorkerPIDList(self.data_dir).files
+            if pid_file.pid is not None
+        ]
+        alive = ProcessManager.alive_many(
+            [pid_file.process for pid_file in pid_files]
+        )
+        cpu_samples = {}
+        items = []
+        for pid_file in pid_files:
+            if alive[pid_file.pid]:
+                item = self.get_item(pid_file, cpu_samples)
+                if item is not None:
+                    items.append(item)
+        self.cpu_samples = cpu_samples
+        key, reverse = self.SORT_KEYS[self.sort_by]
+        items.sort(key=lambda item: item[key], reverse=reverse)
+        return items
+
+    def get_item(self, pid_file, cpu_samples):
+        """Resource usage dict of single worker process"""
+        pid = pid_file.pid
+        now = time.time()
+        cpu_time = get_process_cpu_time(pid)
+        if cpu_time is None:  # Process finished meanwhile
+            return None
+        start_time = pid_file.process.start_time or get_process_start_time(pid)
+        sample_key = (pid, start_time)
+        previous_cpu_time, previous_time = self.cpu_samples.get(
+            sample_key, (0.0, start_time or now)
+        )
+        cpu_samples[sample_key] = (cpu_time, now)
+        wall_time = now - previous_time
+        cpu_percent = (
+            100.0 * (cpu_time - previous_cpu_time) / wall_time
+            if wall_time > 0
+            else 0.0
+        )
+        started_at = pid_file.started_at or start_time or now
+        elapsed = now - started_at
+        rss = get_process_rss(pid)
+        read_bytes, write_bytes = get_process_io(pid)
+        name = self.get_cron_job_name(pid_file.name)
+        median = self.get_median_duration(name)
+
+        item = OrderedDict()
+        item["name"] = pid_file.name
+        item["pid"] = pid
+        item["cpu"] = "{:.1f}%".format(cpu_percent)
+        item["rss"] = self.format_size(rss)
+        item["elapsed"] = self.format_duration(elapsed)
+        item["median"] = self.format_duration(median)
+        item["read"] = self.format_size(read_bytes)
+        item["written"] = self.format_size(write_bytes)
+        item["cpu_priority"] = self.get_cpu_priority(name)
+        item["_cpu_percent"] = cpu_percent
+        item["_rss"] = rss or 0
+        item["_elapsed"] = elapsed
+        item["_io"] = (read_bytes or 0) + (write_bytes or 0)
+        return item
+
+    @staticmethod
+    def get_cron_job_name(file_name):
+        """Retrieves name of registered cron job from PID file name
+        (`<name>`, `<name>_<hash>` or `<name>_slot<n>`), None if not found
+        """
+        matching_names = [
+            name
+            for name in cron_job_registry.names()
+            if file_name == name or file_name.startswith(name + "_")
+        ]
+        return max(matching_names, key=len) if matching_names else None
+
+    def get_median_duration(self, name):
+        """Median duration of recent successful runs of a cron job
+        (from stats file), None if not known
+        """
+        if name is None:
+            return None
+        stats_file = CronWorkerStatsFile(
+            self.data_dir, CronWorkerStatsFile.get_file_name(name)
+        )
+        try:
+            mtime = os.path.getmtime(stats_file.path)
+        except OSError:  # No stats yet
+            return None
+        if self.medians.get(name, (None, None))[0] != mtime:
+            durations = [
+                record["duration"]
+                for record in stats_file.records
+                if record.get("ok") and record.get("duration") is not None
+            ]
+            self.medians[name] = (
+                mtime,
+                statistics.median(durations) if durations else None,
+            )
+        return self.medians[name][1]
+
+    @staticmethod
+    def get_cpu_priority(name):
+        """`worker_cpu_priority` of a cron job class ("-" if not set)"""
+        try:
+            cron_job_info = cron_job_registry.get_info(name)
+        except CronJobNotRegistered:
+            return "-"
+        priority = cron_job_info["worker_cpu_priority"]
+        return "-" if priority is None else priority
+
+    @staticmethod
+    def format_size(num_bytes):
+        """Formats number of bytes as megabytes ("-" if not known)"""
+        if num_bytes is None:
+            return "-"
+        return "{:.1f} MB".format(num_bytes / 1024.0 / 1024.0)
+
+    @staticmethod
+    def format_duration(seconds):
+        """Formats number of seconds as `H:MM:SS` ("-" if not known)"""
+        if seconds is None:
+            return "-"
+        minutes, seconds = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        return "{}:{:02d}:{:02d}".format(hours, minutes, seconds)
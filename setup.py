@@ -141,6 +141,11 @@ setup(
         "typing ; python_version < '3.0'",
     ],
     include_package_data=True,
+    entry_points={
+        "console_scripts": [
+            "cronman-status = cronman.worker.status_cli:run",
+        ]
+    },
     tests_require=["mock", "sentry_sdk", "redis < 2.11"],
     extras_require={"redis": ["redis < 2.11"], "sentry": ["sentry_sdk"]},
     cmdclass={